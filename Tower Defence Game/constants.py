@@ -4,6 +4,14 @@ import pygame
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 60
+TICK_RATE = 60  # Simulation ticks per second, independent of the render rate
+MAX_FRAME_TIME = 0.25  # Longest frame gap the simulation catches up on, in seconds
+FRAME_PACING_PRECISE = True  # Busy-wait the end of each frame instead of relying on sleep
+FRAME_PACING_SPIN = 0.002  # Seconds before a frame deadline to stop sleeping
+FRAME_STATS_WINDOW = 600  # Recent frames kept for frame-time percentiles
+PROFILER_WINDOW = 300  # Recent frames kept per profiled phase (F3 overlay)
+PROFILER_SUMMARY_INTERVAL = 30  # Frames between profiler overlay updates
+DIRTY_RECT_RENDERING = True  # Only redraw and present changed regions (F8 toggles)
 
 # Base Settings
 BASE_POSITION = (750, 300)  # End of path
@@ -23,6 +31,7 @@ BOSS_SIZE = 35  # Regular boss size
 PROJECTILE_SPEED = 10
 ENEMY_SPEED = 2
 PANEL_HEIGHT = 100
+SPATIAL_CELL_SIZE = 64  # Cell size of the enemy spatial hash grid
 
 # Boss Settings
 BOSS_REWARD = 500  # Regular boss reward
@@ -98,6 +107,10 @@ TOWER_TYPES = {
     }
 }
 
+# Targeting modes a tower can cycle through
+TARGETING_MODES = ["closest", "first", "last"]
+TOWER_ROTATION_STEPS = 72  # Pre-rendered tower sprites per full turn (5 degrees apart)
+
 # Initial Tower Selection
 INITIAL_TOWERS = ["basic", "rapid", "sniper"]  # Player starts with these 3 towers
 
@@ -123,6 +136,24 @@ UPGRADE_COSTS = {
 
 MAX_UPGRADE_LEVEL = 3
 
+# Fast-forward Settings
+FAST_FORWARD_SPEEDS = [1, 2, 4, 8, 32, None]  # None runs as fast as possible
+FAST_FORWARD_RENDER_FPS = 15  # Render rate once speed is above 4x
+
+# Placement Hints (H key): a quick background search of tower spots
+HINT_WAVES = 10  # Waves each suggested layout is played for
+HINT_CANDIDATES = 60  # Layouts generated before estimating
+HINT_SHORTLIST = 8  # Layouts actually played
+HINT_WORKERS = 2  # Worker processes, leaving cores for the game itself
+
+# Save Snapshots
+AUTOSAVE_ENABLED = True  # Snapshot the match each time a wave is cleared
+AUTOSAVE_KEEP = 30  # Autosaves kept per match (per seed), oldest removed first
+REPLAY_KEYFRAME_INTERVAL = 1800  # Ticks between full-state keyframes in replays (30 s)
+
+# Text Rendering
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept by the shared LRU cache
+
 # Wave Settings
 WAVE_TIMER = 25  # 25 seconds between waves
 WAVE_ENEMY_COUNT = 8  # Start with fewer enemies per wave
@@ -136,6 +167,7 @@ LEVEL_100_BOSS = {
     "reward": 2000,
     "color": (180, 0, 180)  # Purple color for special boss
 }
+BOSS_ANIMATION_FRAMES = 48  # Pre-rendered boss effect frames per full turn
 
 # Boss Wave Rewards
 BOSS_REWARD = 500  # Extra money for defeating a boss wave
@@ -1,11 +1,98 @@
 import pygame
 import math
-from constants import BOSS_SIZE, BOSS_REWARD, LEVEL_100_BOSS, ENEMY_SPEED
-from .enemy import Enemy
+from constants import (BOSS_SIZE, BOSS_REWARD, LEVEL_100_BOSS, ENEMY_SPEED,
+                     BOSS_ANIMATION_FRAMES)
+from src.rendering.sprite_cache import SpriteCache
+from .enemy import Enemy, FLAG_BOSS, HIT_FLASH_FRAMES
+
+BOSS_KINDS = ("regular", "special")
+BOSS_EFFECT_MARGIN = 25  # Effects reach this far past the boss body
+SHIELD_COLOR = (100, 100, 255)
+# Effects are drawn opaque on a colour key so blits can skip the empty
+# pixels (RLE) instead of blending every one
+BOSS_COLORKEY = (0, 255, 255)
+
+def boss_size(kind):
+    return LEVEL_100_BOSS["size"] if kind == "special" else BOSS_SIZE
+
+def new_frame(kind):
+    half = boss_size(kind) + BOSS_EFFECT_MARGIN
+    frame = pygame.Surface((half * 2, half * 2))
+    frame.fill(BOSS_COLORKEY)
+    frame.set_colorkey(BOSS_COLORKEY, pygame.RLEACCEL)
+    return frame
+
+def frame_angle(frame):
+    return 2 * math.pi * frame / BOSS_ANIMATION_FRAMES
+
+def has_phase_effect(kind, phase):
+    # The special boss has rays from phase 2 on, regular bosses once enraged
+    return phase >= 2 if kind == "special" else phase == 3
+
+def build_aura_frame(kind, frame):
+    # Rotating aura of the level 100 boss at one animation step
+    size = boss_size(kind)
+    half = size + BOSS_EFFECT_MARGIN
+    sprite = new_frame(kind)
+    base_angle = frame_angle(frame)
+    aura_radius = size + 10 + math.sin(base_angle * 2) * 5
+    for i in range(16):
+        angle = base_angle + (i * math.pi / 8)
+        aura_x = half + math.cos(angle) * aura_radius
+        aura_y = half + math.sin(angle) * aura_radius
+        aura_color = (
+            180 + int(75 * math.sin(base_angle + i)),
+            0,
+            180 + int(75 * math.cos(base_angle + i))
+        )
+        pygame.draw.circle(sprite, aura_color, (int(aura_x), int(aura_y)), 5)
+    return sprite
+
+def build_effect_frame(kind, phase, frame):
+    # Rays drawn over the body in later phases
+    size = boss_size(kind)
+    half = size + BOSS_EFFECT_MARGIN
+    sprite = new_frame(kind)
+    base_angle = frame_angle(frame)
+    if kind == "special":
+        color, width = (180, 0, 180), 3
+        length = size + 15 + math.sin(base_angle * 3) * 8
+    else:
+        color, width = (255, 100, 0), 2
+        length = size + 10 + math.sin(base_angle * 5) * 5
+    for i in range(8):
+        angle = base_angle + (2 * math.pi * i / 8)
+        end = (half + math.cos(angle) * length, half + math.sin(angle) * length)
+        pygame.draw.line(sprite, color, (half, half), end, width)
+    return sprite
+
+def build_shield_sprite(kind):
+    # The shield's strength is applied as surface alpha when it is drawn
+    shield_radius = boss_size(kind) + 5
+    sprite = pygame.Surface((shield_radius*2, shield_radius*2))
+    sprite.fill(BOSS_COLORKEY)
+    sprite.set_colorkey(BOSS_COLORKEY, pygame.RLEACCEL)
+    pygame.draw.circle(sprite, SHIELD_COLOR, (shield_radius, shield_radius), shield_radius)
+    return sprite
+
+# Animation frames keyed by boss kind (and phase for the effects) plus the
+# animation step
+AURA_FRAMES = SpriteCache(build_aura_frame)
+EFFECT_FRAMES = SpriteCache(build_effect_frame)
+SHIELD_SPRITES = SpriteCache(build_shield_sprite)
+
+def bake_boss_sprites():
+    """Render every boss animation frame up front instead of on first use"""
+    frames = range(BOSS_ANIMATION_FRAMES)
+    AURA_FRAMES.bake(("special", frame) for frame in frames)
+    EFFECT_FRAMES.bake((kind, phase, frame) for kind in BOSS_KINDS for phase in (1, 2, 3)
+                       if has_phase_effect(kind, phase) for frame in frames)
+    SHIELD_SPRITES.bake((kind,) for kind in BOSS_KINDS)
 
 class BossEnemy(Enemy):
-    def __init__(self, wave_number):
-        super().__init__(wave_number)
+    def reset(self, wave_number=1):
+        super().reset(wave_number)
+        self.flags = self.flags | FLAG_BOSS
         
         # Check if this is the level 100 boss
         if wave_number == 100:
@@ -29,6 +116,7 @@ class BossEnemy(Enemy):
         self.max_shield_health = self.shield_health
         self.phase = 1
         self.angle = 0
+        self.kind = "special" if self.is_special_boss else "regular"
         self.vertices = 5 if not self.is_special_boss else 8  # Special boss has 8 sides
         self.value = self.reward
         
@@ -38,28 +126,30 @@ class BossEnemy(Enemy):
             if self.shield_health <= 0:
                 self.shield_active = False
                 self.phase = 2
-            self.hit_flash = 10
+            self.hit_flash = HIT_FLASH_FRAMES
         else:
             super().take_damage(amount)
             if self.health < self.max_health * 0.3:
                 self.phase = 3
                 self.speed = self.speed * 1.5  # Enrage at low health
         
-    def draw(self, screen):
+    def animate(self):
+        """Advance the rotation by one simulation tick"""
+        self.angle = (self.angle + (0.02 if not self.is_special_boss else 0.04)) % (2 * math.pi)
+        
+    def animation_frame(self):
+        return round(self.angle * BOSS_ANIMATION_FRAMES / (2 * math.pi)) % BOSS_ANIMATION_FRAMES
+        
+    def draw(self, screen, alpha=1.0):
+        x, y = self.render_position(alpha)
+        frame = self.animation_frame()
+        half = self.size + BOSS_EFFECT_MARGIN
+        dest = (int(x) - half, int(y) - half)
+        
         # Special effects for level 100 boss
         if self.is_special_boss:
             # Rotating aura effect
-            aura_radius = self.size + 10 + math.sin(self.angle * 2) * 5
-            for i in range(16):
-                angle = self.angle + (i * math.pi / 8)
-                aura_x = self.x + math.cos(angle) * aura_radius
-                aura_y = self.y + math.sin(angle) * aura_radius
-                aura_color = (
-                    180 + int(75 * math.sin(self.angle + i)),
-                    0,
-                    180 + int(75 * math.cos(self.angle + i))
-                )
-                pygame.draw.circle(screen, aura_color, (int(aura_x), int(aura_y)), 5)
+            screen.blit(AURA_FRAMES.get((self.kind, frame)), dest)
         
         # Draw boss body
         if self.hit_flash > 0:
@@ -67,7 +157,6 @@ class BossEnemy(Enemy):
             color = (min(255, self.color[0] + flash_intensity),
                     min(255, self.color[1] + flash_intensity),
                     min(255, self.color[2] + flash_intensity))
-            self.hit_flash -= 1
         else:
             color = self.color
             
@@ -76,61 +165,41 @@ class BossEnemy(Enemy):
             # Phase 1: Shield phase
             # Draw shield
             shield_radius = self.size + 5
-            shield_color = (100, 100, 255, 
-                          int(255 * (self.shield_health / self.max_shield_health)))
-            shield_surface = pygame.Surface((shield_radius*2, shield_radius*2), 
-                                         pygame.SRCALPHA)
-            pygame.draw.circle(shield_surface, shield_color,
-                             (shield_radius, shield_radius), shield_radius)
-            screen.blit(shield_surface, 
-                       (self.x - shield_radius, self.y - shield_radius))
+            shield = SHIELD_SPRITES.get((self.kind,))
+            shield.set_alpha(int(255 * (self.shield_health / self.max_shield_health)), pygame.RLEACCEL)
+            screen.blit(shield, (x - shield_radius, y - shield_radius))
             
-        # Draw geometric shape based on boss type
+        # Draw geometric shape based on boss type, turned to the same
+        # animation step as its effects
         points = []
         for i in range(self.vertices):
-            angle = self.angle + (2 * math.pi * i / self.vertices)
-            x = self.x + math.cos(angle) * self.size
-            y = self.y + math.sin(angle) * self.size
-            points.append((x, y))
+            angle = frame_angle(frame) + (2 * math.pi * i / self.vertices)
+            points.append((x + math.cos(angle) * self.size,
+                           y + math.sin(angle) * self.size))
         
         pygame.draw.polygon(screen, color, points)
         
-        if self.phase >= 2:
-            # Phase 2 and 3: Add effects
-            if self.is_special_boss:
-                # Special boss gets more intense effects
-                for i in range(self.vertices):
-                    angle = self.angle + (2 * math.pi * i / self.vertices)
-                    length = self.size + 15 + math.sin(self.angle * 3) * 8
-                    end_x = self.x + math.cos(angle) * length
-                    end_y = self.y + math.sin(angle) * length
-                    pygame.draw.line(screen, (180, 0, 180), 
-                                   (self.x, self.y), (end_x, end_y), 3)
-            else:
-                # Regular boss effects
-                if self.phase == 3:  # Enraged phase
-                    for i in range(8):
-                        angle = self.angle + (math.pi * 2 * i / 8)
-                        length = self.size + 10 + math.sin(self.angle * 5) * 5
-                        end_x = self.x + math.cos(angle) * length
-                        end_y = self.y + math.sin(angle) * length
-                        pygame.draw.line(screen, (255, 100, 0), 
-                                       (self.x, self.y), (end_x, end_y), 2)
+        if has_phase_effect(self.kind, self.phase):
+            # Special boss from phase 2, regular boss when enraged
+            screen.blit(EFFECT_FRAMES.get((self.kind, self.phase, frame)), dest)
         
         # Draw health bars
-        self._draw_health_bars(screen)
+        self._draw_health_bars(screen, x, y)
         
-        # Update rotation
-        self.angle += 0.02 if not self.is_special_boss else 0.04
+    def get_bounds(self, alpha=1.0):
+        # Aura, lightning and the stacked health bars
+        x, y = self.render_position(alpha)
+        half = self.size + 30
+        return pygame.Rect(x - half, y - half, half * 2, half * 2)
         
-    def _draw_health_bars(self, screen):
+    def _draw_health_bars(self, screen, x, y):
         health_width = 60
         health_height = 6
         spacing = 2
         
         # Main health bar
-        health_x = self.x - health_width/2
-        health_y = self.y - self.size - 15
+        health_x = x - health_width/2
+        health_y = y - self.size - 15
         
         # Health bar background (red)
         pygame.draw.rect(screen, (255, 0, 0),
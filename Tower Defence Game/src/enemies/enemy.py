@@ -1,13 +1,70 @@
 import pygame
-import math
 from constants import (PATH_POINTS, ENEMY_SPEED, ENEMY_SIZE, 
                      STARTING_ENEMY_HEALTH, HEALTH_SCALING_FACTOR, MAX_HEALTH_CAP)
+from .path import GAME_PATH
+
+# Row flag bits, shared with EnemyArray
+FLAG_BOSS = 1
+FLAG_REACHED_END = 2
+
+ENEMY_COLOR = (100, 255, 100)
+HIT_FLASH_FRAMES = 10  # hit_flash is set to this on a hit and counts down to 0
+
+class Column:
+    """Enemy attribute that lives in an EnemyArray row while the enemy is attached.
+
+    Detached enemies keep the value in their instance dict, so an Enemy works
+    the same whether or not it belongs to an array.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        store = enemy._store
+        if store is None:
+            return enemy.__dict__[self.name]
+        return store.columns[self.name][enemy._row]
+
+    def __set__(self, enemy, value):
+        store = enemy._store
+        if store is None:
+            enemy.__dict__[self.name] = value
+        else:
+            store.columns[self.name][enemy._row] = value
 
 class Enemy:
+    # Per-enemy state stored column-wise by EnemyArray
+    x = Column()
+    y = Column()
+    prev_x = Column()  # Position at the previous tick, for interpolation
+    prev_y = Column()
+    health = Column()
+    max_health = Column()
+    speed = Column()
+    current_point = Column()
+    progress = Column()
+    hit_flash = Column()
+    flags = Column()
+
+    # Array the enemy is attached to, and its row there
+    _store = None
+    _row = -1
+
     def __init__(self, wave_number=1):
+        self.reset(wave_number)
+        
+    def reset(self, wave_number=1):
+        """(Re)initialize for a new spawn; pooled enemies are reused this way"""
+        self.flags = 0
         self.x = PATH_POINTS[0][0]
         self.y = PATH_POINTS[0][1]
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.current_point = 0
+        self.progress = 0.0  # Distance travelled along the path
         # Cap health scaling at MAX_HEALTH_CAP
         base_health = min(
             STARTING_ENEMY_HEALTH * (HEALTH_SCALING_FACTOR ** wave_number),
@@ -19,33 +76,49 @@ class Enemy:
         self.speed = ENEMY_SPEED
         self.reached_end = False
         self.size = ENEMY_SIZE
-        self.color = (100, 255, 100)  # Base enemy color
+        self.color = ENEMY_COLOR  # Base enemy color
         self.hit_flash = 0  # For damage visual effect
         self.value = self.reward
         
+    @property
+    def reached_end(self):
+        return bool(self.flags & FLAG_REACHED_END)
+
+    @reached_end.setter
+    def reached_end(self, value):
+        if value:
+            self.flags = self.flags | FLAG_REACHED_END
+        else:
+            self.flags = self.flags & (0xFF ^ FLAG_REACHED_END)
+
+    def attach(self, store, row):
+        # Move locally held column values into the array row
+        for name in store.columns:
+            store.columns[name][row] = self.__dict__.pop(name)
+        self._store = store
+        self._row = row
+
+    def detach(self):
+        # Copy the row back so the enemy stays readable after removal
+        store = self._store
+        row = self._row
+        for name, column in store.columns.items():
+            self.__dict__[name] = column[row].item()
+        self._store = None
+        self._row = -1
+
     def move(self):
-        if self.current_point >= len(PATH_POINTS) - 1:
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.hit_flash > 0:
+            self.hit_flash -= 1
+        self.progress += self.speed
+        if self.progress >= GAME_PATH.total_length:
             self.reached_end = True
             self.health = 0  # Die instantly when reaching base
-            return
             
-        # Get current target point
-        target_x, target_y = PATH_POINTS[self.current_point + 1]
-        
-        # Calculate direction to move
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance < self.speed:
-            # Reached current target point, move to next one
-            self.x = target_x
-            self.y = target_y
-            self.current_point += 1
-        else:
-            # Move towards target point
-            self.x += (dx/distance) * self.speed
-            self.y += (dy/distance) * self.speed
+        # Position is a lookup on the precomputed path
+        self.x, self.y, self.current_point = GAME_PATH.position_at(self.progress)
             
     def take_damage(self, amount):
         self.health -= amount
@@ -54,7 +127,14 @@ class Enemy:
     def is_alive(self):
         return self.health > 0
         
-    def draw(self, screen):
+    def render_position(self, alpha=1.0):
+        """Position ``alpha`` of the way from the previous tick to this one"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+        
+    def draw(self, screen, alpha=1.0):
+        x, y = self.render_position(alpha)
+        
         # Draw enemy body
         if self.hit_flash > 0:
             # Flash white when hit
@@ -62,17 +142,16 @@ class Enemy:
             color = (min(255, self.color[0] + flash_intensity),
                     min(255, self.color[1] + flash_intensity),
                     min(255, self.color[2] + flash_intensity))
-            self.hit_flash -= 1
         else:
             color = self.color
             
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
+        pygame.draw.circle(screen, color, (int(x), int(y)), self.size)
         
         # Draw health bar
         health_width = 40
         health_height = 5
-        health_x = self.x - health_width/2
-        health_y = self.y - self.size - 10
+        health_x = x - health_width/2
+        health_y = y - self.size - 10
         
         # Health bar background (red)
         pygame.draw.rect(screen, (255, 0, 0),
@@ -85,5 +164,11 @@ class Enemy:
                            (health_x, health_y, 
                             health_width * health_percent, health_height))
             
+    def get_bounds(self, alpha=1.0):
+        # Body plus the health bar above it
+        x, y = self.render_position(alpha)
+        half = max(self.size, 20) + 2
+        return pygame.Rect(x - half, y - self.size - 12, half * 2, self.size * 2 + 14)
+            
     def get_position(self):
         return self.x, self.y
\ No newline at end of file
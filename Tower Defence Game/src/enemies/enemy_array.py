@@ -0,0 +1,145 @@
+import numpy as np
+from .enemy import FLAG_BOSS, FLAG_REACHED_END
+from .path import GAME_PATH
+
+class EnemyArray:
+    """Structure-of-arrays store for live enemies.
+
+    Each enemy's state lives in one row of contiguous NumPy columns, so
+    movement and removal run as whole-array operations. The Enemy objects in
+    ``views`` read and write their row, which keeps drawing code unchanged.
+    """
+
+    DTYPES = {
+        "x": np.float64,
+        "y": np.float64,
+        "prev_x": np.float64,
+        "prev_y": np.float64,
+        "health": np.float64,
+        "max_health": np.float64,
+        "speed": np.float64,
+        "current_point": np.int32,
+        "progress": np.float64,
+        "hit_flash": np.int32,
+        "flags": np.uint8,
+    }
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.views = []
+        self.remap = None  # Old row -> new row (or -1) from the last compact()
+        self.columns = {name: np.zeros(capacity, dtype=dtype)
+                        for name, dtype in self.DTYPES.items()}
+
+    @property
+    def capacity(self):
+        return len(self.columns["x"])
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def column(self, name):
+        """Return the live slice of a column"""
+        return self.columns[name][:self.count]
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def add(self, enemy):
+        if self.count == self.capacity:
+            self._grow()
+        enemy.attach(self, self.count)
+        self.views.append(enemy)
+        self.count += 1
+        return enemy
+
+    def move(self):
+        """Advance every enemy one step along the path"""
+        n = self.count
+        if n == 0:
+            return
+
+        # Keep the previous tick's position so rendering can interpolate
+        self.columns["prev_x"][:n] = self.columns["x"][:n]
+        self.columns["prev_y"][:n] = self.columns["y"][:n]
+
+        # Hit flashes fade one step per tick
+        hit_flash = self.columns["hit_flash"][:n]
+        np.maximum(hit_flash - 1, 0, out=hit_flash)
+
+        progress = self.columns["progress"][:n]
+        progress += self.columns["speed"][:n]
+
+        # Enemies past the end of the path arrive at the base
+        arrived = progress >= GAME_PATH.total_length
+        if arrived.any():
+            self.columns["flags"][:n][arrived] |= FLAG_REACHED_END
+            self.columns["health"][:n][arrived] = 0
+
+        # Position is a lookup on the precomputed path
+        x, y, segments = GAME_PATH.positions_at(progress)
+        self.columns["x"][:n] = x
+        self.columns["y"][:n] = y
+        self.columns["current_point"][:n] = segments
+
+    def positions(self, alpha=1.0):
+        """Live x and y, ``alpha`` of the way from the previous tick to this one"""
+        x = self.column("x")
+        y = self.column("y")
+        if alpha >= 1.0:
+            return x, y
+        prev_x = self.column("prev_x")
+        prev_y = self.column("prev_y")
+        return prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha
+
+    def compact(self):
+        """Drop dead and finished enemies, returning their detached views"""
+        n = self.count
+        health = self.columns["health"][:n]
+        flags = self.columns["flags"][:n]
+        remove = (health <= 0) | ((flags & FLAG_REACHED_END) != 0)
+        if not remove.any():
+            self.remap = None
+            return []
+
+        removed_rows = np.flatnonzero(remove)
+        removed = [self.views[row] for row in removed_rows]
+        for enemy in removed:
+            enemy.detach()
+
+        # Shift surviving rows down in one pass per column
+        keep = ~remove
+        kept = n - len(removed)
+        self.remap = np.full(n, -1, dtype=np.int32)
+        self.remap[keep] = np.arange(kept)
+        for column in self.columns.values():
+            column[:kept] = column[:n][keep]
+
+        first = removed_rows[0]
+        views = [view for view, alive in zip(self.views, keep) if alive]
+        for row in range(first, kept):
+            views[row]._row = row
+        self.views = views
+        self.count = kept
+        return removed
+
+    def rows_by_progress(self):
+        """Row indices ordered from furthest along the path to least"""
+        return np.argsort(-self.column("progress"), kind="stable")
+
+    def boss_mask(self):
+        return (self.column("flags") & FLAG_BOSS) != 0
+
+    def bosses(self):
+        views = self.views
+        return [views[row] for row in np.flatnonzero(self.boss_mask()).tolist()]
@@ -0,0 +1,52 @@
+import bisect
+import numpy as np
+from constants import PATH_POINTS
+
+class Path:
+    """Polyline parameterized by arc length.
+
+    Segment lengths, cumulative distances and unit directions are computed
+    once, so an enemy only needs the distance it has travelled to know where
+    it is.
+    """
+
+    def __init__(self, points):
+        self.points = np.array(points, dtype=np.float64)
+        deltas = np.diff(self.points, axis=0)
+        self.segment_lengths = np.sqrt((deltas ** 2).sum(axis=1))
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.segment_lengths)))
+        self.directions = deltas / np.where(self.segment_lengths > 0, self.segment_lengths, 1)[:, None]
+        self.total_length = float(self.cumulative[-1])
+        self.segment_count = len(self.segment_lengths)
+
+        # Plain lists for the scalar lookups done by detached enemies
+        self._cumulative = self.cumulative.tolist()
+        self._points = self.points.tolist()
+        self._directions = self.directions.tolist()
+
+    def segment_at(self, distance):
+        segment = bisect.bisect_right(self._cumulative, distance) - 1
+        return max(0, min(segment, self.segment_count - 1))
+
+    def position_at(self, distance):
+        distance = max(0.0, min(distance, self.total_length))
+        segment = self.segment_at(distance)
+        offset = distance - self._cumulative[segment]
+        start_x, start_y = self._points[segment]
+        dir_x, dir_y = self._directions[segment]
+        return start_x + dir_x * offset, start_y + dir_y * offset, segment
+
+    def segments_at(self, distances):
+        segments = np.searchsorted(self.cumulative, distances, side="right") - 1
+        return np.clip(segments, 0, self.segment_count - 1)
+
+    def positions_at(self, distances):
+        """Vectorized position_at, returning x, y and segment arrays"""
+        distances = np.clip(distances, 0.0, self.total_length)
+        segments = self.segments_at(distances)
+        offsets = distances - self.cumulative[segments]
+        x = self.points[segments, 0] + self.directions[segments, 0] * offsets
+        y = self.points[segments, 1] + self.directions[segments, 1] * offsets
+        return x, y, segments
+
+GAME_PATH = Path(PATH_POINTS)
@@ -1,2 +1,3 @@
 from .game_state import GameState
-from .demo_game import GameDemo
\ No newline at end of file
+from .demo_game import GameDemo
+from .simulation import Simulation
\ No newline at end of file
@@ -2,13 +2,22 @@ import pygame
 import random
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, TOWER_TYPES, PATH_POINTS
 from src.towers.tower import Tower
+from src.towers.targeting import assign_targets
 from src.enemies.enemy import Enemy
 from src.enemies.boss_enemy import BossEnemy
+from src.enemies.enemy_array import EnemyArray
+from src.towers.projectile_system import ProjectileSystem
+from src.rendering.enemy_renderer import EnemyRenderer
+from src.game.pool import ObjectPool
 
 class GameDemo:
-    def __init__(self):
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
         self.towers = []
-        self.enemies = []
+        self.enemies = EnemyArray()
+        self.enemy_pools = {Enemy: ObjectPool(Enemy), BossEnemy: ObjectPool(BossEnemy)}
+        self.projectiles = ProjectileSystem()
+        self.enemy_renderer = EnemyRenderer()
         self.spawn_timer = 0
         self.spawn_rate = 120  # Slower spawn rate for demo
         self.wave_number = 1
@@ -19,9 +28,9 @@ class GameDemo:
     def place_random_towers(self):
         tower_types = list(TOWER_TYPES.keys())
         for _ in range(5):  # Place 5 random towers
-            x = random.randint(100, WINDOW_WIDTH - 100)
-            y = random.randint(100, WINDOW_HEIGHT - 100)
-            tower_type = random.choice(tower_types)
+            x = self.rng.randint(100, WINDOW_WIDTH - 100)
+            y = self.rng.randint(100, WINDOW_HEIGHT - 100)
+            tower_type = self.rng.choice(tower_types)
             
             # Simple check to avoid placing on path
             valid_position = True
@@ -52,20 +61,28 @@ class GameDemo:
         self.spawn_timer += 1
         if self.spawn_timer >= self.spawn_rate:
             self.spawn_timer = 0
-            if random.random() < 0.1:  # 10% chance for boss
-                self.enemies.append(BossEnemy(self.wave_number))
-            else:
-                self.enemies.append(Enemy(self.wave_number))
+            enemy_type = BossEnemy if self.rng.random() < 0.1 else Enemy  # 10% chance for boss
+            self.enemies.add(self.enemy_pools[enemy_type].acquire(self.wave_number))
         
         # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.move()
-            if enemy.reached_end or enemy.health <= 0:
-                self.enemies.remove(enemy)
+        self.enemies.move()
+        for boss in self.enemies.bosses():
+            boss.animate()
+        removed = self.enemies.compact()
+        if removed:
+            self.projectiles.remap_targets(self.enemies.remap)
+            # Removed enemies get recycled, so towers must let go of them
+            for tower in self.towers:
+                if tower.target is not None and tower.target._store is None:
+                    tower.target = None
+            for enemy in removed:
+                self.enemy_pools[type(enemy)].release(enemy)
+        self.projectiles.update(self.enemies)
                 
-        # Update towers
+        # Update towers, targeting them the same way as the simulation
+        assign_targets(self.towers, self.enemies)
         for tower in self.towers:
-            tower.update(self.enemies)
+            tower.update_weapon(self.projectiles)
     
     def draw(self, screen):
         # Draw path
@@ -78,7 +95,7 @@ class GameDemo:
         # Draw towers and their projectiles
         for tower in self.towers:
             tower.draw(screen)
+        self.projectiles.draw(screen)
             
         # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(screen)
\ No newline at end of file
+        self.enemy_renderer.draw(screen, self.enemies)
\ No newline at end of file
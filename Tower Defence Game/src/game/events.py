@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+# A projectile reached its target. Direct damage is already applied; splash
+# and everything else is resolved when the queue is dispatched.
+HitEvent = namedtuple("HitEvent", "tower target damage splash_damage")
+
+# An enemy was removed after its health ran out
+KillEvent = namedtuple("KillEvent", "target reward")
+
+# An enemy reached the base
+LeakEvent = namedtuple("LeakEvent", "target damage")
+
+class EventQueue:
+    """Per-tick queue of game events, dispatched once to registered handlers"""
+
+    def __init__(self):
+        self.events = []
+        self.handlers = {}
+
+    def subscribe(self, event_type, handler):
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def emit_hit(self, tower, target, damage, splash_damage):
+        # Lets projectiles report hits without importing this module
+        self.events.append(HitEvent(tower, target, damage, splash_damage))
+
+    def dispatch(self):
+        # Enemies killed by splash are picked up as kills when the next tick
+        # compacts the enemy array, so one pass over the queue is enough
+        events = self.events
+        self.events = []
+        for event in events:
+            for handler in self.handlers.get(type(event), ()):
+                handler(event)
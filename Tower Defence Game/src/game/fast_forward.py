@@ -0,0 +1,114 @@
+import time
+from constants import (FPS, TICK_RATE, MAX_FRAME_TIME, FAST_FORWARD_SPEEDS,
+                     FAST_FORWARD_RENDER_FPS)
+
+class FastForward:
+    """Runs fixed-rate simulation ticks against a per-frame time budget.
+
+    Real time since the last frame, times ``speed``, goes into an
+    accumulator that is drained in whole TICK_RATE ticks, so the game runs at
+    the same pace whatever the render rate. The unused remainder is kept as
+    ``alpha``, how far rendering is between the last two ticks. The unlimited
+    speed runs as many ticks as fit instead. Ticks never run past the frame's
+    time budget. Above 4x the world is only rendered FAST_FORWARD_RENDER_FPS
+    times a second, and skipped frames give their render time to the
+    simulation instead.
+    """
+
+    def __init__(self, target_fps=FPS):
+        self.speed_index = 0
+        self.frame_time = 1.0 / target_fps
+        self.tick_time = 1.0 / TICK_RATE
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.last_run = None
+        self.render_interval = 1.0 / FAST_FORWARD_RENDER_FPS
+        self.render_cost = 0.0  # Smoothed cost of one draw, in seconds
+        self.last_render = 0.0
+        self.render_due = True
+
+        # Achieved speed-up, measured over roughly half-second windows
+        self.achieved_speed = 1.0
+        self.window_start = time.perf_counter()
+        self.window_ticks = 0
+
+    @property
+    def speed(self):
+        return FAST_FORWARD_SPEEDS[self.speed_index]
+
+    def speed_label(self):
+        return "Max" if self.speed is None else f"{self.speed}x"
+
+    def cycle_speed(self):
+        self.speed_index = (self.speed_index + 1) % len(FAST_FORWARD_SPEEDS)
+
+    def set_speed(self, speed):
+        self.speed_index = FAST_FORWARD_SPEEDS.index(speed)
+
+    def skips_renders(self):
+        return self.speed is None or self.speed > 4
+
+    def hold(self):
+        """Stop the clock, e.g. while paused, so no ticks are owed on resume"""
+        self.last_run = None
+
+    def run(self, simulation):
+        """Run the ticks owed since the last frame, returning how many ran"""
+        now = time.perf_counter()
+        elapsed = 0.0 if self.last_run is None else min(now - self.last_run, MAX_FRAME_TIME)
+        self.last_run = now
+        self.render_due = (not self.skips_renders()
+                           or now - self.last_render >= self.render_interval)
+
+        # Leave room for drawing on frames that will render
+        budget = self.frame_time * 0.9
+        if self.render_due:
+            budget -= self.render_cost
+        deadline = now + budget
+
+        limit = self.speed
+        ticks = 0
+        if limit is None:
+            while simulation.is_running():
+                simulation.tick()
+                ticks += 1
+                # Always run at least one tick so slow frames still progress
+                if time.perf_counter() >= deadline:
+                    break
+            self.accumulator = 0.0
+        elif simulation.is_running():
+            self.accumulator += elapsed * limit
+            while simulation.is_running() and self.accumulator >= self.tick_time:
+                simulation.tick()
+                ticks += 1
+                self.accumulator -= self.tick_time
+                if time.perf_counter() >= deadline:
+                    break
+            # Drop time that could not be caught up on rather than owing it
+            # to every later frame
+            self.accumulator = min(self.accumulator, self.tick_time)
+        else:
+            self.accumulator = 0.0
+        if limit is None or not simulation.is_running():
+            self.alpha = 1.0
+        else:
+            self.alpha = min(self.accumulator / self.tick_time, 1.0)
+
+        self._record_ticks(ticks)
+        return ticks
+
+    def _record_ticks(self, ticks):
+        self.window_ticks += ticks
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= 0.5:
+            self.achieved_speed = self.window_ticks / (elapsed * TICK_RATE)
+            self.window_start = now
+            self.window_ticks = 0
+
+    def should_render(self):
+        return self.render_due
+
+    def record_render(self, duration):
+        self.last_render = time.perf_counter()
+        self.render_cost = self.render_cost * 0.9 + duration * 0.1
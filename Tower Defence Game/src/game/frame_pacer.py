@@ -0,0 +1,85 @@
+import time
+from collections import deque
+import numpy as np
+from constants import FPS, FRAME_PACING_PRECISE, FRAME_PACING_SPIN, FRAME_STATS_WINDOW
+
+class FramePacer:
+    """Paces the main loop to a target frame rate and times every frame.
+
+    Deadlines are scheduled one frame period after the previous deadline
+    rather than after the moment the wait ended, so sleep overshoot does not
+    add up. In precise mode the pacer sleeps until shortly before the
+    deadline and busy-waits the rest, since sleeps are only accurate to about
+    a millisecond. A target of None runs uncapped.
+    """
+
+    def __init__(self, target_fps=FPS, precise=FRAME_PACING_PRECISE):
+        self.precise = precise
+        self.frame_times = deque(maxlen=FRAME_STATS_WINDOW)  # Seconds per frame
+        self.last_frame = None
+        self.frames = 0
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps):
+        self.target_fps = target_fps
+        self.frame_time = 1.0 / target_fps if target_fps else 0.0
+        self.deadline = None
+
+    def tick(self):
+        """Wait out the rest of this frame, returning its length in seconds"""
+        if self.frame_time and self.deadline is not None:
+            self._wait_until(self.deadline)
+        now = time.perf_counter()
+
+        # A frame that ran over by more than a whole period starts a new
+        # schedule instead of rushing the following frames to catch up
+        if self.deadline is None or now - self.deadline > self.frame_time:
+            self.deadline = now + self.frame_time
+        else:
+            self.deadline += self.frame_time
+
+        duration = 0.0
+        if self.last_frame is not None:
+            duration = now - self.last_frame
+            self.frame_times.append(duration)
+        self.last_frame = now
+        self.frames += 1
+        return duration
+
+    def _wait_until(self, deadline):
+        if self.precise:
+            remaining = deadline - time.perf_counter() - FRAME_PACING_SPIN
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def reset_stats(self):
+        self.frame_times.clear()
+        self.last_frame = None
+
+    def stats(self):
+        """Frame times over the recent window, in milliseconds"""
+        if not self.frame_times:
+            return {"frames": 0, "target_fps": self.target_fps}
+        times = np.array(self.frame_times) * 1000
+        average = float(times.mean())
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]).tolist()
+        stats = {
+            "frames": len(times),
+            "target_fps": self.target_fps,
+            "fps": 1000 / average if average > 0 else 0.0,
+            "avg": average,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": float(times.max()),
+        }
+        if self.frame_time:
+            # Frames that took more than 10% longer than the target period
+            stats["late"] = int((times > self.frame_time * 1100).sum())
+        return stats
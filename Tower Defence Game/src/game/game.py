@@ -1,45 +1,93 @@
 import pygame
+import os
 import random
-import math
-from constants import (WINDOW_WIDTH, WINDOW_HEIGHT, TOWER_TYPES, PATH_POINTS,
-                     UI_PANEL, UI_BORDER, UI_TEXT, DIFFICULTIES, BASE_POSITION,
-                     BASE_SIZE, SHAKE_INTENSITY, BASE_HEALTH, WAVE_TIMER,
-                     WAVE_ENEMY_COUNT, BOSS_WAVE_INTERVAL)
-from src.towers.tower import Tower
-from src.enemies.enemy import Enemy
-from src.enemies.boss_enemy import BossEnemy
+import threading
+import time
+from constants import (WINDOW_WIDTH, WINDOW_HEIGHT, TOWER_TYPES, BASE_POSITION,
+                     BASE_SIZE, SHAKE_INTENSITY, BASE_HEALTH, DIRTY_RECT_RENDERING, FPS,
+                     HINT_WAVES, HINT_CANDIDATES, HINT_SHORTLIST, HINT_WORKERS, AUTOSAVE_ENABLED)
+from src.game.simulation import Simulation
+from src.game.fast_forward import FastForward
+from src.game.replay import KeyframeRecorder
+from src.game import snapshot
+from src.rendering.background import BackgroundLayer
+from src.rendering.dirty_rects import DirtyRectTracker
+from src.rendering.enemy_renderer import EnemyRenderer
+from src.rendering.sprite_cache import SpriteCache
+from src.ui.fonts import get_font
+from src.ui.hud import StatusBar, StartButton, SpeedButton, SpeedLabel, UpgradePanel
 from src.ui.tower_selector import TowerSelector
+from src.ui.widget import Overlay
+
+def build_hint_sprite(color):
+    sprite = pygame.Surface((40, 40), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, 60), (20, 20), 20)
+    pygame.draw.circle(sprite, (*color, 200), (20, 20), 20, 2)
+    return sprite
+
+def build_preview_sprite(color, alpha):
+    sprite = pygame.Surface((40, 40), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, alpha), (20, 20), 20)
+    return sprite
+
+HINT_SPRITES = SpriteCache(build_hint_sprite)
+PREVIEW_SPRITES = SpriteCache(build_preview_sprite)
 
 class Game:
-    def __init__(self, difficulty):
+    def __init__(self, difficulty, target_fps=FPS):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.difficulty = difficulty
-        self.difficulty_settings = DIFFICULTIES[difficulty]
-        self.clock = pygame.time.Clock()
-        
-        # Game state
-        self.towers = []
-        self.enemies = []
+        self.target_fps = target_fps
+        
+        # Game state lives in the display-free simulation
+        self.simulation = Simulation(difficulty)
+        self.recorder = KeyframeRecorder(self.simulation)
+        self.fast_forward = FastForward(target_fps or FPS)
+        self.profiler = None  # Optional FrameProfiler, see set_profiler
+        # Snapshots of the match each time a wave is cleared
+        self.autosaver = snapshot.Autosaver(self.simulation) if AUTOSAVE_ENABLED else None
+        
+        # Visual-only randomness, kept apart from the simulation's seeded RNG
+        # so rendering can never change a match's outcome
+        self.effects_rng = random.Random()
         self.selected_tower = None
-        self.wave_number = 0
-        self.wave_timer = WAVE_TIMER * 60
-        self.wave_active = False
-        self.enemies_spawned = 0
-        self.spawn_counter = 0
-        self.base_health = BASE_HEALTH
-        self.base_shake = 0
-        self.game_speed = 1
-        self.money = self.difficulty_settings["starting_money"]
-        self.game_started = False
+        
+        # Static terrain is drawn once; in dirty-rect mode only regions that
+        # changed are restored from it and presented
+        self.background = BackgroundLayer()
+        self.dirty = DirtyRectTracker(self.screen.get_rect())
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.tower_keys = {}
+        self.last_base_health = None
+        self.enemy_renderer = EnemyRenderer()
+        
+        # Suggested tower spots, found by a placement search in the background
+        self.hint = None
+        self.hint_thread = None
+        self.hint_generation = 0  # Bumped when a save is loaded, to drop stale hints
         
         # UI elements
-        self.font = pygame.font.Font(None, 36)
-        self.stats_font = pygame.font.Font(None, 24)  # Smaller font for detailed stats
         self.tower_selector = TowerSelector()
         self.upgrade_buttons = {}
         self.selected_tower_type = None  # For tower placement
         self.is_placing_tower = False
         self.start_button_rect = pygame.Rect(WINDOW_WIDTH - 140, WINDOW_HEIGHT - 60, 120, 40)
+        self.speed_button_rect = pygame.Rect(WINDOW_WIDTH - 240, WINDOW_HEIGHT - 60, 90, 40)
+        
+        # HUD widgets, each cached until what it shows changes
+        self.upgrade_panel = UpgradePanel(self.simulation)
+        self.speed_label = SpeedLabel(self.speed_button_rect, self.fast_forward)
+        self.hud = [
+            StatusBar(self.simulation),
+            self.tower_selector,
+            self.upgrade_panel,
+        ]
+        self.hud_buttons = [
+            StartButton(self.start_button_rect, self.simulation),
+            SpeedButton(self.speed_button_rect, self.fast_forward),
+            self.speed_label,
+        ]
+        self.death_overlay = Overlay(180)
         
         self.setup_upgrade_buttons()
 
@@ -55,8 +103,8 @@ class Game:
         for upgrade_type, info in TOWER_TYPES[self.selected_tower.type].items():
             if upgrade_type in ["damage", "range", "fire_rate", "splash_damage"]:
                 current_level = self.selected_tower.upgrades.get(upgrade_type, 0)
-                if current_level < 3:  # Max 3 levels per upgrade
-                    cost = 100 * (current_level + 1)  # Increasing costs
+                cost = self.simulation.upgrade_cost(self.selected_tower, upgrade_type)
+                if cost is not None:
                     rect = pygame.Rect(10, start_y, 180, button_height)
                     self.upgrade_buttons[upgrade_type] = {
                         "rect": rect,
@@ -64,87 +112,45 @@ class Game:
                         "level": current_level
                     }
                     start_y += button_height + margin
-
-    def handle_splash_damage(self, enemy, damage, splash_radius):
-        hit_pos = (enemy.x, enemy.y)
-        for other_enemy in self.enemies:
-            if other_enemy != enemy:
-                dx = other_enemy.x - hit_pos[0]
-                dy = other_enemy.y - hit_pos[1]
-                distance = math.sqrt(dx*dx + dy*dy)
-                if distance <= splash_radius:
-                    # Damage falls off with distance
-                    damage_multiplier = 1 - (distance / splash_radius)
-                    other_enemy.health -= damage * damage_multiplier
+        self.upgrade_panel.set_tower(self.selected_tower, self.upgrade_buttons)
 
     def update(self):
-        if not self.game_started:
-            return
+        self.fast_forward.run(self.simulation)
+        if self.autosaver is not None:
+            self.autosaver.update()
 
-        # Update wave timer and spawn enemies
-        if self.wave_timer > 0:
-            self.wave_timer -= self.game_speed
-        elif not self.wave_active:
-            self.wave_number += 1
-            self.enemies_spawned = 0
-            self.wave_active = True
-            self.wave_timer = WAVE_TIMER * 60
+    def set_profiler(self, profiler):
+        """Time this game's update and draw phases with a FrameProfiler, or stop with None"""
+        self.profiler = profiler
+        self.simulation.profiler = profiler
 
-        # Update based on game speed
-        for _ in range(self.game_speed):
-            # Update enemies
-            for enemy in self.enemies[:]:
-                enemy.move()
-                if enemy.health <= 0:
-                    self.money += enemy.value
-                    self.enemies.remove(enemy)
-                elif enemy.reached_end:
-                    damage = 20 if isinstance(enemy, BossEnemy) else 10
-                    self.base_health -= damage
-                    self.base_shake = 10
-                    self.enemies.remove(enemy)
+    def mark(self, phase):
+        if self.profiler is not None:
+            self.profiler.lap(phase)
 
-            # Update towers
-            for tower in self.towers:
-                # Store old enemy health values to detect hits
-                old_health = {enemy: enemy.health for enemy in self.enemies}
-                
-                tower.update(self.enemies)
-                
-                # Check for hits and apply splash damage
-                for enemy in self.enemies:
-                    if enemy.health < old_health[enemy]:
-                        # Hit detected, apply splash damage if tower has it
-                        if "splash_damage" in tower.stats and tower.stats["splash_damage"] > 0:
-                            splash_radius = tower.stats["range"] * 0.3  # 30% of tower range
-                            self.handle_splash_damage(enemy, tower.stats["splash_damage"], splash_radius)
+    def hold(self):
+        """Keep the simulation clock from running while the game isn't updated"""
+        self.fast_forward.hold()
 
-            # Spawn enemies
-            if self.wave_active and self.enemies_spawned < WAVE_ENEMY_COUNT:
-                self.spawn_counter += 1
-                if self.spawn_counter >= 60:  # Spawn rate
-                    self.spawn_counter = 0
-                    if self.wave_number % BOSS_WAVE_INTERVAL == 0:
-                        self.enemies.append(BossEnemy(self.wave_number))
-                    else:
-                        self.enemies.append(Enemy(self.wave_number))
-                    self.enemies_spawned += 1
-                    if self.enemies_spawned >= WAVE_ENEMY_COUNT:
-                        self.wave_active = False
+    def should_render(self):
+        return self.fast_forward.should_render()
 
-            # Update base shake effect
-            if self.base_shake > 0:
-                self.base_shake -= 1
+    def base_bounds(self):
+        half_width = BASE_SIZE * 0.75 + SHAKE_INTENSITY + 2
+        top = BASE_SIZE // 3 + 13 + SHAKE_INTENSITY + 2
+        bottom = BASE_SIZE // 2 + SHAKE_INTENSITY + 2
+        return pygame.Rect(BASE_POSITION[0] - half_width, BASE_POSITION[1] - top,
+                           half_width * 2, top + bottom)
 
     def draw_base(self):
         # Calculate shake offset
-        shake_x = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.base_shake > 0 else 0
-        shake_y = random.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.base_shake > 0 else 0
+        shake_x = self.effects_rng.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.simulation.base_shake > 0 else 0
+        shake_y = self.effects_rng.randint(-SHAKE_INTENSITY, SHAKE_INTENSITY) if self.simulation.base_shake > 0 else 0
         base_x = BASE_POSITION[0] + shake_x
         base_y = BASE_POSITION[1] + shake_y
         
         # Calculate health percentage
-        health_percent = self.base_health / BASE_HEALTH
+        health_percent = self.simulation.base_health / BASE_HEALTH
         
         # Bridge main structure (horizontal beam)
         bridge_width = BASE_SIZE * 1.5
@@ -179,10 +185,10 @@ class Game:
         else:
             # Draw broken bridge
             for i in range(4):
-                if random.random() > 0.5:  # Random broken planks
+                if self.effects_rng.random() > 0.5:  # Random broken planks
                     plank_x = base_x - bridge_width//2 + (bridge_width//4) * i
                     plank_width = bridge_width//5
-                    plank_height = bridge_height * random.uniform(0.3, 0.7)
+                    plank_height = bridge_height * self.effects_rng.uniform(0.3, 0.7)
                     pygame.draw.rect(self.screen, (101, 67, 33),  # Darker wood color
                                    (plank_x, base_y - bridge_height//2,
                                     plank_width, plank_height))
@@ -205,17 +211,14 @@ class Game:
 
     def draw_death_screen(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
+        self.death_overlay.draw(self.screen)
         
         # Draw game over text
-        font_big = pygame.font.Font(None, 72)
-        font_small = pygame.font.Font(None, 36)
+        font_big = get_font(72)
+        font_small = get_font(36)
         
         game_over = font_big.render("Game Over!", True, (255, 0, 0))
-        wave_text = font_small.render(f"You survived {self.wave_number} waves", True, (255, 255, 255))
+        wave_text = font_small.render(f"You survived {self.simulation.wave_number} waves", True, (255, 255, 255))
         retry_text = font_small.render("Press R to Retry", True, (255, 255, 255))
         menu_text = font_small.render("Press M for Menu", True, (255, 255, 255))
         
@@ -224,145 +227,137 @@ class Game:
         self.screen.blit(retry_text, (WINDOW_WIDTH//2 - retry_text.get_width()//2, WINDOW_HEIGHT//2 + 50))
         self.screen.blit(menu_text, (WINDOW_WIDTH//2 - menu_text.get_width()//2, WINDOW_HEIGHT//2 + 100))
 
-    def draw_start_button(self):
-        # Draw start button in bottom right
-        color = (60, 120, 60) if not self.game_started else (100, 100, 100)
-        pygame.draw.rect(self.screen, color, self.start_button_rect)
-        pygame.draw.rect(self.screen, (100, 255, 100), self.start_button_rect, 3)
-        
-        text = self.font.render("Start", True, UI_TEXT)
-        text_rect = text.get_rect(center=self.start_button_rect.center)
-        self.screen.blit(text, text_rect)
+    def invalidate(self):
+        """Redraw and present the whole window next frame"""
+        self.dirty.invalidate()
 
-    def draw_upgrade_panel(self):
-        if not self.selected_tower:
-            return
-            
-        # Draw panel background
-        panel_height = len(self.upgrade_buttons) * 50 + 220  # Extra space for stats
-        panel_rect = pygame.Rect(5, 50, 200, panel_height)
-        pygame.draw.rect(self.screen, UI_PANEL, panel_rect)
-        pygame.draw.rect(self.screen, UI_BORDER, panel_rect, 2)
-        
-        # Draw tower info and current stats
-        title = self.font.render(f"{self.selected_tower.type.title()}", True, UI_TEXT)
-        self.screen.blit(title, (15, 60))
-        
-        # Draw current stats with labels
-        y = 100
-        stats_to_show = {
-            "damage": "Damage",
-            "range": "Range",
-            "fire_rate": "Fire Rate",
-            "splash_damage": "Splash Damage"
-        }
-        
-        for stat, label in stats_to_show.items():
-            if stat in self.selected_tower.stats:
-                value = self.selected_tower.stats[stat]
-                if stat == "fire_rate":
-                    # Convert fire rate to shots per second
-                    text = f"{label}: {60/value:.1f}/s"
-                else:
-                    text = f"{label}: {value}"
-                stat_text = self.stats_font.render(text, True, UI_TEXT)
-                self.screen.blit(stat_text, (15, y))
-                y += 25
-        
-        # Draw upgrade buttons
-        y += 20  # Add spacing between stats and upgrade buttons
-        for upgrade_type, button in self.upgrade_buttons.items():
-            rect = pygame.Rect(10, y, 180, 40)  # Update button position
-            button["rect"] = rect  # Store updated rect
-            cost = button["cost"]
-            level = button["level"]
-            
-            # Draw button
-            color = (60, 120, 60) if self.money >= cost else (120, 60, 60)
-            pygame.draw.rect(self.screen, color, rect)
-            pygame.draw.rect(self.screen, UI_BORDER, rect, 2)
-            
-            # Draw text
-            text = f"{upgrade_type.replace('_', ' ').title()} (${cost})"
-            text_surface = self.font.render(text, True, UI_TEXT)
-            self.screen.blit(text_surface, (rect.x + 10, rect.y + 10))
-            
-            # Draw level indicators
-            for i in range(3):
-                indicator_rect = pygame.Rect(rect.right - 60 + i*15, rect.y + 5, 10, 10)
-                color = (0, 255, 0) if i < level else (100, 100, 100)
-                pygame.draw.rect(self.screen, color, indicator_rect)
-            
-            y += 50
+    def toggle_dirty_rendering(self):
+        self.dirty_rendering = not self.dirty_rendering
+        self.invalidate()
+
+    def update_ui(self):
+        # Give the HUD widgets their current inputs
+        if self.upgrade_panel.tower is not self.selected_tower:
+            self.upgrade_panel.set_tower(self.selected_tower, self.upgrade_buttons)
+        self.tower_selector.money = self.simulation.money
+        self.speed_label.visible = self.fast_forward.speed != 1
+
+    def mark_dirty_regions(self):
+        # Moving entities are always redrawn, where they are drawn between
+        # the last two ticks
+        alpha = self.fast_forward.alpha
+        for enemy in self.simulation.enemies:
+            self.dirty.add(enemy.get_bounds(alpha))
+        for rect in self.simulation.projectiles.get_bounds(alpha):
+            self.dirty.add(rect)
+        
+        # Towers only when they turned, were upgraded or selected
+        tower_keys = {}
+        for tower in self.simulation.towers:
+            key = (tower.rotation, tower.show_range, tower.stats["range"], tuple(tower.upgrades.items()))
+            tower_keys[tower] = key
+            # Translucent range circles can't be drawn over themselves
+            if tower.show_range or self.tower_keys.get(tower) != key:
+                self.dirty.add(tower.get_bounds())
+            if tower.show_range and tower.target:
+                line = pygame.Rect(min(tower.x, tower.target.x), min(tower.y, tower.target.y),
+                                   abs(tower.x - tower.target.x), abs(tower.y - tower.target.y))
+                self.dirty.add(line.inflate(4, 4))
+        self.tower_keys = tower_keys
+        
+        if self.simulation.base_shake > 0 or self.simulation.base_health != self.last_base_health:
+            self.dirty.add(self.base_bounds())
+        self.last_base_health = self.simulation.base_health
+        
+        if self.is_placing_tower and self.selected_tower_type:
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            self.dirty.add((mouse_x - 20, mouse_y - 20, 40, 40))
+        for x, y, _ in self.hint or ():
+            self.dirty.add((x - 20, y - 20, 40, 40))
+        
+        # Widgets are presented when they re-render. Translucent ones can't
+        # be drawn over themselves, so they are restored every frame
+        for widget in self.hud + self.hud_buttons:
+            if widget.refresh() or (widget.visible and not widget.opaque):
+                self.dirty.add(widget.rect)
 
     def draw(self):
-        # Draw background and path
-        self.screen.fill((34, 139, 34))  # Green background
-        for i in range(len(PATH_POINTS) - 1):
-            pygame.draw.line(self.screen, (139, 69, 19), PATH_POINTS[i], 
-                           PATH_POINTS[i + 1], 40)
+        draw_start = time.perf_counter()
+        
+        # Restore changed regions (or everything) from the cached background
+        self.update_ui()
+        if self.dirty_rendering and self.simulation.base_health > 0:
+            self.mark_dirty_regions()
+        else:
+            self.invalidate()
+        self.dirty.begin_frame(self.screen, self.background)
         
         # Draw base
-        self.draw_base()
+        if self.dirty.redraw(self.base_bounds()):
+            self.draw_base()
         
         # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        alpha = self.fast_forward.alpha
+        self.enemy_renderer.draw(self.screen, self.simulation.enemies, alpha)
             
         # Draw towers
-        for tower in self.towers:
-            tower.draw(self.screen)
+        for tower in self.simulation.towers:
+            if self.dirty.redraw(tower.get_bounds()):
+                tower.draw(self.screen)
+        self.simulation.projectiles.draw(self.screen, alpha)
+        
+        # Draw suggested spots that are still free
+        for x, y, tower_type in self.hint or ():
+            if self.can_place_tower((x, y)):
+                sprite = HINT_SPRITES.get((TOWER_TYPES[tower_type]["color"],))
+                self.screen.blit(sprite, (x - 20, y - 20))
         
         # Draw tower placement preview
         if self.is_placing_tower and self.selected_tower_type:
             mouse_pos = pygame.mouse.get_pos()
             color = TOWER_TYPES[self.selected_tower_type]["color"]
-            alpha = 128 if self.can_place_tower(mouse_pos) else 64
-            preview_surface = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(preview_surface, (*color, alpha), (20, 20), 20)
-            self.screen.blit(preview_surface, (mouse_pos[0] - 20, mouse_pos[1] - 20))
-        
-        # Draw UI elements
-        self.draw_status_bar()
-        self.tower_selector.draw(self.screen, self.money)
-        if self.selected_tower:
-            self.draw_upgrade_panel()
-        
-        if self.base_health <= 0:
+            preview_alpha = 128 if self.can_place_tower(mouse_pos) else 64
+            sprite = PREVIEW_SPRITES.get((color, preview_alpha))
+            self.screen.blit(sprite, (mouse_pos[0] - 20, mouse_pos[1] - 20))
+        self.mark("draw_world")
+        
+        # Draw UI elements from their cached layers
+        self.draw_widgets(self.hud)
+        
+        if self.simulation.base_health <= 0:
             self.draw_death_screen()
         
-        # Draw start button
-        self.draw_start_button()
-            
-        pygame.display.flip()
-        self.clock.tick(60)
+        # Draw start and speed buttons
+        self.draw_widgets(self.hud_buttons)
+        self.mark("draw_ui")
+        
+        self.fast_forward.record_render(time.perf_counter() - draw_start)
+
+    def draw_widgets(self, widgets):
+        for widget in widgets:
+            if self.dirty.redraw(widget.rect):
+                widget.draw(self.screen)
+
+    def mark_dirty(self, *rects):
+        """Register regions drawn over the game by someone else this frame"""
+        for rect in rects:
+            self.dirty.add(rect)
 
-    def draw_status_bar(self):
-        # Draw top status bar background
-        pygame.draw.rect(self.screen, UI_PANEL, (0, 0, WINDOW_WIDTH, 40))
-        
-        # Draw wave info
-        wave_text = f"Wave {self.wave_number}"
-        if not self.wave_active:
-            next_wave = int(self.wave_timer / 60)
-            wave_text += f" (Next: {next_wave}s)"
-        text = self.font.render(wave_text, True, UI_TEXT)
-        self.screen.blit(text, (10, 10))
-        
-        # Draw money
-        money_text = self.font.render(f"${self.money}", True, UI_TEXT)
-        self.screen.blit(money_text, (WINDOW_WIDTH//2 - money_text.get_width()//2, 10))
-        
-        # Draw health
-        health_text = self.font.render(f"Health: {self.base_health}", True, UI_TEXT)
-        self.screen.blit(health_text, (WINDOW_WIDTH - health_text.get_width() - 10, 10))
+    def present(self):
+        rects = self.dirty.end_frame()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
     def handle_events(self, events):
-        if self.base_health <= 0:
+        if self.simulation.base_health <= 0:
             for event in events:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
-                        self.__init__(self.difficulty)
+                        profiler = self.profiler
+                        self.__init__(self.difficulty, self.target_fps)
+                        self.set_profiler(profiler)
                         return "restart"
                     elif event.key == pygame.K_m:
                         return "menu"
@@ -371,10 +366,35 @@ class Game:
         mouse_pos = pygame.mouse.get_pos()
         
         for event in events:
+            if event.type == pygame.KEYDOWN:
+                # Cycle the selected tower's targeting mode
+                if event.key == pygame.K_t and self.selected_tower:
+                    self.simulation.set_targeting(self.selected_tower,
+                                                  self.selected_tower.next_targeting())
+                # Cycle fast-forward speed
+                elif event.key == pygame.K_f:
+                    self.cycle_speed()
+                # Save the input log so the match can be replayed headlessly
+                elif event.key == pygame.K_F9:
+                    self.save_replay()
+                # Switch between dirty-rect and full-window presentation
+                elif event.key == pygame.K_F8:
+                    self.toggle_dirty_rendering()
+                # Save a snapshot of the match, or resume from the newest one
+                elif event.key == pygame.K_F5:
+                    self.save_snapshot()
+                elif event.key == pygame.K_F6:
+                    self.load_latest_snapshot()
+                    
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # Check start button
                 if self.start_button_rect.collidepoint(mouse_pos):
-                    self.game_started = True
+                    self.simulation.start()
+                    return
+                
+                # Check speed button
+                if self.speed_button_rect.collidepoint(mouse_pos):
+                    self.cycle_speed()
                     return
                 
                 # Check tower selector
@@ -387,26 +407,19 @@ class Game:
                 # Left click
                 if event.button == 1:
                     if self.is_placing_tower:
-                        if self.can_place_tower(mouse_pos):
-                            cost = TOWER_TYPES[self.selected_tower_type]["cost"]
-                            if self.money >= cost:
-                                self.money -= cost
-                                self.towers.append(Tower(mouse_pos[0], mouse_pos[1], 
-                                                       self.selected_tower_type))
+                        self.simulation.place_tower(mouse_pos[0], mouse_pos[1],
+                                                    self.selected_tower_type)
                     else:
                         # Check upgrade buttons if tower selected
                         if self.selected_tower:
                             for upgrade_type, button in self.upgrade_buttons.items():
                                 if button["rect"].collidepoint(mouse_pos):
-                                    cost = button["cost"]
-                                    if self.money >= cost:
-                                        self.money -= cost
-                                        self.apply_upgrade(self.selected_tower, upgrade_type)
+                                    if self.simulation.upgrade_tower(self.selected_tower, upgrade_type):
                                         self.setup_upgrade_buttons()
                                     return
                         
                         # Check tower selection
-                        for tower in self.towers:
+                        for tower in self.simulation.towers:
                             dx = mouse_pos[0] - tower.x
                             dy = mouse_pos[1] - tower.y
                             if dx*dx + dy*dy <= (30*30):  # 30 pixel radius
@@ -431,54 +444,77 @@ class Game:
                         self.selected_tower = None
                         self.upgrade_buttons.clear()
                         
+    def cycle_speed(self):
+        self.fast_forward.cycle_speed()
+        self.simulation.record("speed", self.fast_forward.speed_label())
+        
+    def save_replay(self, directory="replays"):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"replay_{self.simulation.seed}_{self.simulation.tick_count}.tdr")
+        self.recorder.save(path)
+        return path
+        
+    def save_snapshot(self, directory="saves"):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"save_{self.simulation.seed}_{self.simulation.tick_count}.tds")
+        snapshot.save(self.simulation, path)
+        return path
+
+    def load_snapshot(self, path):
+        """Resume the match saved in ``path`` in place of the current one"""
+        snapshot.load(path, self.simulation)
+        self.difficulty = self.simulation.difficulty
+        # Record a new replay starting from the restored state
+        self.recorder = KeyframeRecorder(self.simulation)
+        self.simulation.profiler = self.profiler
+        if self.autosaver is not None:
+            self.autosaver.saved_wave = self.simulation.wave_number
+        self.selected_tower = None
+        self.upgrade_buttons.clear()
+        self.tower_keys = {}
+        self.hint = None
+        self.hint_generation += 1
+        self.invalidate()
+
+    def load_latest_snapshot(self, directories=("saves", "autosaves")):
+        paths = [os.path.join(directory, name) for directory in directories
+                 if os.path.isdir(directory)
+                 for name in os.listdir(directory) if name.endswith(".tds")]
+        if not paths:
+            return None
+        path = max(paths, key=os.path.getmtime)
+        self.load_snapshot(path)
+        return path
+
     def can_place_tower(self, pos):
-        x, y = pos
-        
-        # Check if too close to path
-        for i in range(len(PATH_POINTS) - 1):
-            start = pygame.math.Vector2(PATH_POINTS[i])
-            end = pygame.math.Vector2(PATH_POINTS[i + 1])
-            tower_pos = pygame.math.Vector2(x, y)
-            
-            # Calculate distance to line segment
-            line_vec = end - start
-            point_vec = tower_pos - start
-            line_len = line_vec.length()
-            
-            if line_len:
-                proj = point_vec.dot(line_vec) / line_len
-                proj = max(0, min(proj, line_len))
-                closest = start + (line_vec * proj / line_len)
-                distance = (tower_pos - closest).length()
-                
-                if distance < 40:  # Minimum distance from path
-                    return False
-        
-        # Check if too close to other towers
-        for tower in self.towers:
-            dx = x - tower.x
-            dy = y - tower.y
-            if (dx*dx + dy*dy) < (50*50):  # Minimum distance between towers
-                return False
-                
-        # Check if too close to base
-        dx = x - BASE_POSITION[0]
-        dy = y - BASE_POSITION[1]
-        if (dx*dx + dy*dy) < ((BASE_SIZE + 20) * (BASE_SIZE + 20)):
-            return False
-            
-        return True
+        return self.simulation.can_place_tower(pos)
+
+    def toggle_hint(self, tower_types):
+        """Show or hide suggested spots for spending the current money"""
+        if self.hint is not None:
+            self.hint = None
+            self.invalidate()
+        elif self.hint_thread is None:
+            towers = [(tower.x, tower.y, tower.type) for tower in self.simulation.towers]
+            self.hint_thread = threading.Thread(
+                target=self.find_hint, args=(self.hint_generation, list(tower_types),
+                                             self.simulation.money, towers), daemon=True)
+            self.hint_thread.start()
+
+    def find_hint(self, generation, tower_types, budget, towers):
+        # Runs on the hint thread; the layouts are played from the first wave
+        # with the current towers standing and the current money to spend
+        from src.tools.placement import PlacementOptimizer
+
+        try:
+            optimizer = PlacementOptimizer(tower_types, budget, self.difficulty, towers,
+                                           max_waves=HINT_WAVES, workers=HINT_WORKERS,
+                                           start_method="spawn")
+            results = optimizer.search(HINT_CANDIDATES, HINT_SHORTLIST, keep=1)
+            if generation == self.hint_generation:  # No save loaded meanwhile
+                self.hint = results[0]["layout"] if results else []
+        finally:
+            self.hint_thread = None
 
     def apply_upgrade(self, tower, upgrade_type):
-        tower.upgrades[upgrade_type] = tower.upgrades.get(upgrade_type, 0) + 1
-        level = tower.upgrades[upgrade_type]
-        
-        # Apply upgrade effects
-        if upgrade_type == "damage":
-            tower.stats["damage"] = int(TOWER_TYPES[tower.type]["damage"] * (1.5 ** level))
-        elif upgrade_type == "range":
-            tower.stats["range"] = int(TOWER_TYPES[tower.type]["range"] * (1.3 ** level))
-        elif upgrade_type == "fire_rate":
-            tower.stats["fire_rate"] = int(TOWER_TYPES[tower.type]["fire_rate"] * (0.7 ** level))
-        elif upgrade_type == "splash_damage":
-            tower.stats["splash_damage"] = int(TOWER_TYPES[tower.type]["splash_damage"] * (1.5 ** level))
\ No newline at end of file
+        self.simulation.apply_upgrade(tower, upgrade_type)
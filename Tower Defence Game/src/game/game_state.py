@@ -1,13 +1,23 @@
 import pygame
 import math
+import os
+import time
 from constants import (WINDOW_WIDTH, WINDOW_HEIGHT, INITIAL_TOWERS, 
                      STARTING_MONEY)
 from src.ui.menu import MainMenu, PauseMenu
 from src.ui.settings_menu import SettingsMenu
 from src.ui.difficulty_menu import DifficultyMenu
 from src.ui.shop_menu import ShopMenu
+from src.ui.fonts import get_font
 from src.game.demo_game import GameDemo
 from src.game.game import Game
+from src.game.frame_pacer import FramePacer
+from src.game.profiler import FrameProfiler
+from src.ui.profiler_overlay import ProfilerOverlay
+from src.towers.projectile_system import bake_projectile_sprites
+from src.towers.tower import bake_tower_sprites
+from src.enemies.boss_enemy import bake_boss_sprites
+from src.rendering.enemy_renderer import bake_enemy_sprites
 
 class LoadoutSystem:
     def __init__(self):
@@ -28,7 +38,17 @@ class GameState:
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Tower Defense")
-        self.clock = pygame.time.Clock()
+        bake_projectile_sprites()
+        bake_tower_sprites()
+        bake_boss_sprites()
+        bake_enemy_sprites()
+        # The only place frames are paced; everything else just draws
+        self.pacer = FramePacer()
+        
+        # Per-phase frame timing, only collected while the F3 overlay is on
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.pacer)
+        self.profiling = False
         self.loadout = LoadoutSystem()
         
         # Initialize all game states
@@ -58,10 +78,16 @@ class GameState:
         
     def run(self):
         while True:
+            if self.profiling:
+                self.profiler.begin_frame()
+                
             # Get all events
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
+                    self.profiler.stop_export()
+                    if self.game and self.game.autosaver is not None:
+                        self.game.autosaver.flush()
                     pygame.quit()
                     return
                     
@@ -75,8 +101,14 @@ class GameState:
                         elif self.in_settings:
                             self.in_settings = False
                             self.current_state = self.previous_state
+                    # Profiler overlay, and streaming its samples to a file
+                    elif event.key == pygame.K_F3:
+                        self.toggle_profiler()
+                    elif event.key == pygame.K_F4:
+                        self.toggle_profile_export()
                         
                 self.handle_event(event)
+            self.lap("events")
             
             # Update
             self.update()
@@ -84,8 +116,49 @@ class GameState:
             # Draw
             self.draw()
             
-            # Maintain 60 FPS
-            self.clock.tick(60)
+            if self.profiling:
+                self.profiler.end_frame(self.entity_counts())
+            
+            # Wait for the next frame
+            self.pacer.tick()
+            
+    def lap(self, phase):
+        if self.profiling:
+            self.profiler.lap(phase)
+            
+    def toggle_profiler(self):
+        self.profiling = not self.profiling
+        self.profiler_overlay.visible = self.profiling
+        if self.game:
+            self.game.set_profiler(self.profiler if self.profiling else None)
+        if not self.profiling:
+            self.profiler.stop_export()
+            
+    def toggle_profile_export(self, directory="profiles"):
+        """Start or stop writing every frame's profile to a CSV file"""
+        if self.profiler.is_exporting():
+            self.profiler.stop_export()
+            return None
+        if not self.profiling:
+            self.toggle_profiler()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        self.profiler.start_export(path)
+        return path
+            
+    def entity_counts(self):
+        if self.current_state == "game" and self.game:
+            simulation = self.game.simulation
+            enemies, towers, projectiles = simulation.enemies, simulation.towers, simulation.projectiles
+        else:
+            demo = self.demo_game
+            enemies, towers, projectiles = demo.enemies, demo.towers, demo.projectiles
+        return {
+            "enemies": len(enemies),
+            "bosses": int(enemies.boss_mask().sum()),
+            "towers": len(towers),
+            "projectiles": len(projectiles),
+        }
             
     def handle_event(self, event):
         if self.in_settings:
@@ -120,9 +193,11 @@ class GameState:
             action = self.difficulty_menu.handle_event(event)
             if action in ["easy", "normal", "hard"]:
                 self.selected_difficulty = action
-                self.game = Game(self.selected_difficulty)
+                self.game = Game(self.selected_difficulty, self.pacer.target_fps)
+                if self.profiling:
+                    self.game.set_profiler(self.profiler)
                 self.current_state = "game"
-                self.game.game_started = True  # Auto-start game
+                self.game.simulation.start()  # Auto-start game
             elif action == "back":
                 self.current_state = "main_menu"
                 
@@ -139,6 +214,9 @@ class GameState:
                     self.is_paused = False
                     self.game = None
             else:
+                # Suggest spots for the towers the player owns
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    self.game.toggle_hint(self.loadout.get_available_towers())
                 result = self.game.handle_events([event])
                 if isinstance(result, tuple) and result[0] == "money":
                     _, amount = result
@@ -149,20 +227,10 @@ class GameState:
             self.demo_game.update()  # Update background gameplay
         elif self.current_state == "game" and not self.is_paused and not self.in_settings:
             self.game.update()
-            if self.wave_manager.active_wave:
-                self.enemies_remaining = len(self.wave_manager.active_wave.enemies)
-                if self.enemies_remaining == 0:
-                    self.wave_manager.wave_timer = 0  # Skip timer when all enemies dead
-
-            # Handle intermission after boss waves
-            if self.wave_manager.current_wave % 5 == 0 and self.enemies_remaining == 0:
-                self.in_intermission = True
-                self.intermission_timer = pygame.time.get_ticks()
-
-            if self.in_intermission:
-                if pygame.time.get_ticks() - self.intermission_timer >= self.INTERMISSION_DURATION:
-                    self.in_intermission = False
-                    self.wave_manager.start_next_wave()
+            self.enemies_remaining = len(self.game.simulation.enemies)
+        elif self.current_state == "game":
+            self.game.hold()
+        self.lap("tick_other")
             
     def draw(self):
         if self.current_state == "main_menu":
@@ -171,10 +239,16 @@ class GameState:
             self.main_menu.draw(self.screen, self.demo_game)  # Keep background
             self.difficulty_menu.draw(self.screen)
         elif self.current_state == "game":
+            # Fast-forward skips frames so the simulation gets their time
+            if not self.is_paused and not self.in_settings and not self.game.should_render():
+                return
             self.game.draw()
-            if self.is_paused:
-                self.pause_menu.draw(self.screen)
-            self._draw_ui(self.screen)
+            self.game.mark_dirty(*self._draw_ui(self.screen))
+            if self.is_paused or self.in_settings or self.in_shop:
+                # Menus cover the game, so it is redrawn in full once they close
+                self.game.invalidate()
+                if self.is_paused:
+                    self.pause_menu.draw(self.screen)
         
         # Draw shop menu over any state if active
         if self.in_shop:
@@ -183,28 +257,43 @@ class GameState:
         # Draw settings menu over any state if active
         if self.in_settings:
             self.settings_menu.draw(self.screen)
-                
-        pygame.display.flip()
+        
+        # Draw the profiler overlay over everything
+        if self.profiler_overlay.visible:
+            self.profiler_overlay.draw(self.screen)
+            if self.current_state == "game":
+                self.game.mark_dirty(self.profiler_overlay.rect)
+        self.lap("draw_ui")
+        
+        # The game presents only the regions it changed
+        if self.current_state == "game" and not (self.is_paused or self.in_settings or self.in_shop):
+            self.game.present()
+        else:
+            pygame.display.flip()
+        self.lap("present")
         
     def _draw_ui(self, screen):
-        font = pygame.font.Font(None, 36)
+        """Draw the in-game overlay, returning the rects it covered"""
+        font = get_font(36)
+        rects = []
         
         # Draw enemies remaining
         enemies_text = f"Enemies Remaining: {self.enemies_remaining}"
         text_surface = font.render(enemies_text, True, (255, 255, 255))
-        screen.blit(text_surface, (10, 10))
+        rects.append(screen.blit(text_surface, (10, 10)))
         
         # Draw kill streak and multiplier
         streak_text = f"Kill Streak: {self.kill_streak} (x{self.score_multiplier})"
         streak_surface = font.render(streak_text, True, (255, 255, 0))
-        screen.blit(streak_surface, (10, 50))
+        rects.append(screen.blit(streak_surface, (10, 50)))
         
         # Draw intermission
         if self.in_intermission:
-            font_large = pygame.font.Font(None, 72)
+            font_large = get_font(72)
             intermission_text = "INTERMISSION!"
             text_surface = font_large.render(intermission_text, True, (255, 165, 0))
-            screen.blit(text_surface, (
+            rects.append(screen.blit(text_surface, (
                 screen.get_width()//2 - text_surface.get_width()//2,
                 screen.get_height()//2 - text_surface.get_height()//2
-            ))
\ No newline at end of file
+            )))
+        return rects
\ No newline at end of file
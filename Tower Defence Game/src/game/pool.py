@@ -0,0 +1,40 @@
+class ObjectPool:
+    """Free list of reusable objects that are re-initialized with reset().
+
+    Counts hits (acquire served from the free list), misses (a new object
+    had to be built) and the high-water mark of objects in use.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.hits += 1
+        else:
+            obj = self.factory(*args)
+            self.misses += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "high_water": self.high_water,
+            "in_use": self.in_use,
+            "free": len(self.free)
+        }
@@ -0,0 +1,114 @@
+import csv
+import json
+import time
+from collections import deque
+import numpy as np
+from constants import PROFILER_WINDOW, PROFILER_SUMMARY_INTERVAL
+
+# Frame phases in display order. Simulation phases add up over every tick
+# run in a frame; "tick_other" is the rest of the update path.
+PROFILER_PHASES = ("events", "enemy_move", "targeting", "projectiles", "splash",
+                   "spawning", "tick_other", "draw_world", "draw_ui", "present")
+# Entity counts exported with each frame, as count_<name> CSV columns and a
+# "counts" object in JSONL, so they never clash with phase names
+PROFILER_COUNTS = ("enemies", "bosses", "towers", "projectiles")
+
+class FrameProfiler:
+    """Times the phases of each frame.
+
+    Code calls lap(phase) at the end of each phase, which charges the time
+    since the previous lap to it, so a boundary costs a single clock read.
+    Samples are kept for a rolling window, summarized every
+    PROFILER_SUMMARY_INTERVAL frames, and can be streamed to a CSV or JSONL
+    file as they are taken.
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.samples = {phase: deque(maxlen=window) for phase in PROFILER_PHASES + ("total",)}
+        self.counts = {}
+        self.current = None
+        self.frame_start = 0.0
+        self.frame_time = 0.0  # Wall clock at frame start, for exports
+        self.last_lap = 0.0
+        self.frames = 0
+        self.summary = {}
+        self.summary_frame = 0  # Frame the summary was taken at
+        self.export_file = None
+        self.export_writer = None
+        self.export_path = None
+
+    def begin_frame(self):
+        self.frame_start = self.last_lap = time.perf_counter()
+        if self.export_file is not None:
+            # perf_counter has no fixed epoch, so exports use wall clock time
+            # to line up with logs
+            self.frame_time = time.time()
+        self.current = dict.fromkeys(PROFILER_PHASES, 0.0)
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        if self.current is not None:
+            self.current[phase] += now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self, counts=None):
+        """Record the frame, with entity counts, and return its sample"""
+        if self.current is None:
+            return None
+        sample = {phase: seconds * 1000 for phase, seconds in self.current.items()}
+        sample["total"] = (time.perf_counter() - self.frame_start) * 1000
+        for phase, value in sample.items():
+            self.samples[phase].append(value)
+        self.counts = counts or {}
+        self.current = None
+        self.frames += 1
+
+        if self.export_file is not None:
+            self._export(sample)
+        if self.frames % PROFILER_SUMMARY_INTERVAL == 0 or not self.summary:
+            self.summary = self.summarize()
+            self.summary_frame = self.frames
+        return sample
+
+    def summarize(self):
+        """Average, p95 and p99 in milliseconds for every phase and the frame"""
+        summary = {}
+        for phase, values in self.samples.items():
+            if not values:
+                continue
+            times = np.array(values)
+            p95, p99 = np.percentile(times, [95, 99]).tolist()
+            summary[phase] = {"avg": float(times.mean()), "p95": p95, "p99": p99}
+        return summary
+
+    def start_export(self, path):
+        """Stream every following frame to ``path``; .csv or JSON lines otherwise"""
+        self.stop_export()
+        self.export_path = path
+        self.export_file = open(path, "w", newline="")
+        self.frame_time = time.time()
+        if path.endswith(".csv"):
+            self.export_writer = csv.writer(self.export_file)
+            self.export_writer.writerow(["frame", "time", "total", *PROFILER_PHASES,
+                                         *(f"count_{name}" for name in PROFILER_COUNTS)])
+
+    def stop_export(self):
+        if self.export_file is not None:
+            self.export_file.close()
+        self.export_file = None
+        self.export_writer = None
+
+    def is_exporting(self):
+        return self.export_file is not None
+
+    def _export(self, sample):
+        counts = self.counts
+        if self.export_writer is not None:
+            self.export_writer.writerow(
+                [self.frames, round(self.frame_time, 6), round(sample["total"], 4),
+                 *(round(sample[phase], 4) for phase in PROFILER_PHASES),
+                 *(counts.get(name, 0) for name in PROFILER_COUNTS)])
+        else:
+            record = {"frame": self.frames, "time": self.frame_time, **sample,
+                      "counts": {name: counts.get(name, 0) for name in PROFILER_COUNTS}}
+            self.export_file.write(json.dumps(record) + "\n")
@@ -0,0 +1,329 @@
+import bisect
+import json
+import os
+import struct
+from constants import REPLAY_KEYFRAME_INTERVAL
+from src.game.simulation import Simulation
+from src.game import snapshot
+
+REPLAY_VERSION = 1
+
+# Keyframed replays are a stream of chunks, each a type, tick and payload
+# size followed by the payload, so a reader can skip keyframes unread
+KEYFRAME_REPLAY_MAGIC = b"TDRP"
+KEYFRAME_REPLAY_VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+CHUNK = struct.Struct("<BqI")
+CHUNK_START = 1     # JSON: difficulty, seed and keyframe interval
+CHUNK_INPUT = 2     # JSON: [action, *args]
+CHUNK_KEYFRAME = 3  # A snapshot, see src.game.snapshot
+CHUNK_WAVE = 4      # WAVE_RECORD as a new wave starts
+CHUNK_END = 5       # WAVE_RECORD, then the final state hash
+# Wave, money, base health, kills, leaks and towers at the chunk's tick, and
+# the most enemies and projectiles alive at once since the previous record
+WAVE_RECORD = struct.Struct("<iqqqqiii")
+WAVE_FIELDS = ("wave", "money", "base_health", "kills", "leaks", "towers",
+               "peak_enemies", "peak_projectiles")
+
+class InputRecorder:
+    """Logs a simulation's player commands with the tick they happened on"""
+
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.inputs = []
+        simulation.recorder = self
+
+    def record(self, tick, action, *args):
+        self.inputs.append([tick, action, *args])
+
+    def after_tick(self, simulation):
+        pass
+
+    def to_dict(self):
+        simulation = self.simulation
+        return {
+            "version": REPLAY_VERSION,
+            "difficulty": simulation.difficulty,
+            "seed": simulation.seed,
+            "end_tick": simulation.tick_count,
+            "final_hash": simulation.state_hash(),
+            "inputs": self.inputs
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+class Replayer:
+    """Re-runs a recorded match headlessly from its seed and input log"""
+
+    def __init__(self, log):
+        if log["version"] != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {log['version']}")
+        self.log = log
+        self.simulation = Simulation(log["difficulty"], log["seed"])
+        self.next_input = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def apply_inputs(self):
+        """Apply the inputs stamped with the current tick or earlier"""
+        simulation = self.simulation
+        inputs = self.log["inputs"]
+        while self.next_input < len(inputs) and inputs[self.next_input][0] <= simulation.tick_count:
+            _, action, *args = inputs[self.next_input]
+            simulation.apply_input(action, *args)
+            self.next_input += 1
+
+    def run(self, until_tick=None):
+        """Advance to until_tick (default: the recorded end) and return the simulation.
+
+        The state returned is the one reached by that tick, before the
+        inputs stamped with it, matching the live game at that tick.
+        """
+        if until_tick is None:
+            until_tick = self.log["end_tick"]
+        simulation = self.simulation
+
+        while simulation.tick_count < until_tick:
+            # Inputs are applied before the tick they were stamped with
+            self.apply_inputs()
+            if not simulation.is_running():
+                break
+            simulation.tick()
+        return simulation
+
+    def verify(self):
+        """Replay the whole log and check the final state matches the recording"""
+        self.run()
+        # The recording was saved after the inputs of its last tick
+        self.apply_inputs()
+        return self.simulation.state_hash() == self.log["final_hash"]
+
+class KeyframeRecorder(InputRecorder):
+    """Records a keyframed replay: the input log plus a snapshot every
+    ``keyframe_interval`` ticks and a summary record at each wave start.
+
+    Recording can start at any point of a match, since the first keyframe
+    is taken straight away.
+    """
+
+    def __init__(self, simulation, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        super().__init__(simulation)
+        self.keyframe_interval = keyframe_interval
+        self.chunks = []
+        self.peak_enemies = 0
+        self.peak_projectiles = 0
+        self.wave = simulation.wave_number
+        start = {"difficulty": simulation.difficulty, "seed": simulation.seed,
+                 "start_tick": simulation.tick_count, "keyframe_interval": keyframe_interval}
+        self._add(CHUNK_START, simulation.tick_count, json.dumps(start).encode())
+        self._add(CHUNK_WAVE, simulation.tick_count, self._wave_record(simulation))
+        self._add_keyframe(simulation)
+
+    def _add(self, kind, tick, payload):
+        self.chunks.append(CHUNK.pack(kind, tick, len(payload)) + payload)
+
+    def _add_keyframe(self, simulation):
+        self.last_keyframe = simulation.tick_count
+        self._add(CHUNK_KEYFRAME, simulation.tick_count, snapshot.snapshot(simulation))
+
+    def _wave_record(self, simulation):
+        record = WAVE_RECORD.pack(simulation.wave_number, simulation.money, simulation.base_health,
+                                  simulation.stats["kills"], simulation.stats["leaks"],
+                                  len(simulation.towers), self.peak_enemies, self.peak_projectiles)
+        self.peak_enemies = len(simulation.enemies)
+        self.peak_projectiles = len(simulation.projectiles)
+        return record
+
+    def record(self, tick, action, *args):
+        super().record(tick, action, *args)
+        self._add(CHUNK_INPUT, tick, json.dumps([action, *args]).encode())
+
+    def after_tick(self, simulation):
+        self.peak_enemies = max(self.peak_enemies, len(simulation.enemies))
+        self.peak_projectiles = max(self.peak_projectiles, len(simulation.projectiles))
+        if simulation.wave_number != self.wave:
+            self.wave = simulation.wave_number
+            self._add(CHUNK_WAVE, simulation.tick_count, self._wave_record(simulation))
+        if simulation.tick_count - self.last_keyframe >= self.keyframe_interval:
+            self._add_keyframe(simulation)
+
+    def save(self, path):
+        simulation = self.simulation
+        end = self._wave_record(simulation) + simulation.state_hash().encode()
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(KEYFRAME_REPLAY_MAGIC, KEYFRAME_REPLAY_VERSION))
+            f.writelines(self.chunks)
+            f.write(CHUNK.pack(CHUNK_END, simulation.tick_count, len(end)) + end)
+
+class ReplayReader:
+    """Indexes a keyframed replay without building any game objects.
+
+    Inputs and wave records are read; keyframes are only located, and
+    loaded on request. A file cut short, e.g. by an interrupted copy, reads
+    up to its last whole chunk; one with no keyframe left is empty.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.start = None
+        self.inputs = []     # (chunk index, tick, action, args)
+        self.keyframes = []  # (chunk index, tick, file offset, size)
+        self.waves = []      # (tick, record dict)
+        self.end_tick = None
+        self.final_hash = None
+
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size:
+                raise ValueError("Not a keyframed replay")
+            magic, version = FILE_HEADER.unpack(header)
+            if magic != KEYFRAME_REPLAY_MAGIC:
+                raise ValueError("Not a keyframed replay")
+            if version != KEYFRAME_REPLAY_VERSION:
+                raise ValueError(f"Unsupported replay version {version}")
+            index = 0
+            while True:
+                header = f.read(CHUNK.size)
+                if len(header) < CHUNK.size:
+                    break
+                kind, tick, size = CHUNK.unpack(header)
+                if kind == CHUNK_KEYFRAME:
+                    if f.tell() + size > file_size:
+                        break
+                    self.keyframes.append((index, tick, f.tell(), size))
+                    f.seek(size, 1)
+                else:
+                    payload = f.read(size)
+                    if len(payload) < size:
+                        break
+                    self._read_chunk(index, kind, tick, payload)
+                index += 1
+        self.keyframe_ticks = [tick for _, tick, _, _ in self.keyframes]
+        if self.end_tick is None:
+            start_tick = self.start["start_tick"] if self.start is not None else 0
+            self.end_tick = max([tick for tick, _ in self.waves] + self.keyframe_ticks
+                                + [tick for _, tick, _, _ in self.inputs], default=start_tick)
+
+    def is_empty(self):
+        """True when there is no keyframe to play from"""
+        return self.start is None or not self.keyframes
+
+    def _read_chunk(self, index, kind, tick, payload):
+        if kind == CHUNK_START:
+            self.start = json.loads(payload)
+        elif kind == CHUNK_INPUT:
+            action, *args = json.loads(payload)
+            self.inputs.append((index, tick, action, args))
+        elif kind in (CHUNK_WAVE, CHUNK_END):
+            record = dict(zip(WAVE_FIELDS, WAVE_RECORD.unpack_from(payload)))
+            self.waves.append((tick, record))
+            if kind == CHUNK_END:
+                self.end_tick = tick
+                self.final_hash = payload[WAVE_RECORD.size:].decode()
+
+    def read_keyframe(self, position):
+        _, _, offset, size = self.keyframes[position]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def nearest_keyframe(self, tick):
+        """Position of the last keyframe at or before ``tick``"""
+        return max(bisect.bisect_right(self.keyframe_ticks, tick) - 1, 0)
+
+    def wave_summaries(self):
+        """What happened in each wave, from one wave start to the next"""
+        summaries = []
+        for (start_tick, start), (end_tick, end) in zip(self.waves, self.waves[1:]):
+            if start["wave"] == 0:
+                continue  # Before the first wave
+            summaries.append({
+                "wave": start["wave"],
+                "start_tick": start_tick,
+                "ticks": end_tick - start_tick,
+                "money_start": start["money"],
+                "money_end": end["money"],
+                "base_damage": start["base_health"] - end["base_health"],
+                "kills": end["kills"] - start["kills"],
+                "leaks": end["leaks"] - start["leaks"],
+                "towers": end["towers"],
+                "peak_enemies": end["peak_enemies"],
+                "peak_projectiles": end["peak_projectiles"],
+            })
+        return summaries
+
+class KeyframeReplayer:
+    """Plays a keyframed replay from any tick.
+
+    Seeking restores the nearest keyframe before the target and simulates
+    forward from there, applying the inputs recorded after it.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.simulation = None
+        self.next_input = 0
+
+    @classmethod
+    def load(cls, path):
+        return cls(ReplayReader(path))
+
+    def seek(self, tick):
+        """Return the simulation as it was at ``tick``"""
+        reader = self.reader
+        if reader.is_empty():
+            raise ValueError("Replay has no keyframes to play from")
+        position = reader.nearest_keyframe(tick)
+        index = reader.keyframes[position][0]
+        # Carry on from where we are when that's no further than the keyframe
+        if (self.simulation is None or self.simulation.tick_count > tick
+                or reader.keyframe_ticks[position] > self.simulation.tick_count):
+            self.simulation = snapshot.restore(reader.read_keyframe(position))
+            self.next_input = bisect.bisect_right([entry[0] for entry in reader.inputs], index)
+        return self.run(tick)
+
+    def apply_inputs(self):
+        """Apply the inputs stamped with the current tick or earlier"""
+        simulation = self.simulation
+        inputs = self.reader.inputs
+        while self.next_input < len(inputs) and inputs[self.next_input][1] <= simulation.tick_count:
+            _, _, action, args = inputs[self.next_input]
+            simulation.apply_input(action, *args)
+            self.next_input += 1
+
+    def run(self, until_tick=None):
+        """Advance to until_tick (default: the recorded end) and return the simulation.
+
+        Like keyframes, the state returned is the one reached by that tick,
+        before the inputs stamped with it.
+        """
+        if self.simulation is None:
+            return self.seek(until_tick if until_tick is not None else 0)
+        if until_tick is None:
+            until_tick = self.reader.end_tick
+        simulation = self.simulation
+
+        while simulation.tick_count < until_tick:
+            # Inputs are applied before the tick they were stamped with
+            self.apply_inputs()
+            if not simulation.is_running():
+                break
+            simulation.tick()
+        return simulation
+
+    def verify(self):
+        """Replay from the first keyframe and check the final state matches the recording"""
+        if self.reader.is_empty():
+            return False
+        self.simulation = None
+        self.seek(self.reader.keyframe_ticks[0])
+        self.run()
+        # The recording was saved after the inputs of its last tick
+        self.apply_inputs()
+        return self.simulation.state_hash() == self.reader.final_hash
@@ -0,0 +1,342 @@
+import math
+import random
+import hashlib
+from constants import (TOWER_TYPES, PATH_POINTS, DIFFICULTIES, BASE_POSITION,
+                     BASE_SIZE, BASE_HEALTH, WAVE_TIMER, WAVE_ENEMY_COUNT,
+                     BOSS_WAVE_INTERVAL)
+from src.towers.tower import Tower
+from src.towers.targeting import assign_targets
+from src.towers.projectile_system import ProjectileSystem
+from src.enemies.enemy import Enemy, HIT_FLASH_FRAMES
+from src.enemies.boss_enemy import BossEnemy
+from src.enemies.enemy_array import EnemyArray
+from src.game.spatial_hash import SpatialHash
+from src.game.events import EventQueue, HitEvent, KillEvent, LeakEvent
+from src.game.pool import ObjectPool
+
+class Simulation:
+    """Display-free game state that advances one logical tick at a time"""
+
+    def __init__(self, difficulty, seed=None):
+        self.difficulty = difficulty
+        self.difficulty_settings = DIFFICULTIES[difficulty]
+
+        # All simulation randomness comes from this seeded generator
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+
+        # Optional InputRecorder that logs player commands with tick stamps
+        # and is told after every tick
+        self.recorder = None
+        # Optional FrameProfiler timing the phases of each tick
+        self.profiler = None
+
+        # Entities
+        self.towers = []
+        self.enemies = EnemyArray()
+        self.enemy_pools = {Enemy: ObjectPool(Enemy), BossEnemy: ObjectPool(BossEnemy)}
+        self.projectiles = ProjectileSystem()
+        self.enemy_grid = SpatialHash()
+        self.enemy_grid_dirty = True
+
+        # Hits, kills and leaks are resolved once per tick from this queue
+        self.events = EventQueue()
+        self.events.subscribe(HitEvent, self.on_hit)
+        self.events.subscribe(KillEvent, self.on_kill)
+        self.events.subscribe(LeakEvent, self.on_leak)
+        self.stats = {
+            "hits": 0,
+            "damage_dealt": 0,
+            "splash_damage_dealt": 0,
+            "kills": 0,
+            "leaks": 0
+        }
+
+        # Wave state
+        self.wave_number = 0
+        self.wave_timer = WAVE_TIMER * 60
+        self.wave_active = False
+        self.enemies_spawned = 0
+        self.spawn_counter = 0
+
+        # Player state
+        self.base_health = BASE_HEALTH
+        self.base_shake = 0
+        self.money = self.difficulty_settings["starting_money"]
+        self.game_started = False
+        self.tick_count = 0
+
+    def record(self, action, *args):
+        if self.recorder is not None:
+            self.recorder.record(self.tick_count, action, *args)
+
+    def mark(self, phase):
+        if self.profiler is not None:
+            self.profiler.lap(phase)
+
+    def start(self):
+        self.record("start")
+        self.game_started = True
+
+    def is_game_over(self):
+        return self.base_health <= 0
+
+    def is_running(self):
+        return self.game_started and not self.is_game_over()
+
+    def update(self, ticks=1):
+        """Advance the simulation by up to the given number of ticks"""
+        for _ in range(ticks):
+            if not self.is_running():
+                break
+            self.tick()
+
+    def tick(self):
+        self.mark("tick_other")
+        
+        # Update wave timer and start the next wave
+        if self.wave_timer > 0:
+            self.wave_timer -= 1
+        elif not self.wave_active:
+            self.wave_number += 1
+            self.enemies_spawned = 0
+            self.wave_active = True
+            self.wave_timer = WAVE_TIMER * 60
+
+        # Move all enemies, then drop the dead and finished ones in bulk
+        self.enemies.move()
+        for boss in self.enemies.bosses():
+            boss.animate()
+        removed = self.enemies.compact()
+        if removed:
+            self.projectiles.remap_targets(self.enemies.remap)
+            # Removed enemies get recycled, so towers must let go of them
+            for tower in self.towers:
+                if tower.target is not None and tower.target._store is None:
+                    tower.target = None
+        for enemy in removed:
+            # Check reaching the base first: arriving also zeroes health,
+            # which must not count as a kill
+            if enemy.reached_end:
+                damage = 20 if isinstance(enemy, BossEnemy) else 10
+                self.events.emit(LeakEvent(enemy, damage))
+            else:
+                self.events.emit(KillEvent(enemy, enemy.value))
+
+        # Enemy positions changed, so the range index must be rebuilt before
+        # its next query
+        self.enemy_grid_dirty = True
+        self.mark("enemy_move")
+
+        # Update projectiles first so targeting sees this tick's hits; they
+        # report hits to the event queue
+        self.projectiles.update(self.enemies, self.events)
+        self.mark("projectiles")
+
+        # Retarget all towers in one batched pass, then fire
+        assign_targets(self.towers, self.enemies)
+        for tower in self.towers:
+            tower.update_weapon(self.projectiles)
+        self.mark("targeting")
+
+        # Spawn enemies
+        if self.wave_active and self.enemies_spawned < WAVE_ENEMY_COUNT:
+            self.spawn_counter += 1
+            if self.spawn_counter >= 60:  # Spawn rate
+                self.spawn_counter = 0
+                enemy_type = BossEnemy if self.wave_number % BOSS_WAVE_INTERVAL == 0 else Enemy
+                self.enemies.add(self.enemy_pools[enemy_type].acquire(self.wave_number))
+                self.enemies_spawned += 1
+                if self.enemies_spawned >= WAVE_ENEMY_COUNT:
+                    self.wave_active = False
+        self.mark("spawning")
+
+        # Resolve this tick's hits, kills and leaks
+        self.events.dispatch()
+        self.mark("splash")
+
+        # Recycle removed enemies now that their events are handled
+        for enemy in removed:
+            self.enemy_pools[type(enemy)].release(enemy)
+
+        # Update base shake effect
+        if self.base_shake > 0:
+            self.base_shake -= 1
+
+        self.tick_count += 1
+        if self.recorder is not None:
+            self.recorder.after_tick(self)
+
+    def on_hit(self, event):
+        event.target.hit_flash = HIT_FLASH_FRAMES
+        self.stats["hits"] += 1
+        self.stats["damage_dealt"] += event.damage
+        if event.tower is not None:
+            event.tower.damage_dealt += event.damage
+
+        # Apply splash damage if the projectile carried it
+        if event.splash_damage > 0 and event.tower is not None:
+            splash_radius = event.tower.stats["range"] * 0.3  # 30% of tower range
+            dealt = self.handle_splash_damage(event.target, event.splash_damage, splash_radius)
+            self.stats["splash_damage_dealt"] += dealt
+            event.tower.damage_dealt += dealt
+
+    def on_kill(self, event):
+        self.money += event.reward
+        self.stats["kills"] += 1
+
+    def on_leak(self, event):
+        self.base_health -= event.damage
+        self.base_shake = 10
+        self.stats["leaks"] += 1
+
+    def pool_stats(self):
+        return {
+            "enemies": self.enemy_pools[Enemy].stats(),
+            "bosses": self.enemy_pools[BossEnemy].stats(),
+            "projectiles": self.projectiles.stats()
+        }
+
+    def get_enemy_grid(self):
+        """Return the enemy spatial index, rebuilding it at most once per tick"""
+        if self.enemy_grid_dirty:
+            self.enemy_grid.rebuild(self.enemies.views,
+                                    self.enemies.column("x").tolist(),
+                                    self.enemies.column("y").tolist())
+            self.enemy_grid_dirty = False
+        return self.enemy_grid
+
+    def handle_splash_damage(self, enemy, damage, splash_radius):
+        dealt = 0
+        for other_enemy, distance in self.get_enemy_grid().query_radius(enemy.x, enemy.y, splash_radius):
+            if other_enemy != enemy:
+                # Damage falls off with distance
+                damage_multiplier = 1 - (distance / splash_radius)
+                other_enemy.health -= damage * damage_multiplier
+                dealt += damage * damage_multiplier
+        return dealt
+
+    def can_place_tower(self, pos):
+        x, y = pos
+
+        # Check if too close to path
+        for i in range(len(PATH_POINTS) - 1):
+            start_x, start_y = PATH_POINTS[i]
+            end_x, end_y = PATH_POINTS[i + 1]
+
+            # Calculate distance to line segment
+            line_x = end_x - start_x
+            line_y = end_y - start_y
+            line_len = math.sqrt(line_x*line_x + line_y*line_y)
+
+            if line_len:
+                proj = ((x - start_x) * line_x + (y - start_y) * line_y) / line_len
+                proj = max(0, min(proj, line_len))
+                closest_x = start_x + line_x * proj / line_len
+                closest_y = start_y + line_y * proj / line_len
+                distance = math.sqrt((x - closest_x)**2 + (y - closest_y)**2)
+
+                if distance < 40:  # Minimum distance from path
+                    return False
+
+        # Check if too close to other towers
+        for tower in self.towers:
+            dx = x - tower.x
+            dy = y - tower.y
+            if (dx*dx + dy*dy) < (50*50):  # Minimum distance between towers
+                return False
+
+        # Check if too close to base
+        dx = x - BASE_POSITION[0]
+        dy = y - BASE_POSITION[1]
+        if (dx*dx + dy*dy) < ((BASE_SIZE + 20) * (BASE_SIZE + 20)):
+            return False
+
+        return True
+
+    def place_tower(self, x, y, tower_type):
+        """Buy and place a tower, returning it or None if not allowed"""
+        self.record("place_tower", x, y, tower_type)
+        cost = TOWER_TYPES[tower_type]["cost"]
+        if self.money < cost or not self.can_place_tower((x, y)):
+            return None
+
+        self.money -= cost
+        tower = Tower(x, y, tower_type)
+        self.towers.append(tower)
+        return tower
+
+    def upgrade_cost(self, tower, upgrade_type):
+        current_level = tower.upgrades.get(upgrade_type, 0)
+        if current_level >= 3:  # Max 3 levels per upgrade
+            return None
+        return 100 * (current_level + 1)  # Increasing costs
+
+    def upgrade_tower(self, tower, upgrade_type):
+        """Buy an upgrade for a tower, returning True on success"""
+        self.record("upgrade_tower", self.towers.index(tower), upgrade_type)
+        cost = self.upgrade_cost(tower, upgrade_type)
+        if cost is None or self.money < cost:
+            return False
+
+        self.money -= cost
+        self.apply_upgrade(tower, upgrade_type)
+        return True
+
+    def set_targeting(self, tower, mode):
+        self.record("set_targeting", self.towers.index(tower), mode)
+        tower.targeting = mode
+        tower.target = None
+
+    def apply_input(self, action, *args):
+        """Apply a recorded command, as logged by record()"""
+        if action == "start":
+            self.start()
+        elif action == "place_tower":
+            self.place_tower(*args)
+        elif action == "upgrade_tower":
+            index, upgrade_type = args
+            self.upgrade_tower(self.towers[index], upgrade_type)
+        elif action == "set_targeting":
+            index, mode = args
+            self.set_targeting(self.towers[index], mode)
+        else:
+            # Presentation-only inputs such as speed changes
+            self.record(action, *args)
+
+    def state_hash(self):
+        """Digest of the full simulation state, for comparing runs"""
+        digest = hashlib.sha1()
+        digest.update(repr((self.tick_count, self.wave_number, self.wave_timer,
+                            self.wave_active, self.enemies_spawned, self.spawn_counter,
+                            self.money, self.base_health, self.rng.getstate())).encode())
+        for tower in self.towers:
+            target = tower.target._row if tower.target is not None and tower.target._store is self.enemies else -1
+            digest.update(repr((tower.x, tower.y, tower.type, sorted(tower.stats.items()),
+                                sorted(tower.upgrades.items()), tower.fire_cooldown,
+                                tower.targeting, target)).encode())
+        for name in sorted(self.enemies.columns):
+            digest.update(self.enemies.column(name).tobytes())
+        for enemy in self.enemies:
+            if isinstance(enemy, BossEnemy):
+                digest.update(repr((enemy._row, enemy.phase, enemy.angle, enemy.shield_active,
+                                    enemy.shield_health, enemy.max_shield_health)).encode())
+        n = len(self.projectiles)
+        digest.update(self.projectiles.x[:n].tobytes())
+        digest.update(self.projectiles.y[:n].tobytes())
+        return digest.hexdigest()
+
+    def apply_upgrade(self, tower, upgrade_type):
+        tower.upgrades[upgrade_type] = tower.upgrades.get(upgrade_type, 0) + 1
+        level = tower.upgrades[upgrade_type]
+
+        # Apply upgrade effects
+        if upgrade_type == "damage":
+            tower.stats["damage"] = int(TOWER_TYPES[tower.type]["damage"] * (1.5 ** level))
+        elif upgrade_type == "range":
+            tower.stats["range"] = int(TOWER_TYPES[tower.type]["range"] * (1.3 ** level))
+            tower.invalidate_range_sprite()
+        elif upgrade_type == "fire_rate":
+            tower.stats["fire_rate"] = int(TOWER_TYPES[tower.type]["fire_rate"] * (0.7 ** level))
+        elif upgrade_type == "splash_damage":
+            tower.stats["splash_damage"] = int(TOWER_TYPES[tower.type]["splash_damage"] * (1.5 ** level))
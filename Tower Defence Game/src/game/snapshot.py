@@ -0,0 +1,286 @@
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from constants import TOWER_TYPES, TARGETING_MODES, AUTOSAVE_KEEP
+from src.enemies.enemy import Enemy
+from src.enemies.boss_enemy import BossEnemy
+from src.enemies.enemy_array import EnemyArray
+from src.game.simulation import Simulation
+from src.towers.tower import Tower
+
+SNAPSHOT_MAGIC = b"TDSS"
+SNAPSHOT_VERSION = 1
+# Magic, format version and the size of the compressed body that follows
+HEADER = struct.Struct("<4sHI")
+
+TOWER_KINDS = list(TOWER_TYPES)
+TOWER_STATS = ("damage", "range", "fire_rate", "splash_damage", "splash_range")
+UPGRADE_TYPES = ("damage", "range", "fire_rate", "splash_damage")
+
+# Simulation scalars, one record per snapshot
+STATE_DTYPE = np.dtype([
+    ("difficulty", "S8"), ("seed", "<u8"), ("tick_count", "<i8"), ("game_started", "u1"),
+    ("wave_number", "<i4"), ("wave_timer", "<i4"), ("wave_active", "u1"),
+    ("enemies_spawned", "<i4"), ("spawn_counter", "<i4"),
+    ("money", "<i8"), ("base_health", "<i8"), ("base_shake", "<i4"),
+    ("hits", "<i8"), ("damage_dealt", "<f8"), ("splash_damage_dealt", "<f8"),
+    ("kills", "<i8"), ("leaks", "<i8"),
+    ("rng_gauss", "<f8"), ("towers", "<i4"), ("enemies", "<i4"), ("projectiles", "<i4"),
+])
+
+# One record per tower. Targets are EnemyArray rows, -1 for none
+TOWER_DTYPE = np.dtype([
+    ("x", "<i4"), ("y", "<i4"), ("kind", "u1"), ("targeting", "u1"), ("target", "<i4"),
+    ("fire_cooldown", "<i4"), ("rotation", "<f8"), ("pulse_angle", "<f8"), ("damage_dealt", "<f8"),
+    *((f"stat_{name}", "<f8") for name in TOWER_STATS),
+    *((f"upgrade_{name}", "u1") for name in UPGRADE_TYPES),
+])
+
+# Enemy state kept outside the EnemyArray columns
+ENEMY_DTYPE = np.dtype([
+    ("boss", "u1"), ("special", "u1"), ("reward", "<i4"), ("phase", "u1"), ("angle", "<f8"),
+    ("shield_active", "u1"), ("shield_health", "<f8"), ("max_shield_health", "<f8"),
+])
+
+# EnemyArray columns, stored as they are
+ENEMY_COLUMNS = {name: np.dtype(dtype).newbyteorder("<") for name, dtype in EnemyArray.DTYPES.items()}
+
+RNG_STATE_SIZE = 625  # Mersenne Twister words plus the position
+
+def little_endian(array):
+    return array.astype(array.dtype.newbyteorder("<"), copy=False)
+
+def capture(simulation):
+    """Copy the simulation's state into an uncompressed snapshot body.
+
+    This is the only part that has to run between ticks; encode() can then
+    finish the snapshot on another thread.
+    """
+    towers = simulation.towers
+    enemies = simulation.enemies
+    projectiles = simulation.projectiles
+    n = len(projectiles)
+
+    state = np.zeros(1, dtype=STATE_DTYPE)[0]
+    for name in ("tick_count", "game_started", "wave_number", "wave_timer", "wave_active",
+                 "enemies_spawned", "spawn_counter", "money", "base_health", "base_shake"):
+        state[name] = getattr(simulation, name)
+    for name, value in simulation.stats.items():
+        state[name] = value
+    state["difficulty"] = simulation.difficulty.encode()
+    state["seed"] = simulation.seed
+    _, words, gauss = simulation.rng.getstate()
+    state["rng_gauss"] = np.nan if gauss is None else gauss
+    state["towers"] = len(towers)
+    state["enemies"] = len(enemies)
+    state["projectiles"] = n
+    parts = [state.tobytes(), np.array(words, dtype="<u4").tobytes()]
+
+    tower_rows = np.zeros(len(towers), dtype=TOWER_DTYPE)
+    for row, tower in zip(tower_rows, towers):
+        row["x"] = tower.x
+        row["y"] = tower.y
+        row["kind"] = TOWER_KINDS.index(tower.type)
+        row["targeting"] = TARGETING_MODES.index(tower.targeting)
+        row["target"] = tower.target._row if tower.target is not None and tower.target._store is enemies else -1
+        row["fire_cooldown"] = tower.fire_cooldown
+        row["rotation"] = tower.rotation
+        row["pulse_angle"] = tower.pulse_angle
+        row["damage_dealt"] = tower.damage_dealt
+        for name in TOWER_STATS:
+            row[f"stat_{name}"] = tower.stats.get(name, 0)
+        for name in UPGRADE_TYPES:
+            row[f"upgrade_{name}"] = tower.upgrades.get(name, 0)
+    parts.append(tower_rows.tobytes())
+
+    # Enemy columns, plus what lives on the enemy objects
+    parts.extend(enemies.column(name).astype(dtype, copy=False).tobytes()
+                 for name, dtype in ENEMY_COLUMNS.items())
+    enemy_rows = np.zeros(len(enemies), dtype=ENEMY_DTYPE)
+    for row, enemy in zip(enemy_rows, enemies):
+        row["reward"] = enemy.reward
+        if isinstance(enemy, BossEnemy):
+            row["boss"] = 1
+            row["special"] = enemy.is_special_boss
+            row["phase"] = enemy.phase
+            row["angle"] = enemy.angle
+            row["shield_active"] = enemy.shield_active
+            row["shield_health"] = enemy.shield_health
+            row["max_shield_health"] = enemy.max_shield_health
+    parts.append(enemy_rows.tobytes())
+
+    for name in projectiles._arrays():
+        parts.append(little_endian(getattr(projectiles, name)[:n]).tobytes())
+    tower_index = {tower: index for index, tower in enumerate(towers)}
+    sources = [tower_index.get(source, -1) for source in projectiles.sources[:n]]
+    parts.append(np.array(sources, dtype="<i4").tobytes())
+    return b"".join(parts)
+
+def encode(body, level=6):
+    compressed = zlib.compress(body, level)
+    return HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(compressed)) + compressed
+
+def snapshot(simulation):
+    """Return the simulation's full state as a compact binary snapshot"""
+    return encode(capture(simulation))
+
+def _take(body, offset, dtype, count=1):
+    array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+    return array, offset + array.nbytes
+
+def read_state(data):
+    """Decompress a snapshot, returning its scalar record and body"""
+    magic, version, size = HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    body = zlib.decompress(data[HEADER.size:HEADER.size + size])
+    state, _ = _take(body, 0, STATE_DTYPE)
+    return state[0], body
+
+def restore(data, simulation=None):
+    """Rebuild a Simulation from a snapshot.
+
+    Passing ``simulation`` re-initializes that object in place, so anything
+    holding on to it sees the restored match.
+    """
+    state, body = read_state(data)
+    offset = STATE_DTYPE.itemsize
+    difficulty = state["difficulty"].decode()
+    seed = int(state["seed"])
+    if simulation is None:
+        simulation = Simulation(difficulty, seed)
+    else:
+        simulation.__init__(difficulty, seed)
+
+    for name in ("tick_count", "wave_number", "wave_timer", "enemies_spawned", "spawn_counter",
+                 "money", "base_health", "base_shake"):
+        setattr(simulation, name, int(state[name]))
+    for name in ("game_started", "wave_active"):
+        setattr(simulation, name, bool(state[name]))
+    for name in simulation.stats:
+        value = state[name]
+        simulation.stats[name] = float(value) if value.dtype.kind == "f" else int(value)
+    words, offset = _take(body, offset, "<u4", RNG_STATE_SIZE)
+    gauss = float(state["rng_gauss"])
+    simulation.rng.setstate((3, tuple(words.tolist()), None if np.isnan(gauss) else gauss))
+
+    tower_rows, offset = _take(body, offset, TOWER_DTYPE, int(state["towers"]))
+    for row in tower_rows:
+        tower = Tower(int(row["x"]), int(row["y"]), TOWER_KINDS[row["kind"]])
+        tower.targeting = TARGETING_MODES[row["targeting"]]
+        tower.fire_cooldown = int(row["fire_cooldown"])
+        tower.rotation = float(row["rotation"])
+        tower.pulse_angle = float(row["pulse_angle"])
+        tower.damage_dealt = float(row["damage_dealt"])
+        for name in TOWER_STATS:
+            if name in tower.stats:
+                tower.stats[name] = type(tower.stats[name])(row[f"stat_{name}"])
+        for name in UPGRADE_TYPES:
+            if row[f"upgrade_{name}"]:
+                tower.upgrades[name] = int(row[f"upgrade_{name}"])
+        simulation.towers.append(tower)
+
+    count = int(state["enemies"])
+    columns = {}
+    for name, dtype in ENEMY_COLUMNS.items():
+        columns[name], offset = _take(body, offset, dtype, count)
+    enemy_rows, offset = _take(body, offset, ENEMY_DTYPE, count)
+    enemies = simulation.enemies
+    for row in enemy_rows:
+        if row["boss"]:
+            # Wave 100 is what makes a boss the special one
+            enemy = simulation.enemy_pools[BossEnemy].acquire(100 if row["special"] else 1)
+            enemy.phase = int(row["phase"])
+            enemy.angle = float(row["angle"])
+            enemy.shield_active = bool(row["shield_active"])
+            enemy.shield_health = float(row["shield_health"])
+            enemy.max_shield_health = float(row["max_shield_health"])
+        else:
+            enemy = simulation.enemy_pools[Enemy].acquire(1)
+        enemy.reward = enemy.value = int(row["reward"])
+        enemies.add(enemy)
+    for name, column in columns.items():
+        enemies.columns[name][:count] = column
+
+    projectiles = simulation.projectiles
+    n = int(state["projectiles"])
+    while projectiles.capacity < n:
+        projectiles._grow()
+    for name in projectiles._arrays():
+        array = getattr(projectiles, name)
+        values, offset = _take(body, offset, array.dtype.newbyteorder("<"), n * (array[0].size if array.ndim > 1 else 1))
+        array[:n] = values.reshape((n,) + array.shape[1:])
+    sources, offset = _take(body, offset, "<i4", n)
+    projectiles.sources[:n] = [simulation.towers[index] if index >= 0 else None
+                               for index in sources.tolist()]
+    projectiles.count = n
+    projectiles.high_water = n
+
+    # Targets last, once the enemy rows are in place
+    for tower, row in zip(simulation.towers, tower_rows):
+        if row["target"] >= 0:
+            tower.target = enemies.views[row["target"]]
+    return simulation
+
+def save(simulation, path):
+    with open(path, "wb") as f:
+        f.write(snapshot(simulation))
+
+def load(path, simulation=None):
+    with open(path, "rb") as f:
+        return restore(f.read(), simulation)
+
+class Autosaver:
+    """Saves a snapshot each time a wave is cleared.
+
+    The state is copied on the calling thread between ticks; compressing and
+    writing happen on a background thread. Only the newest ``keep`` files
+    of each match, told apart by the seed in their names, are kept.
+    """
+
+    def __init__(self, simulation, directory="autosaves", keep=AUTOSAVE_KEEP):
+        self.simulation = simulation
+        self.directory = directory
+        self.keep = keep
+        self.saved_wave = simulation.wave_number
+        self.writer = None
+        self.last_path = None
+
+    def update(self):
+        """Queue a save if a wave has just been cleared"""
+        simulation = self.simulation
+        if (simulation.wave_number > self.saved_wave and not simulation.wave_active
+                and len(simulation.enemies) == 0 and simulation.is_running()):
+            self.saved_wave = simulation.wave_number
+            name = f"autosave_{simulation.seed}_wave{simulation.wave_number:04d}.tds"
+            self.flush()
+            self.writer = threading.Thread(
+                target=self._write, args=(os.path.join(self.directory, name), capture(simulation),
+                                          f"autosave_{simulation.seed}_"), daemon=True)
+            self.writer.start()
+
+    def flush(self):
+        """Wait for the save in progress to be written"""
+        if self.writer is not None:
+            self.writer.join()
+
+    def _write(self, path, body, prefix):
+        os.makedirs(self.directory, exist_ok=True)
+        # Written under a temporary name so a crash never leaves half a file
+        with open(path + ".tmp", "wb") as f:
+            f.write(encode(body))
+        os.replace(path + ".tmp", path)
+        self.last_path = path
+        self.prune(prefix)
+
+    def prune(self, prefix):
+        """Remove all but the newest ``keep`` autosaves starting with ``prefix``"""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.startswith(prefix) and name.endswith(".tds")]
+        paths.sort(key=lambda path: (os.path.getmtime(path), path))
+        for old in paths[:max(len(paths) - self.keep, 0)]:
+            os.remove(old)
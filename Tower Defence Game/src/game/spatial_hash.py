@@ -0,0 +1,64 @@
+import math
+from constants import SPATIAL_CELL_SIZE
+
+class SpatialHash:
+    """Uniform grid over item positions for fast radius queries.
+
+    The grid is rebuilt once per tick after enemies move, so queries see the
+    positions items had at rebuild time.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+    def rebuild(self, items, xs=None, ys=None):
+        # Positions may be passed in bulk, e.g. from EnemyArray columns
+        if xs is None:
+            xs = [item.x for item in items]
+            ys = [item.y for item in items]
+
+        cells = {}
+        cell_size = self.cell_size
+        for item, x, y in zip(items, xs, ys):
+            key = (int(x // cell_size), int(y // cell_size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [(item, x, y)]
+            else:
+                bucket.append((item, x, y))
+        self.cells = cells
+        self.count = len(items)
+
+    def query_radius(self, x, y, radius):
+        """Return (item, distance) pairs for every item within radius of (x, y)"""
+        cell_size = self.cell_size
+        min_cx = int((x - radius) // cell_size)
+        max_cx = int((x + radius) // cell_size)
+        min_cy = int((y - radius) // cell_size)
+        max_cy = int((y + radius) // cell_size)
+        radius_sq = radius * radius
+        results = []
+
+        # Large radii cover more cells than are occupied, so walk the
+        # occupied cells instead of probing every cell in the square
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            buckets = [bucket for (cx, cy), bucket in self.cells.items()
+                       if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy]
+        else:
+            buckets = []
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = self.cells.get((cx, cy))
+                    if bucket:
+                        buckets.append(bucket)
+
+        for bucket in buckets:
+            for item, item_x, item_y in bucket:
+                dx = item_x - x
+                dy = item_y - y
+                distance_sq = dx*dx + dy*dy
+                if distance_sq <= radius_sq:
+                    results.append((item, math.sqrt(distance_sq)))
+        return results
@@ -0,0 +1,47 @@
+import pygame
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT, PATH_POINTS
+
+class BackgroundLayer:
+    """Terrain and path pre-rendered once and reused every frame.
+
+    The surface is rebuilt only when the map (path) changes or the layer is
+    invalidated, e.g. after the display mode changes.
+    """
+
+    def __init__(self, path_points=PATH_POINTS, size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.path_points = list(path_points)
+        self.size = size
+        self.surface = None
+
+    def set_path(self, path_points):
+        if list(path_points) != self.path_points:
+            self.path_points = list(path_points)
+            self.invalidate()
+
+    def invalidate(self):
+        self.surface = None
+
+    def get_surface(self):
+        if self.surface is None:
+            self.surface = self.build()
+        return self.surface
+
+    def build(self):
+        surface = pygame.Surface(self.size)
+        # Match the display format so blits don't convert per frame
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        # Draw background and path
+        surface.fill((34, 139, 34))  # Green background
+        for i in range(len(self.path_points) - 1):
+            pygame.draw.line(surface, (139, 69, 19), self.path_points[i],
+                           self.path_points[i + 1], 40)
+        return surface
+
+    def draw(self, screen):
+        screen.blit(self.get_surface(), (0, 0))
+
+    def restore(self, screen, rect):
+        """Repaint one region of the screen with the background"""
+        screen.blit(self.get_surface(), rect, rect)
@@ -0,0 +1,78 @@
+import pygame
+
+class DirtyRectTracker:
+    """Tracks which screen regions change so only those are redrawn and presented.
+
+    Every frame, regions drawn last frame and regions about to be drawn are
+    restored from the background layer. Anything overlapping them is drawn
+    again, and only those regions are passed to pygame.display.update.
+    When most of the screen changes a full redraw is cheaper, so the
+    tracker falls back to one.
+    """
+
+    def __init__(self, screen_rect, full_redraw_ratio=0.5):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_redraw_limit = self.screen_rect.width * self.screen_rect.height * full_redraw_ratio
+        self.previous = []  # Regions drawn last frame
+        self.current = []   # Regions drawn this frame
+        self.dirty = []     # Regions restored this frame
+        self.drawn = []     # Static objects redrawn this frame
+        self.seen = set()
+        self.restored = 0
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next frame to redraw and present the whole screen"""
+        self.full_redraw = True
+
+    def add(self, rect):
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        key = tuple(rect)
+        if rect.width and rect.height and key not in self.seen:
+            self.seen.add(key)
+            self.current.append(rect)
+
+    def begin_frame(self, screen, background):
+        """Restore this frame's dirty regions from the background"""
+        self.dirty = self.current + [rect for rect in self.previous if tuple(rect) not in self.seen]
+        if not self.full_redraw:
+            area = sum(rect.width * rect.height for rect in self.dirty)
+            self.full_redraw = area > self.full_redraw_limit
+
+        self.restored = len(self.current)
+        if self.full_redraw:
+            background.draw(screen)
+        else:
+            for rect in self.dirty:
+                background.restore(screen, rect)
+
+    def touches(self, rect):
+        """Whether a static object overlaps a restored region and must be redrawn"""
+        return (self.full_redraw or pygame.Rect(rect).collidelist(self.dirty) != -1
+                or pygame.Rect(rect).collidelist(self.drawn) != -1)
+
+    def redraw(self, rect):
+        """Whether a static object must be redrawn, recording it if so.
+
+        Objects drawn later that overlap a redrawn one are redrawn too, so
+        draw order is kept.
+        """
+        if self.touches(rect):
+            if not self.full_redraw:
+                self.drawn.append(pygame.Rect(rect))
+            return True
+        return False
+
+    def end_frame(self):
+        """Return the rects to present, or None when the whole screen changed"""
+        if self.full_redraw:
+            rects = None
+        else:
+            # Rects added after begin_frame are drawn over the game and not restored
+            rects = self.dirty + [rect for rect in self.current[self.restored:]]
+        self.previous = self.current
+        self.current = []
+        self.drawn = []
+        self.seen = set()
+        self.full_redraw = False
+        return rects
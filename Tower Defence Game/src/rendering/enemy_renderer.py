@@ -0,0 +1,90 @@
+import pygame
+import numpy as np
+from constants import ENEMY_SIZE
+from src.enemies.enemy import FLAG_BOSS, ENEMY_COLOR, HIT_FLASH_FRAMES
+from src.rendering.sprite_cache import SpriteCache
+
+HEALTH_BAR_WIDTH = 40
+HEALTH_BAR_HEIGHT = 5
+SPRITE_COLORKEY = (255, 0, 255)
+
+def build_enemy_sprite(color, size, hit_flash):
+    # Body circle, tinted towards white while the enemy flashes from a hit
+    if hit_flash > 0:
+        flash_intensity = min(255, hit_flash * 25)
+        color = (min(255, color[0] + flash_intensity),
+                min(255, color[1] + flash_intensity),
+                min(255, color[2] + flash_intensity))
+    # Colour-keyed rather than per-pixel alpha, which blits much faster
+    sprite = pygame.Surface((size * 2 + 1, size * 2 + 1))
+    sprite.fill(SPRITE_COLORKEY)
+    sprite.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+    pygame.draw.circle(sprite, color, (size, size), size)
+    return sprite
+
+def build_health_bar_sprite(color, width):
+    sprite = pygame.Surface((width, HEALTH_BAR_HEIGHT))
+    sprite.fill(color)
+    return sprite
+
+ENEMY_SPRITES = SpriteCache(build_enemy_sprite)
+HEALTH_BAR_SPRITES = SpriteCache(build_health_bar_sprite)
+
+def bake_enemy_sprites():
+    """Render every regular enemy flash step and both health bars up front"""
+    ENEMY_SPRITES.bake((ENEMY_COLOR, ENEMY_SIZE, flash) for flash in range(HIT_FLASH_FRAMES + 1))
+    HEALTH_BAR_SPRITES.bake([((255, 0, 0), HEALTH_BAR_WIDTH), ((0, 255, 0), HEALTH_BAR_WIDTH)])
+
+class EnemyRenderer:
+    """Draws an EnemyArray in batches.
+
+    Regular enemies are blitted from pre-baked body sprites (one per flash
+    step) in a single Surface.blits call, then all of their health bars in a
+    second one. Bosses keep their own animated drawing code.
+    """
+
+    def draw(self, screen, enemies, alpha=1.0):
+        n = enemies.count
+        if n == 0:
+            return
+
+        boss = (enemies.column("flags") & FLAG_BOSS) != 0
+        rows = np.flatnonzero(~boss)
+        if len(rows):
+            self._draw_regular(screen, enemies, rows, alpha)
+
+        views = enemies.views
+        for row in np.flatnonzero(boss).tolist():
+            views[row].draw(screen, alpha)
+
+    def _draw_regular(self, screen, enemies, rows, alpha):
+        views = enemies.views
+        x, y = enemies.positions(alpha)
+        x = x[rows]
+        y = y[rows]
+        flashes = enemies.column("hit_flash")[rows]
+
+        centers_x = x.astype(np.int64).tolist()
+        centers_y = y.astype(np.int64).tolist()
+        get_sprite = ENEMY_SPRITES.get
+        bodies = []
+        sizes = []
+        for row, flash, cx, cy in zip(rows.tolist(), flashes.tolist(), centers_x, centers_y):
+            enemy = views[row]
+            size = enemy.size
+            sizes.append(size)
+            bodies.append((get_sprite((enemy.color, size, flash)), (cx - size, cy - size)))
+        screen.blits(bodies, doreturn=False)
+
+        # Health bars: red background, then the filled part of a green bar
+        health = enemies.column("health")[rows]
+        max_health = enemies.column("max_health")[rows]
+        widths = (HEALTH_BAR_WIDTH * np.clip(health / max_health, 0, 1)).astype(np.int64).tolist()
+        bar_x = (x - HEALTH_BAR_WIDTH / 2).tolist()
+        bar_y = (y - np.array(sizes) - 10).tolist()
+        background = HEALTH_BAR_SPRITES.get(((255, 0, 0), HEALTH_BAR_WIDTH))
+        foreground = HEALTH_BAR_SPRITES.get(((0, 255, 0), HEALTH_BAR_WIDTH))
+        bars = [(background, (bx, by)) for bx, by in zip(bar_x, bar_y)]
+        bars.extend((foreground, (bx, by), (0, 0, width, HEALTH_BAR_HEIGHT))
+                    for width, bx, by in zip(widths, bar_x, bar_y) if width > 0)
+        screen.blits(bars, doreturn=False)
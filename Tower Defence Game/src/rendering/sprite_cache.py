@@ -0,0 +1,55 @@
+import pygame
+
+def prepare(sprite):
+    # Match the display's pixel format so blits don't convert every frame
+    if pygame.display.get_surface() is None:
+        return sprite
+    if sprite.get_flags() & pygame.SRCALPHA:
+        return sprite.convert_alpha()
+    return sprite.convert()
+
+def warm(sprite):
+    # RLE surfaces are encoded on their first blit to the display; do that
+    # now instead of on the first frame that draws them. The one-pixel area
+    # is the sprite's transparent corner.
+    display = pygame.display.get_surface()
+    if display is not None and sprite.get_flags() & pygame.RLEACCEL:
+        display.blit(sprite, (0, 0), (0, 0, 1, 1))
+
+class SpriteCache:
+    """Surfaces rendered once and looked up by key.
+
+    ``builder`` is called with the key's items the first time a key is
+    requested; every later request returns the same surface.
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def get(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = prepare(self.builder(*key))
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sprite
+
+    def bake(self, keys):
+        """Render sprites ahead of time, e.g. at startup"""
+        for key in keys:
+            if key not in self.sprites:
+                self.sprites[key] = prepare(self.builder(*key))
+                warm(self.sprites[key])
+
+    def clear(self):
+        self.sprites.clear()
+
+    def stats(self):
+        return {"sprites": len(self.sprites), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,310 @@
+"""Headless balance sweeps over difficulties, tower layouts and upgrade policies.
+
+Run from the game directory:
+
+    python -m src.tools.balance --max-waves 40 --output sweep.csv
+    python -m src.tools.balance --set HEALTH_SCALING_FACTOR=1.12 --set TOWER_TYPES.basic.damage=15
+
+Every combination of difficulty, layout and policy is played out as a
+headless Simulation in a process pool. Workers are started once and reused
+for every match, and each match sends back a small summary of plain numbers.
+Matches are deterministic (nothing in the game draws from the simulation's
+RNG), so each combination is played once.
+
+--set only accepts the constants in TUNABLE_CONSTANTS and the table fields
+in TUNABLE_TABLES. The game reads those when enemies, towers and waves are
+created, so changing them takes effect. Anything else is either bound at
+import time, such as the path, or not used by the simulation, such as the
+difficulty multipliers, and is rejected.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+import numpy as np
+import constants
+from constants import DIFFICULTIES, TOWER_TYPES, INITIAL_TOWERS, BASE_HEALTH, WINDOW_WIDTH
+from src.enemies.path import GAME_PATH
+from src.game.simulation import Simulation
+from src.towers.tower import Tower
+
+UPGRADE_TYPES = ["damage", "range", "fire_rate", "splash_damage"]
+# Constants --set can change, by name or as TABLE.key.field
+TUNABLE_CONSTANTS = ("HEALTH_SCALING_FACTOR", "STARTING_ENEMY_HEALTH", "MAX_HEALTH_CAP",
+                     "ENEMY_SPEED", "PROJECTILE_SPEED", "WAVE_ENEMY_COUNT", "WAVE_TIMER",
+                     "BOSS_WAVE_INTERVAL", "BOSS_REWARD", "BASE_HEALTH")
+# Tables and the fields in them that the game reads
+TUNABLE_TABLES = {
+    "TOWER_TYPES": ("cost", "damage", "range", "fire_rate", "splash_damage"),
+    "DIFFICULTIES": ("starting_money",),
+    "LEVEL_100_BOSS": ("health_multiplier", "speed_multiplier", "reward", "size"),
+}
+MATCH_SEED = 0  # Matches don't depend on it, but replays and hashes do
+DECISION_INTERVAL = 30  # Ticks between spending decisions
+PATH_SAMPLE_SPACING = 10  # Distance along the path between coverage samples
+# Spots considered for towers
+TOWER_GRID = [(x, y) for y in range(60, 500, 20) for x in range(20, WINDOW_WIDTH - 20, 20)]
+
+def path_samples():
+    distances = np.arange(0.0, GAME_PATH.total_length, PATH_SAMPLE_SPACING)
+    x, y, _ = GAME_PATH.positions_at(distances)
+    return distances, np.column_stack((x, y))
+
+def build_layout(strategy, tower_types):
+    """Choose a spot for each of ``tower_types`` in order.
+
+    Each tower goes on the legal grid spot whose range covers the most path.
+    "front" only considers spots watching the first half of the path, "back"
+    the second half and "coverage" the whole of it.
+    """
+    distances, points = path_samples()
+    if strategy == "front":
+        region = distances < GAME_PATH.total_length / 2
+    elif strategy == "back":
+        region = distances >= GAME_PATH.total_length / 2
+    elif strategy == "coverage":
+        region = np.ones(len(distances), dtype=bool)
+    else:
+        raise ValueError(f"Unknown layout strategy {strategy}")
+
+    grid = np.array(TOWER_GRID)
+    # Squared distance from every grid spot to every path sample
+    gaps = ((grid[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+
+    # Place into a scratch simulation so spacing and path rules apply
+    simulation = Simulation("normal", seed=0)
+    layout = []
+    for tower_type in tower_types:
+        in_range = gaps <= TOWER_TYPES[tower_type]["range"] ** 2
+        coverage = (in_range & region).sum(axis=1)
+        for index in np.argsort(-coverage, kind="stable"):
+            x, y = (int(value) for value in grid[index])
+            if simulation.can_place_tower((x, y)):
+                simulation.towers.append(Tower(x, y, tower_type))
+                layout.append((x, y, tower_type))
+                break
+    return layout
+
+# Named layouts: placement strategy and the towers bought, in order
+LAYOUTS = {
+    "front": ("front", INITIAL_TOWERS * 3),
+    "back": ("back", INITIAL_TOWERS * 3),
+    "coverage": ("coverage", INITIAL_TOWERS * 3),
+}
+
+def upgrade_options(simulation, tower):
+    return [upgrade_type for upgrade_type in UPGRADE_TYPES
+            if upgrade_type in TOWER_TYPES[tower.type]
+            and simulation.upgrade_cost(tower, upgrade_type) is not None]
+
+def policy_none(simulation):
+    pass
+
+def policy_damage_first(simulation):
+    # Damage on every tower before anything else, cheapest first
+    while True:
+        choices = [(simulation.upgrade_cost(tower, upgrade_type), index, upgrade_type)
+                   for index, tower in enumerate(simulation.towers)
+                   for upgrade_type in upgrade_options(simulation, tower)]
+        damage = [choice for choice in choices if choice[2] == "damage"]
+        choices = sorted(damage or choices)
+        if not choices or choices[0][0] > simulation.money:
+            return
+        _, index, upgrade_type = choices[0]
+        simulation.upgrade_tower(simulation.towers[index], upgrade_type)
+
+def policy_cheapest(simulation):
+    # Whatever upgrade costs least, spreading levels across stats and towers
+    while True:
+        choices = sorted((simulation.upgrade_cost(tower, upgrade_type), index, upgrade_type)
+                         for index, tower in enumerate(simulation.towers)
+                         for upgrade_type in upgrade_options(simulation, tower))
+        if not choices or choices[0][0] > simulation.money:
+            return
+        _, index, upgrade_type = choices[0]
+        simulation.upgrade_tower(simulation.towers[index], upgrade_type)
+
+UPGRADE_POLICIES = {
+    "none": policy_none,
+    "damage_first": policy_damage_first,
+    "cheapest": policy_cheapest,
+}
+
+def run_match(difficulty, layout, policy, max_waves=30, max_ticks=None, money=None, towers=()):
+    """Play one headless match and return a summary of plain values.
+
+    ``layout`` is a list of (x, y, tower type) bought in order as money
+    allows; once all are built the upgrade policy spends the rest. ``money``
+    replaces the difficulty's starting money and ``towers`` are already
+    standing when the match starts. The match ends when the base falls,
+    after ``max_waves`` waves or after ``max_ticks`` ticks.
+    """
+    simulation = Simulation(difficulty, MATCH_SEED)
+    if money is not None:
+        simulation.money = money
+    for x, y, tower_type in towers:
+        simulation.towers.append(Tower(x, y, tower_type))
+    simulation.start()
+    pending = list(layout)
+    spend = UPGRADE_POLICIES[policy]
+    money_curve = []   # Money as each wave starts
+    damage_curve = []  # Base damage taken so far as each wave starts
+    wave = simulation.wave_number
+
+    while simulation.is_running() and simulation.wave_number <= max_waves:
+        if max_ticks is not None and simulation.tick_count >= max_ticks:
+            break
+        if simulation.tick_count % DECISION_INTERVAL == 0:
+            while pending and simulation.money >= TOWER_TYPES[pending[0][2]]["cost"]:
+                simulation.place_tower(*pending.pop(0))
+            if not pending:
+                spend(simulation)
+        simulation.tick()
+        if simulation.wave_number != wave:
+            wave = simulation.wave_number
+            money_curve.append(simulation.money)
+            damage_curve.append(BASE_HEALTH - simulation.base_health)
+
+    return {
+        "difficulty": difficulty,
+        "waves": simulation.wave_number - 1,  # The last wave started wasn't survived
+        "survived": not simulation.is_game_over(),
+        "ticks": simulation.tick_count,
+        "base_damage": BASE_HEALTH - max(simulation.base_health, 0),
+        "final_money": simulation.money,
+        "towers": len(simulation.towers),
+        "upgrades": sum(sum(tower.upgrades.values()) for tower in simulation.towers),
+        "kills": simulation.stats["kills"],
+        "leaks": simulation.stats["leaks"],
+        "money_curve": money_curve,
+        "damage_curve": damage_curve,
+    }
+
+def check_override(key):
+    """Return why ``key`` can't be tuned, or None if it can"""
+    name, *path = key.split(".")
+    if path:
+        if name not in TUNABLE_TABLES:
+            return f"{name} is not a tunable table"
+        if path[-1] not in TUNABLE_TABLES[name]:
+            return f"{key}: only {', '.join(TUNABLE_TABLES[name])} are tunable in {name}"
+        return None
+    if name not in TUNABLE_CONSTANTS:
+        return f"{name} is not a tunable constant"
+    return None
+
+def apply_overrides(overrides):
+    """Change constants for this process, e.g. {"TOWER_TYPES.basic.damage": 15}.
+
+    Dotted keys edit the shared dict in place. Plain names are rebound in
+    constants and in every loaded module that imported the old value.
+    """
+    for key, value in overrides.items():
+        problem = check_override(key)
+        if problem:
+            raise ValueError(problem)
+        name, *path = key.split(".")
+        if path:
+            target = getattr(constants, name)
+            for part in path[:-1]:
+                target = target[part]
+            target[path[-1]] = value
+            continue
+        old = getattr(constants, name)
+        for module in list(sys.modules.values()):
+            if getattr(module, "__dict__", {}).get(name) is old:
+                setattr(module, name, value)
+
+def init_worker(overrides):
+    # Runs once per worker process; the process then plays many matches
+    apply_overrides(overrides)
+
+def run_job(job):
+    difficulty, layout_name, layout, policy, max_waves, max_ticks = job
+    summary = run_match(difficulty, layout, policy, max_waves, max_ticks)
+    summary["layout"] = layout_name
+    summary["policy"] = policy
+    return summary
+
+def sweep(difficulties, layouts, policies, max_waves=30, max_ticks=None,
+          workers=None, overrides=None, progress=None):
+    """Play every combination in a process pool and return the match summaries"""
+    # Layouts are resolved once here, with the same overrides as the workers,
+    # and shipped to them as plain tuples
+    apply_overrides(overrides or {})
+    resolved = {name: build_layout(*LAYOUTS[name]) for name in layouts}
+    jobs = [(difficulty, name, resolved[name], policy, max_waves, max_ticks)
+            for difficulty in difficulties for name in layouts for policy in policies]
+    summaries = []
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(overrides or {},)) as pool:
+        for summary in pool.imap_unordered(run_job, jobs):
+            summaries.append(summary)
+            if progress:
+                progress(len(summaries), len(jobs))
+    return summaries
+
+TABLE_COLUMNS = ["difficulty", "layout", "policy", "waves", "survived", "base_damage",
+                 "final_money", "kills", "leaks", "upgrades"]
+
+def table_rows(summaries):
+    """Match summaries in a stable order for the table"""
+    return sorted(summaries, key=lambda summary: (summary["difficulty"], summary["layout"],
+                                                  summary["policy"]))
+
+def format_table(rows):
+    lines = [" ".join(f"{column:>16}" for column in TABLE_COLUMNS)]
+    for row in rows:
+        lines.append(" ".join(f"{row[column]:>16.1f}" if isinstance(row[column], float)
+                              else f"{str(row[column]):>16}" for column in TABLE_COLUMNS))
+    return "\n".join(lines)
+
+def parse_override(text):
+    key, _, value = text.partition("=")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep headless matches for game balance")
+    parser.add_argument("--difficulty", action="append", choices=list(DIFFICULTIES),
+                        help="difficulties to play (default: all)")
+    parser.add_argument("--layout", action="append", choices=list(LAYOUTS),
+                        help="tower layouts to play (default: all)")
+    parser.add_argument("--policy", action="append", choices=list(UPGRADE_POLICIES),
+                        help="upgrade policies to play (default: all)")
+    parser.add_argument("--max-waves", type=int, default=30, help="stop matches after this wave")
+    parser.add_argument("--max-ticks", type=int, help="stop matches after this many ticks")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a constant, e.g. WAVE_ENEMY_COUNT=10 or TOWER_TYPES.basic.damage=15")
+    parser.add_argument("--output", help="write the table to .csv, or full match summaries to .json")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(text) for text in args.set)
+    problems = [problem for problem in map(check_override, overrides) if problem]
+    if problems:
+        parser.error("; ".join(problems))
+    start = time.perf_counter()
+    summaries = sweep(args.difficulty or list(DIFFICULTIES), args.layout or list(LAYOUTS),
+                      args.policy or list(UPGRADE_POLICIES), args.max_waves, args.max_ticks, args.workers, overrides,
+                      progress=lambda done, total: print(f"\r{done}/{total} matches", end="", flush=True))
+    print(f"\n{len(summaries)} matches in {time.perf_counter() - start:.1f}s")
+    rows = table_rows(summaries)
+    print(format_table(rows))
+
+    if args.output:
+        if args.output.endswith(".csv"):
+            with open(args.output, "w", newline="") as f:
+                writer = csv.DictWriter(f, TABLE_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(args.output, "w") as f:
+                json.dump({"overrides": overrides, "matches": rows}, f)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Scripted performance scenarios for the update and draw paths.
+
+Run from the game directory:
+
+    python -m src.tools.benchmark --output results.json --baseline baseline.json
+
+Each scenario is built directly into a Simulation. The update path is
+reported in ticks per second. The draw path is reported in milliseconds per
+full-window Game.draw onto an offscreen surface. Results are saved as JSON.
+When a baseline is given, any scenario slower than it by more than the
+threshold is flagged and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Draw offscreen, no window needed
+
+import pygame
+from constants import (TOWER_TYPES, BOSS_WAVE_INTERVAL, WAVE_ENEMY_COUNT, WINDOW_WIDTH,
+                     ENEMY_SPEED)
+from src.enemies.enemy import Enemy
+from src.enemies.boss_enemy import BossEnemy, bake_boss_sprites
+from src.enemies.path import GAME_PATH
+from src.game.simulation import Simulation
+from src.towers.tower import Tower, bake_tower_sprites
+from src.towers.projectile_system import bake_projectile_sprites
+from src.rendering.enemy_renderer import bake_enemy_sprites
+
+BENCHMARK_VERSION = 1
+BENCHMARK_SEED = 1234
+ENDLESS_HEALTH = 1e12  # Keeps enemy counts steady while towers fire at them
+
+class Scenario:
+    """A named setup of towers and enemies.
+
+    ``towers`` is a list of (tower type, count). ``enemies`` regular enemies
+    and ``bosses`` bosses of ``wave`` are spread along the first part of the
+    path so none reach the base while being measured. Regular enemies can't
+    die, so every tick does the same amount of work; bosses keep their real
+    health so their phases change.
+    """
+
+    def __init__(self, name, towers=(), enemies=0, bosses=0, wave=1):
+        self.name = name
+        self.towers = list(towers)
+        self.enemies = enemies
+        self.bosses = bosses
+        self.wave = wave
+
+    def build(self, simulation, ticks):
+        rng = random.Random(BENCHMARK_SEED)
+        simulation.start()
+        simulation.wave_number = self.wave
+        simulation.wave_active = False
+        simulation.wave_timer = 10**9  # No scripted waves on top
+        simulation.base_health = 10**9
+
+        kinds = [kind for kind, count in self.towers for _ in range(count)]
+        for (x, y), kind in zip(tower_positions(simulation, len(kinds)), kinds):
+            simulation.towers.append(Tower(x, y, kind))
+
+        # Leave room to travel for the whole run, even for enraged bosses
+        furthest = max(GAME_PATH.total_length - ticks * ENEMY_SPEED * 1.5 - 10, 0)
+        for enemy_type, count in ((Enemy, self.enemies), (BossEnemy, self.bosses)):
+            for _ in range(count):
+                enemy = simulation.enemy_pools[enemy_type].acquire(self.wave)
+                if enemy_type is Enemy:
+                    enemy.health = enemy.max_health = ENDLESS_HEALTH
+                enemy.progress = rng.uniform(0, furthest)
+                enemy.x, enemy.y, enemy.current_point = GAME_PATH.position_at(enemy.progress)
+                enemy.prev_x, enemy.prev_y = enemy.x, enemy.y
+                simulation.enemies.add(enemy)
+        return simulation
+
+def tower_positions(simulation, count):
+    """Legal tower spots on a grid, falling back to any grid spot once the map is full"""
+    grid = [(x, y) for y in range(70, 500, 25) for x in range(25, WINDOW_WIDTH - 25, 25)]
+    positions = []
+    placed = simulation.towers
+    for x, y in grid:
+        if len(positions) == count:
+            break
+        if simulation.can_place_tower((x, y)):
+            positions.append((x, y))
+            placed.append(Tower(x, y, "basic"))  # Reserve the spot
+    del placed[len(placed) - len(positions):]
+    spare = [position for position in grid if position not in positions]
+    return positions + spare[:count - len(positions)]
+
+def mixed_towers(count):
+    per_kind = max(1, count // len(TOWER_TYPES))
+    return [(kind, per_kind) for kind in TOWER_TYPES]
+
+def default_scenarios():
+    scenarios = [Scenario("empty")]
+    for count in (10, 50, 100):
+        for kind in TOWER_TYPES:
+            scenarios.append(Scenario(f"towers_{count}_{kind}", [(kind, count)], enemies=100))
+    for count in (100, 1000, 5000):
+        scenarios.append(Scenario(f"enemies_{count}", mixed_towers(10), enemies=count))
+    scenarios.append(Scenario("boss_wave", mixed_towers(10), bosses=WAVE_ENEMY_COUNT,
+                              wave=BOSS_WAVE_INTERVAL))
+    scenarios.append(Scenario("boss_level_100", mixed_towers(10), bosses=1, wave=100))
+    return scenarios
+
+def measure_update(scenario, ticks, warmup=10):
+    simulation = scenario.build(Simulation("normal", seed=BENCHMARK_SEED), ticks + warmup)
+    for _ in range(warmup):
+        simulation.tick()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.tick()
+    return ticks / (time.perf_counter() - start)
+
+def measure_draw(scenario, frames):
+    from src.game.game import Game
+
+    game = Game("normal")
+    game.autosaver = None  # Keep the benchmark out of ./autosaves
+    scenario.build(game.simulation, frames)
+    game.screen = pygame.Surface(game.screen.get_size()).convert()
+    game.dirty_rendering = False  # Time the full frame
+    game.fast_forward.alpha = 0.5
+    elapsed = 0.0
+    for _ in range(frames):
+        game.simulation.tick()
+        start = time.perf_counter()
+        game.draw()
+        elapsed += time.perf_counter() - start
+        game.dirty.end_frame()
+    return elapsed / frames * 1000
+
+def run(scenarios, ticks=300, frames=60, repeat=3, draw=True, log=print):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    bake_projectile_sprites()
+    bake_tower_sprites()
+    bake_boss_sprites()
+    bake_enemy_sprites()
+
+    results = {}
+    for scenario in scenarios:
+        # Median of fresh runs, so one noisy run doesn't decide the result
+        result = {"ticks_per_sec": statistics.median(
+            measure_update(scenario, ticks) for _ in range(repeat))}
+        if draw:
+            result["draw_ms"] = statistics.median(
+                measure_draw(scenario, frames) for _ in range(repeat))
+        results[scenario.name] = result
+        log(format_result(scenario.name, result))
+    return {
+        "version": BENCHMARK_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "settings": {"ticks": ticks, "frames": frames, "repeat": repeat},
+        "results": results,
+    }
+
+def format_result(name, result):
+    line = f"{name:<24} {result['ticks_per_sec']:>10.1f} ticks/s"
+    if "draw_ms" in result:
+        line += f" {result['draw_ms']:>8.2f} ms/frame"
+    return line
+
+def compare(results, baseline, threshold=0.1):
+    """Return (scenario, metric, baseline, current, change) for each regression"""
+    regressions = []
+    for name, current in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        # Fewer ticks per second or more milliseconds per frame is slower
+        if "ticks_per_sec" in previous:
+            change = current["ticks_per_sec"] / previous["ticks_per_sec"] - 1
+            if change < -threshold:
+                regressions.append((name, "ticks_per_sec", previous["ticks_per_sec"],
+                                    current["ticks_per_sec"], change))
+        if "draw_ms" in previous and "draw_ms" in current:
+            change = current["draw_ms"] / previous["draw_ms"] - 1
+            if change > threshold:
+                regressions.append((name, "draw_ms", previous["draw_ms"], current["draw_ms"], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game's update and draw paths")
+    parser.add_argument("--scenario", action="append",
+                        help="run only these scenarios (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks timed per update run")
+    parser.add_argument("--frames", type=int, default=60, help="frames timed per draw run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median)")
+    parser.add_argument("--no-draw", action="store_true", help="skip the draw path")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown before flagging a regression (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    scenarios = default_scenarios()
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.name)
+        return 0
+    if args.scenario:
+        unknown = set(args.scenario) - {scenario.name for scenario in scenarios}
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+
+    results = run(scenarios, args.ticks, args.frames, args.repeat, draw=not args.no_draw)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, previous, current, change in regressions:
+            print(f"REGRESSION {name} {metric}: {previous:.2f} -> {current:.2f} ({change:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
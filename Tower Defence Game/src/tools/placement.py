@@ -0,0 +1,228 @@
+"""Search for tower placements that survive the most waves.
+
+Run from the game directory:
+
+    python -m src.tools.placement --budget 600 --tower basic --tower rapid --tower sniper
+
+Candidate layouts spend the budget on the given tower types, each tower on
+one of the legal spots whose range covers the most path. They are ranked by
+a cheap damage-over-path estimate and only the best are played out as
+headless matches in a process pool. The survivors of short matches go on to
+longer ones, so weak layouts are dropped early. Matches are deterministic,
+so each layout is played once per wave limit and cached.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+import numpy as np
+from constants import TOWER_TYPES, INITIAL_TOWERS, DIFFICULTIES
+from src.game.simulation import Simulation
+from src.towers.tower import Tower
+from src.tools.balance import TOWER_GRID, UPGRADE_POLICIES, path_samples, run_match
+
+SPOT_CHOICES = 6  # Best free spots a sampled layout picks each tower from
+
+def tower_dps(tower_type):
+    stats = TOWER_TYPES[tower_type]
+    return (stats["damage"] + stats.get("splash_damage", 0)) / stats["fire_rate"]
+
+def play(job):
+    layout, difficulty, towers, money, policy, max_waves = job
+    summary = run_match(difficulty, layout, policy, max_waves, money=money, towers=towers)
+    return layout, max_waves, summary["waves"], summary["base_damage"]
+
+class PlacementOptimizer:
+    """Finds where to spend ``budget`` on ``tower_types`` around ``towers``.
+
+    ``towers`` are (x, y, tower type) already on the map; they stay put and
+    block spots. Layouts are scored by waves survived out of ``max_waves``
+    and then by base damage taken.
+    """
+
+    def __init__(self, tower_types, budget, difficulty="normal", towers=(), max_waves=20,
+                 policy="cheapest", workers=None, start_method=None, seed=None):
+        self.tower_types = [tower_type for tower_type in tower_types if tower_type in TOWER_TYPES]
+        self.budget = budget
+        self.difficulty = difficulty
+        self.towers = [tuple(tower) for tower in towers]
+        self.max_waves = max_waves
+        self.policy = policy
+        self.workers = workers
+        self.start_method = start_method  # "spawn" when searching from a running game
+        self.rng = random.Random(seed)
+        self.cache = {}  # layout -> (max waves, waves, base damage)
+        self.matches = 0
+        self.cache_hits = 0
+
+        # Which path samples each tower type reaches from each free spot
+        _, points = path_samples()
+        scratch = self.scratch()
+        self.spots = [spot for spot in TOWER_GRID if scratch.can_place_tower(spot)]
+        self.spot_index = {spot: index for index, spot in enumerate(self.spots)}
+        grid = np.array(self.spots, dtype=np.float64).reshape(-1, 2)
+        gaps = ((grid[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+        self.in_range = {tower_type: gaps <= TOWER_TYPES[tower_type]["range"] ** 2
+                         for tower_type in self.tower_types}
+        self.spot_order = {tower_type: np.argsort(-in_range.sum(axis=1), kind="stable")
+                           for tower_type, in_range in self.in_range.items()}
+        self.sample_count = len(points)
+
+    def scratch(self):
+        # A simulation holding only the fixed towers, for placement rules
+        simulation = Simulation(self.difficulty, seed=0)
+        for x, y, tower_type in self.towers:
+            simulation.towers.append(Tower(x, y, tower_type))
+        return simulation
+
+    def sample_mix(self):
+        """Random tower types that use up the budget, most expensive first"""
+        mix = []
+        money = self.budget
+        while True:
+            affordable = [tower_type for tower_type in self.tower_types
+                          if TOWER_TYPES[tower_type]["cost"] <= money]
+            if not affordable:
+                break
+            tower_type = self.rng.choice(affordable)
+            mix.append(tower_type)
+            money -= TOWER_TYPES[tower_type]["cost"]
+        return sorted(mix, key=lambda tower_type: -TOWER_TYPES[tower_type]["cost"])
+
+    def place(self, mix, choices=SPOT_CHOICES):
+        """Put each tower of ``mix`` on one of the ``choices`` best free spots for it"""
+        scratch = self.scratch()
+        layout = []
+        for tower_type in mix:
+            free = []
+            for index in self.spot_order[tower_type]:
+                spot = self.spots[index]
+                if scratch.can_place_tower(spot):
+                    free.append(spot)
+                    if len(free) == choices:
+                        break
+            if not free:
+                continue
+            x, y = self.rng.choice(free)
+            scratch.towers.append(Tower(x, y, tower_type))
+            layout.append((x, y, tower_type))
+        return tuple(sorted(layout))
+
+    def estimate(self, layout):
+        """Cheap score: damage per tick reaching each stretch of path.
+
+        The square root gives stretches that are already covered less
+        credit, so spreading towers out scores higher than stacking them.
+        """
+        damage = np.zeros(self.sample_count)
+        for x, y, tower_type in layout:
+            damage += self.in_range[tower_type][self.spot_index[(x, y)]] * tower_dps(tower_type)
+        return float(np.sqrt(damage).sum())
+
+    def candidates(self, count):
+        """Up to ``count`` distinct layouts with their estimates"""
+        layouts = {}
+        for attempt in range(count * 4):
+            if len(layouts) == count:
+                break
+            # The first layout always takes each tower's best spot
+            layout = self.place(self.sample_mix(), 1 if attempt == 0 else SPOT_CHOICES)
+            if layout and layout not in layouts:
+                layouts[layout] = self.estimate(layout)
+        return layouts
+
+    def cached(self, layout, max_waves):
+        entry = self.cache.get(layout)
+        if entry is None:
+            return None
+        played, waves, base_damage = entry
+        # A lost match plays out the same under any limit it didn't reach
+        if played == max_waves or (waves < played and waves < max_waves):
+            return waves, base_damage
+        return None
+
+    def evaluate(self, pool, layouts, max_waves):
+        """Score layouts, playing only what isn't cached"""
+        jobs = []
+        for layout in layouts:
+            if self.cached(layout, max_waves) is None:
+                jobs.append((layout, self.difficulty, self.towers, self.budget,
+                             self.policy, max_waves))
+            else:
+                self.cache_hits += 1
+        if jobs:
+            for layout, played, waves, base_damage in pool.imap_unordered(play, jobs):
+                self.cache[layout] = (played, waves, base_damage)
+                self.matches += 1
+
+        scores = {}
+        for layout in layouts:
+            waves, base_damage = self.cached(layout, max_waves)
+            scores[layout] = (waves, -base_damage)
+        return scores
+
+    def rounds(self):
+        # Wave limits for successive rounds, ending with the full match
+        limits = {max(1, self.max_waves // 4), max(1, self.max_waves // 2), self.max_waves}
+        return sorted(limits)
+
+    def search(self, candidates=200, shortlist=16, keep=5):
+        """Return the ``keep`` best layouts, best first, with their scores"""
+        estimates = self.candidates(candidates)
+        ranked = sorted(estimates, key=estimates.get, reverse=True)[:shortlist]
+        if not ranked:
+            return []
+
+        context = multiprocessing.get_context(self.start_method)
+        with context.Pool(self.workers) as pool:
+            for max_waves in self.rounds():
+                scores = self.evaluate(pool, ranked, max_waves)
+                ranked.sort(key=scores.get, reverse=True)
+                if max_waves < self.max_waves:
+                    ranked = ranked[:max(keep, len(ranked) // 2)]
+
+        return [{
+            "layout": list(layout),
+            "waves": scores[layout][0],
+            "base_damage": -scores[layout][1],
+            "estimate": estimates[layout],
+        } for layout in ranked[:keep]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search for the strongest tower placements")
+    parser.add_argument("--budget", type=int, help="money to spend (default: difficulty's starting money)")
+    parser.add_argument("--tower", action="append", choices=list(TOWER_TYPES),
+                        help="tower types to buy (default: the starting loadout)")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTIES), default="normal")
+    parser.add_argument("--max-waves", type=int, default=20, help="waves a layout must survive")
+    parser.add_argument("--policy", choices=list(UPGRADE_POLICIES), default="cheapest",
+                        help="how income is spent during matches")
+    parser.add_argument("--candidates", type=int, default=200, help="layouts generated")
+    parser.add_argument("--shortlist", type=int, default=16, help="layouts played after estimating")
+    parser.add_argument("--top", type=int, default=5, help="layouts to report")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", help="write the top layouts to this JSON file")
+    args = parser.parse_args(argv)
+
+    budget = args.budget if args.budget is not None else DIFFICULTIES[args.difficulty]["starting_money"]
+    optimizer = PlacementOptimizer(args.tower or INITIAL_TOWERS, budget, args.difficulty,
+                                   max_waves=args.max_waves,
+                                   policy=args.policy, workers=args.workers)
+    start = time.perf_counter()
+    results = optimizer.search(args.candidates, args.shortlist, args.top)
+    print(f"{optimizer.matches} matches, {optimizer.cache_hits} cached, "
+          f"in {time.perf_counter() - start:.1f}s")
+    for rank, result in enumerate(results, 1):
+        towers = ", ".join(f"{tower_type}@{x},{y}" for x, y, tower_type in result["layout"])
+        print(f"{rank}. waves {result['waves']} base damage {result['base_damage']:.0f} "
+              f"estimate {result['estimate']:.1f}: {towers}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget": budget, "difficulty": args.difficulty, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Per-wave summaries of a keyframed replay, and seeking into it.
+
+Run from the game directory:
+
+    python -m src.tools.replay_info replays/replay_1234_216000.tdr
+    python -m src.tools.replay_info replays/replay_1234_216000.tdr --seek 150000 --seek 90000
+
+Summaries come from the wave records in the file, so no game objects are
+built. --seek restores the nearest keyframe and simulates forward, and
+reports how long that took.
+"""
+import argparse
+import csv
+import sys
+import time
+from src.game.replay import ReplayReader, KeyframeReplayer
+
+SUMMARY_COLUMNS = ["wave", "start_tick", "ticks", "money_start", "money_end", "base_damage",
+                   "kills", "leaks", "towers", "peak_enemies", "peak_projectiles"]
+
+def format_summaries(summaries):
+    lines = [" ".join(f"{column:>16}" for column in SUMMARY_COLUMNS)]
+    for summary in summaries:
+        lines.append(" ".join(f"{summary[column]:>16}" for column in SUMMARY_COLUMNS))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize and seek a keyframed replay")
+    parser.add_argument("replay", help="replay file (.tdr)")
+    parser.add_argument("--seek", type=int, action="append", default=[], metavar="TICK",
+                        help="simulate to this tick and report the state (repeatable)")
+    parser.add_argument("--verify", action="store_true",
+                        help="replay to the end and check the final state hash")
+    parser.add_argument("--output", help="write the wave summaries to this CSV file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reader = ReplayReader(args.replay)
+    if reader.is_empty():
+        print(f"{args.replay}: empty replay, no keyframes to play from")
+        return 1
+    print(f"{reader.start['difficulty']} seed {reader.start['seed']}, ticks "
+          f"{reader.start['start_tick']}-{reader.end_tick}, {len(reader.keyframes)} keyframes, "
+          f"{len(reader.inputs)} inputs, read in {(time.perf_counter() - start) * 1000:.1f}ms")
+    summaries = reader.wave_summaries()
+    print(format_summaries(summaries))
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, SUMMARY_COLUMNS)
+            writer.writeheader()
+            writer.writerows(summaries)
+
+    replayer = KeyframeReplayer(reader)
+    for tick in args.seek:
+        start = time.perf_counter()
+        simulation = replayer.seek(tick)
+        print(f"tick {simulation.tick_count}: wave {simulation.wave_number} money {simulation.money} "
+              f"base {simulation.base_health} enemies {len(simulation.enemies)} "
+              f"projectiles {len(simulation.projectiles)} "
+              f"({(time.perf_counter() - start) * 1000:.1f}ms)")
+    if args.verify:
+        if reader.final_hash is None:
+            print("Replay was cut short, so there is no final state to check")
+            return 1
+        if not KeyframeReplayer(reader).verify():
+            print("Final state does not match the recording")
+            return 1
+        print("Final state matches the recording")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
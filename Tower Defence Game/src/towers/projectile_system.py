@@ -0,0 +1,287 @@
+import pygame
+import math
+import numpy as np
+from constants import PROJECTILE_SPEED, TOWER_TYPES
+from src.rendering.sprite_cache import SpriteCache
+
+# Visual properties based on tower type
+PROJECTILE_KINDS = list(TOWER_TYPES)
+PROJECTILE_COLORS = {
+    "basic": (50, 150, 255),  # Changed from gray to blue
+    "rapid": (0, 255, 255),
+    "sniper": (255, 0, 0),
+    "splash": (255, 165, 0),
+    "missile": (255, 255, 0)
+}
+PROJECTILE_SIZES = {
+    "basic": 4,
+    "rapid": 3,
+    "sniper": 6,
+    "splash": 5,
+    "missile": 5
+}
+TRAIL_LENGTH = 10
+
+def build_trail_sprite(kind, size, step, length):
+    # Segment ``step`` of a trail ``length`` points long; older points are
+    # smaller and more transparent
+    color = PROJECTILE_COLORS.get(kind, (255, 255, 255))
+    alpha = int((step / length) * 255)
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, alpha), (size//2, size//2), size//2 * (step/length))
+    return sprite
+
+def build_glow_sprite(kind, size):
+    color = PROJECTILE_COLORS.get(kind, (255, 255, 255))
+    sprite = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, 128), (size, size), size)
+    return sprite
+
+TRAIL_SPRITES = SpriteCache(build_trail_sprite)
+GLOW_SPRITES = SpriteCache(build_glow_sprite)
+
+def bake_projectile_sprites():
+    """Render every trail segment and glow up front instead of on first use"""
+    for kind in PROJECTILE_KINDS:
+        size = PROJECTILE_SIZES.get(kind, 4)
+        TRAIL_SPRITES.bake((kind, size, step, length)
+                           for length in range(1, TRAIL_LENGTH + 1)
+                           for step in range(length))
+        GLOW_SPRITES.bake([(kind, size)])
+
+class ProjectileSystem:
+    """Every live projectile, stored in preallocated arrays.
+
+    Projectiles home in on an EnemyArray row. When that enemy is removed the
+    projectile flies on to its last known position and expires without
+    dealing damage. Each projectile keeps its trail in a fixed-size ring.
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self._allocate(capacity)
+
+        # Slot reuse statistics, in the same terms as ObjectPool.stats()
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0
+
+    def _allocate(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)  # Position at the previous tick
+        self.prev_y = np.zeros(capacity)
+        self.target_row = np.full(capacity, -1, dtype=np.int32)
+        self.target_x = np.zeros(capacity)  # Last known target position
+        self.target_y = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.splash_damage = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.trail = np.zeros((capacity, TRAIL_LENGTH, 2))
+        self.trail_head = np.zeros(capacity, dtype=np.int16)
+        self.trail_len = np.zeros(capacity, dtype=np.int16)
+        self.sources = [None] * capacity  # Tower that fired each projectile
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def __len__(self):
+        return self.count
+
+    def _arrays(self):
+        return ("x", "y", "prev_x", "prev_y", "target_row", "target_x", "target_y", "damage",
+                "splash_damage", "kind", "trail", "trail_head", "trail_len")
+
+    def _grow(self):
+        n = self.count
+        old = {name: getattr(self, name) for name in self._arrays()}
+        sources = self.sources
+        self._allocate(self.capacity * 2)
+        for name, array in old.items():
+            getattr(self, name)[:n] = array[:n]
+        self.sources[:n] = sources[:n]
+
+    def spawn(self, tower, target):
+        if self.count == self.capacity:
+            self._grow()
+            self.misses += 1
+        else:
+            self.hits += 1
+        i = self.count
+        self.x[i] = self.prev_x[i] = tower.x
+        self.y[i] = self.prev_y[i] = tower.y
+        self.target_row[i] = target._row
+        self.target_x[i] = target.x
+        self.target_y[i] = target.y
+        self.damage[i] = tower.stats["damage"]
+        self.splash_damage[i] = tower.stats.get("splash_damage", 0)
+        self.kind[i] = PROJECTILE_KINDS.index(tower.type)
+        self.trail_head[i] = 0
+        self.trail_len[i] = 0
+        self.sources[i] = tower
+        self.count += 1
+        self.high_water = max(self.high_water, self.count)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "high_water": self.high_water,
+            "in_use": self.count,
+            "free": self.capacity - self.count
+        }
+
+    def remap_targets(self, remap):
+        """Follow enemy rows through EnemyArray.compact; removed enemies map to -1"""
+        n = self.count
+        rows = self.target_row[:n]
+        tracked = rows >= 0
+        rows[tracked] = remap[rows[tracked]]
+
+    def update(self, enemies, events=None):
+        n = self.count
+        if n == 0:
+            return
+
+        x = self.x[:n]
+        y = self.y[:n]
+        rows = self.target_row[:n]
+        target_x = self.target_x[:n]
+        target_y = self.target_y[:n]
+
+        # Track live targets, falling back to their last known position
+        tracked = rows >= 0
+        target_x[tracked] = enemies.column("x")[rows[tracked]]
+        target_y[tracked] = enemies.column("y")[rows[tracked]]
+
+        # Store current position in the trail ring
+        heads = self.trail_head[:n]
+        indices = np.arange(n)
+        self.trail[indices, heads, 0] = x
+        self.trail[indices, heads, 1] = y
+        self.trail_head[:n] = (heads + 1) % TRAIL_LENGTH
+        np.minimum(self.trail_len[:n] + 1, TRAIL_LENGTH, out=self.trail_len[:n])
+
+        # Move towards targets, keeping the previous position for rendering
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        dx = target_x - x
+        dy = target_y - y
+        distance = np.sqrt(dx*dx + dy*dy)
+        hit = distance < PROJECTILE_SPEED
+        moving = ~hit
+        x[moving] += dx[moving] / distance[moving] * PROJECTILE_SPEED
+        y[moving] += dy[moving] / distance[moving] * PROJECTILE_SPEED
+
+        if not hit.any():
+            return
+
+        # Apply direct damage for projectiles whose target is still alive
+        landed = np.flatnonzero(hit & tracked)
+        if len(landed):
+            np.subtract.at(enemies.column("health"), rows[landed], self.damage[landed])
+            if events is not None:
+                views = enemies.views
+                for i in landed.tolist():
+                    events.emit_hit(self.sources[i], views[rows[i]],
+                                    self.damage[i].item(), self.splash_damage[i].item())
+
+        self._remove(hit)
+
+    def _remove(self, dead):
+        n = self.count
+        keep = ~dead
+        kept = int(keep.sum())
+        for name in self._arrays():
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.sources[:kept] = [source for source, alive in zip(self.sources[:n], keep) if alive]
+        self.sources[kept:n] = [None] * (n - kept)
+        self.count = kept
+
+    def positions(self, alpha=1.0):
+        """Live x and y, ``alpha`` of the way from the previous tick to this one"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        if alpha >= 1.0:
+            return x, y
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        return prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha
+
+    def get_bounds(self, alpha=1.0):
+        """Screen rects covering each projectile and its trail"""
+        n = self.count
+        if n == 0:
+            return []
+
+        # Ring slots holding a trail point, i.e. younger than the trail length
+        age = (self.trail_head[:n, None] - 1 - np.arange(TRAIL_LENGTH)[None, :]) % TRAIL_LENGTH
+        valid = age < self.trail_len[:n, None]
+        trail_x = self.trail[:n, :, 0]
+        trail_y = self.trail[:n, :, 1]
+        x, y = self.positions(alpha)
+        pad = np.array([PROJECTILE_SIZES.get(kind, 4) + 2 for kind in PROJECTILE_KINDS])[self.kind[:n]]
+
+        left = np.minimum(x, np.where(valid, trail_x, np.inf).min(axis=1)) - pad
+        top = np.minimum(y, np.where(valid, trail_y, np.inf).min(axis=1)) - pad
+        right = np.maximum(x, np.where(valid, trail_x, -np.inf).max(axis=1)) + pad + 1
+        bottom = np.maximum(y, np.where(valid, trail_y, -np.inf).max(axis=1)) + pad + 1
+        return [pygame.Rect(l, t, r - l, b - t) for l, t, r, b in
+                zip(left.tolist(), top.tolist(), right.tolist(), bottom.tolist())]
+        
+    def draw(self, screen, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+
+        # Draw every trail in one batch from the pre-baked segment sprites,
+        # oldest point of each trail first
+        kinds = self.kind[:n]
+        lengths = self.trail_len[:n]
+        steps = np.arange(TRAIL_LENGTH)
+        slots = (self.trail_head[:n, None] - lengths[:, None] + steps[None, :]) % TRAIL_LENGTH
+        rows, steps = np.nonzero(steps[None, :] < lengths[:, None])
+        if len(rows):
+            points = self.trail[rows, slots[rows, steps]]
+            sizes = [PROJECTILE_SIZES.get(kind, 4) for kind in PROJECTILE_KINDS]
+            get_sprite = TRAIL_SPRITES.get
+            screen.blits([
+                (get_sprite((PROJECTILE_KINDS[kind], sizes[kind], step, length)),
+                 (x - sizes[kind]//2, y - sizes[kind]//2))
+                for kind, step, length, (x, y) in zip(kinds[rows].tolist(), steps.tolist(),
+                                                      lengths[rows].tolist(), points.tolist())
+            ], doreturn=False)
+
+        heads_x, heads_y = self.positions(alpha)
+        for i in range(n):
+            kind = PROJECTILE_KINDS[self.kind[i]]
+            color = PROJECTILE_COLORS.get(kind, (255, 255, 255))
+            size = PROJECTILE_SIZES.get(kind, 4)
+            x = heads_x[i]
+            y = heads_y[i]
+
+            # Special effects based on tower type
+            if kind == "missile":
+                # Draw missile pointing at its target
+                angle = math.atan2(self.target_y[i] - y, self.target_x[i] - x)
+                points = [
+                    (x + math.cos(angle) * size,
+                     y + math.sin(angle) * size),
+                    (x + math.cos(angle + 2.3) * size,
+                     y + math.sin(angle + 2.3) * size),
+                    (x + math.cos(angle - 2.3) * size,
+                     y + math.sin(angle - 2.3) * size),
+                ]
+                pygame.draw.polygon(screen, color, points)
+
+            elif kind == "splash":
+                # Draw with inner glow
+                screen.blit(GLOW_SPRITES.get((kind, size)), (x - size, y - size))
+                pygame.draw.circle(screen, color, (int(x), int(y)), size//2)
+
+            else:
+                # Standard projectile
+                pygame.draw.circle(screen, color, (int(x), int(y)), size)
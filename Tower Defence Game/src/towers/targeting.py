@@ -0,0 +1,67 @@
+import numpy as np
+
+def assign_targets(towers, enemies):
+    """Choose targets for every tower in one batched pass over an EnemyArray.
+
+    Towers keep a live target that is still in range. The rest are
+    retargeted from a towers x enemies squared-distance matrix, masked by
+    each tower's range, using the tower's targeting mode to pick the
+    winner: nearest, or furthest along the path ("first"), or least far
+    along it ("last").
+    """
+    if not towers:
+        return
+
+    n = enemies.count
+    if n == 0:
+        for tower in towers:
+            tower.target = None
+        return
+
+    x = enemies.column("x")
+    y = enemies.column("y")
+    health = enemies.column("health")
+    tower_x = np.array([tower.x for tower in towers], dtype=np.float64)
+    tower_y = np.array([tower.y for tower in towers], dtype=np.float64)
+    range_sq = np.array([tower.stats["range"] for tower in towers], dtype=np.float64) ** 2
+
+    # Keep current targets that are still alive, attached and in range
+    rows = np.array([tower.target._row if tower.target is not None and tower.target._store is enemies
+                     else -1 for tower in towers])
+    has_target = rows >= 0
+    safe_rows = np.where(has_target, rows, 0)
+    dx = x[safe_rows] - tower_x
+    dy = y[safe_rows] - tower_y
+    keep = has_target & (health[safe_rows] > 0) & (dx*dx + dy*dy <= range_sq)
+    retarget = np.flatnonzero(~keep)
+    if len(retarget) == 0:
+        return
+
+    # Squared distances from each retargeting tower to every enemy
+    dx = x[None, :] - tower_x[retarget, None]
+    dy = y[None, :] - tower_y[retarget, None]
+    distance_sq = dx*dx + dy*dy
+    in_range = (distance_sq <= range_sq[retarget, None]) & (health > 0)[None, :]
+
+    modes = np.array([towers[i].targeting for i in retarget])
+    chosen = np.full(len(retarget), -1)
+    progress = enemies.column("progress")
+    for mode in set(modes.tolist()):
+        selected = modes == mode
+        candidates = in_range[selected]
+
+        # Lower scores are preferred
+        if mode == "first":
+            scores = np.where(candidates, -progress[None, :], np.inf)
+        elif mode == "last":
+            scores = np.where(candidates, progress[None, :], np.inf)
+        else:
+            scores = np.where(candidates, distance_sq[selected], np.inf)
+
+        best = scores.argmin(axis=1)
+        found = candidates[np.arange(len(best)), best]
+        chosen[selected] = np.where(found, best, -1)
+
+    views = enemies.views
+    for tower_index, row in zip(retarget.tolist(), chosen.tolist()):
+        towers[tower_index].target = views[row] if row >= 0 else None
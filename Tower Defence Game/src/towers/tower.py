@@ -1,7 +1,48 @@
 import pygame
 import math
-from constants import TOWER_TYPES
-from .projectile import Projectile
+from constants import TOWER_TYPES, TARGETING_MODES, TOWER_ROTATION_STEPS
+from src.rendering.sprite_cache import SpriteCache
+
+TOWER_SPRITE_CENTER = 27  # Sprites are square with the tower in the middle
+RANGE_COLOR = (200, 200, 200, 64)
+
+def build_tower_sprite(tower_type, color, step):
+    # Base and rotated body/barrel for one quantized rotation
+    c = TOWER_SPRITE_CENTER
+    sprite = pygame.Surface((c * 2 + 1, c * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (100, 100, 100), (c, c), 22)
+    
+    angle = 2 * math.pi * step / TOWER_ROTATION_STEPS
+    size = 20
+    barrel_length = 25
+    barrel_width = 8
+    base_points = [
+        (c + math.cos(angle) * size, c + math.sin(angle) * size),
+        (c + math.cos(angle + math.pi*0.8) * size, c + math.sin(angle + math.pi*0.8) * size),
+        (c + math.cos(angle - math.pi*0.8) * size, c + math.sin(angle - math.pi*0.8) * size),
+    ]
+    barrel_points = [
+        (c + math.cos(angle + math.pi/2) * barrel_width, c + math.sin(angle + math.pi/2) * barrel_width),
+        (c + math.cos(angle) * barrel_length, c + math.sin(angle) * barrel_length),
+        (c + math.cos(angle - math.pi/2) * barrel_width, c + math.sin(angle - math.pi/2) * barrel_width)
+    ]
+    pygame.draw.polygon(sprite, color, base_points)
+    pygame.draw.polygon(sprite, (color[0]*0.8, color[1]*0.8, color[2]*0.8), barrel_points)
+    return sprite
+
+def build_range_sprite(radius, color):
+    sprite = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return sprite
+
+TOWER_SPRITES = SpriteCache(build_tower_sprite)
+RANGE_SPRITES = SpriteCache(build_range_sprite)
+
+def bake_tower_sprites():
+    """Render every tower rotation up front instead of on first use"""
+    for tower_type, stats in TOWER_TYPES.items():
+        TOWER_SPRITES.bake((tower_type, stats["color"], step)
+                           for step in range(TOWER_ROTATION_STEPS))
 
 class Tower:
     def __init__(self, x, y, tower_type):
@@ -10,49 +51,34 @@ class Tower:
         self.type = tower_type
         self.stats = TOWER_TYPES[tower_type].copy()
         self.target = None
+        self.targeting = TARGETING_MODES[0]
         self.fire_cooldown = 0
         self.show_range = False
-        self.projectiles = []
         self.upgrades = {}
+        self.damage_dealt = 0
         self.rotation = 0
         self.pulse_angle = 0
+        self.range_sprite = None
         
-    def update(self, enemies):
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update()
-            if projectile.dead:
-                self.projectiles.remove(projectile)
-        
+    # Targets are chosen for all towers in one batched pass
+    # (see targeting.assign_targets) before this runs
+    def update_weapon(self, projectiles):
         # Update firing cooldown
         if self.fire_cooldown > 0:
             self.fire_cooldown -= 1
             
-        # Find target if none exists or current target is dead/out of range
-        if not self.target or self.target.health <= 0 or self.get_distance_to(self.target) > self.stats["range"]:
-            self.find_target(enemies)
-            
         # Attack target if it exists and cooldown is ready
         if self.target and self.fire_cooldown <= 0:
-            self.fire_at_target()
+            self.fire_at_target(projectiles)
             
         # Update visual effects
         self.pulse_angle += 0.1
             
-    def find_target(self, enemies):
-        self.target = None
-        min_distance = float('inf')
-        
-        for enemy in enemies:
-            if enemy.health <= 0:
-                continue
+    def next_targeting(self):
+        index = TARGETING_MODES.index(self.targeting)
+        return TARGETING_MODES[(index + 1) % len(TARGETING_MODES)]
                 
-            distance = self.get_distance_to(enemy)
-            if distance <= self.stats["range"] and distance < min_distance:
-                self.target = enemy
-                min_distance = distance
-                
-    def fire_at_target(self):
+    def fire_at_target(self, projectiles):
         # Calculate direction to target
         dx = self.target.x - self.x
         dy = self.target.y - self.y
@@ -61,14 +87,8 @@ class Tower:
         # Update tower rotation
         self.rotation = math.degrees(angle)
         
-        # Create new projectile
-        self.projectiles.append(Projectile(
-            self.x, self.y,
-            self.target,
-            self.stats["damage"],
-            self.type,
-            self.stats.get("splash_damage", 0)
-        ))
+        # Launch a projectile from the shared projectile system
+        projectiles.spawn(self, self.target)
         
         # Reset cooldown
         self.fire_cooldown = self.stats["fire_rate"]
@@ -78,56 +98,36 @@ class Tower:
         dy = target.y - self.y
         return math.sqrt(dx*dx + dy*dy)
         
-    def draw(self, screen):
-        # Draw range circle if selected
+    def get_bounds(self):
+        # Barrel, upgrade indicators and the range circle when shown
         if self.show_range:
-            # Draw semi-transparent range circle
-            range_surface = pygame.Surface((self.stats["range"]*2, self.stats["range"]*2), 
-                                        pygame.SRCALPHA)
-            pygame.draw.circle(range_surface, (200, 200, 200, 64), 
-                            (self.stats["range"], self.stats["range"]), 
-                            self.stats["range"])
-            screen.blit(range_surface, 
-                       (self.x - self.stats["range"], 
-                        self.y - self.stats["range"]))
+            r = self.stats["range"]
+            return pygame.Rect(self.x - r, self.y - r, r * 2, r * 2).union(
+                pygame.Rect(self.x - 30, self.y - 60, 60, 90))
+        return pygame.Rect(self.x - 30, self.y - 60, 60, 90)
         
-        # Draw tower base (circle)
-        pygame.draw.circle(screen, (100, 100, 100), (self.x, self.y), 22)
+    def get_sprite(self):
+        step = round(self.rotation * TOWER_ROTATION_STEPS / 360) % TOWER_ROTATION_STEPS
+        return TOWER_SPRITES.get((self.type, self.stats["color"], step))
         
-        # Draw tower body with rotation
-        color = self.stats["color"]
-        points = []
-        size = 20
+    def get_range_sprite(self):
+        # Kept until an upgrade changes the range (see invalidate_range_sprite)
+        if self.range_sprite is None:
+            self.range_sprite = RANGE_SPRITES.get((self.stats["range"], RANGE_COLOR))
+        return self.range_sprite
         
-        # Calculate tower barrel points
-        angle = math.radians(self.rotation)
-        barrel_length = 25
-        barrel_width = 8
+    def invalidate_range_sprite(self):
+        self.range_sprite = None
         
-        # Base points
-        base_points = [
-            (self.x + math.cos(angle) * size, 
-             self.y + math.sin(angle) * size),
-            (self.x + math.cos(angle + math.pi*0.8) * size, 
-             self.y + math.sin(angle + math.pi*0.8) * size),
-            (self.x + math.cos(angle - math.pi*0.8) * size, 
-             self.y + math.sin(angle - math.pi*0.8) * size),
-        ]
-        
-        # Barrel points
-        barrel_points = [
-            (self.x + math.cos(angle + math.pi/2) * barrel_width,
-             self.y + math.sin(angle + math.pi/2) * barrel_width),
-            (self.x + math.cos(angle) * barrel_length,
-             self.y + math.sin(angle) * barrel_length),
-            (self.x + math.cos(angle - math.pi/2) * barrel_width,
-             self.y + math.sin(angle - math.pi/2) * barrel_width)
-        ]
+    def draw(self, screen):
+        # Draw range circle if selected
+        if self.show_range:
+            screen.blit(self.get_range_sprite(),
+                       (self.x - self.stats["range"], 
+                        self.y - self.stats["range"]))
         
-        # Draw tower components
-        pygame.draw.polygon(screen, color, base_points)
-        pygame.draw.polygon(screen, (color[0]*0.8, color[1]*0.8, color[2]*0.8), 
-                          barrel_points)
+        # Draw tower base and body at the nearest pre-rendered rotation
+        screen.blit(self.get_sprite(), (self.x - TOWER_SPRITE_CENTER, self.y - TOWER_SPRITE_CENTER))
         
         # Draw upgrade indicators
         if self.upgrades:
@@ -146,10 +146,6 @@ class Tower:
                                      (self.x - 10 + i*7, indicator_y), 3)
                 indicator_y -= 6
         
-        # Draw projectiles
-        for projectile in self.projectiles:
-            projectile.draw(screen)
-            
         # Draw targeting line if has target
         if self.target and self.show_range:
             pygame.draw.line(screen, (255, 0, 0, 128),
@@ -1,13 +1,19 @@
 import pygame
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, UI_PANEL, UI_BORDER, UI_TEXT, DIFFICULTIES
 from .menu import Button
+from .fonts import get_font
+from .widget import Widget, Overlay
 
-class DifficultyMenu:
+class DifficultyMenu(Widget):
+    opaque = False  # Rounded panel corners
+    
     def __init__(self):
         self.panel_width = 400
         self.panel_height = 500
         self.x = (WINDOW_WIDTH - self.panel_width) // 2
         self.y = (WINDOW_HEIGHT - self.panel_height) // 2
+        super().__init__((self.x, self.y, self.panel_width, self.panel_height))
+        self.overlay = Overlay()
         
         # Create buttons with different colors for each difficulty
         self.buttons = {
@@ -16,39 +22,40 @@ class DifficultyMenu:
             'hard': Button(self.x + 100, self.y + 290, 200, 50, "Hard", (120, 40, 40)),
             'back': Button(self.x + 100, self.y + 360, 200, 50, "Back", (80, 80, 80))
         }
+        for button in self.buttons.values():
+            self.add(button)
         
-        self.title_font = pygame.font.Font(None, 48)
-        self.info_font = pygame.font.Font(None, 24)
+        self.title_font = get_font(48)
+        self.info_font = get_font(24)
         self.selected_difficulty = None
         
+    def get_state(self):
+        # The info text follows the hovered difficulty
+        return tuple(button.is_hovered for button in self.buttons.values())
+        
     def draw(self, screen):
-        # Draw semi-transparent background
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        screen.blit(overlay, (0, 0))
+        # Draw semi-transparent background, then the cached panel and buttons
+        self.overlay.draw(screen)
+        super().draw(screen)
         
+    def render(self, surface):
         # Draw panel
-        panel_rect = pygame.Rect(self.x, self.y, self.panel_width, self.panel_height)
-        pygame.draw.rect(screen, UI_PANEL, panel_rect, border_radius=10)
-        pygame.draw.rect(screen, UI_BORDER, panel_rect, 2, border_radius=10)
+        panel_rect = surface.get_rect()
+        pygame.draw.rect(surface, UI_PANEL, panel_rect, border_radius=10)
+        pygame.draw.rect(surface, UI_BORDER, panel_rect, 2, border_radius=10)
         
         # Draw title
         title = self.title_font.render("Select Difficulty", True, UI_TEXT)
-        screen.blit(title, (self.x + (self.panel_width - title.get_width())//2, self.y + 40))
-        
-        # Draw buttons
-        for button in self.buttons.values():
-            button.draw(screen)
+        surface.blit(title, ((self.panel_width - title.get_width())//2, 40))
             
         # Draw difficulty info if one is hovered
         for diff_name, button in self.buttons.items():
             if button.is_hovered and diff_name in DIFFICULTIES:
-                self.draw_difficulty_info(screen, diff_name)
+                self.draw_difficulty_info(surface, diff_name)
                 
     def draw_difficulty_info(self, screen, difficulty):
-        info_x = self.x + 20
-        info_y = self.y + self.panel_height - 80
+        info_x = 20
+        info_y = self.panel_height - 80
         
         info_text = [
             f"Starting Money: ${DIFFICULTIES[difficulty]['starting_money']}",
@@ -0,0 +1,69 @@
+import pygame
+from collections import OrderedDict
+from constants import TEXT_CACHE_SIZE
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces.
+
+    Surfaces are keyed by (font, text, colour, antialias) plus the optional
+    background and alpha, and are shared between callers, so they must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, antialias, color, background=None, alpha=None):
+        key = (font.key, text, tuple(color), antialias,
+               tuple(background) if background is not None else None, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.font.render(text, antialias, color, background)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.surfaces)}
+
+TEXT_CACHE = TextCache()
+
+class CachedFont:
+    """pygame Font whose render() goes through the shared text cache"""
+
+    def __init__(self, name, size):
+        self.key = (name, size)
+        self.font = pygame.font.Font(name, size)
+
+    def render(self, text, antialias, color, background=None, alpha=None):
+        return TEXT_CACHE.render(self, text, antialias, color, background, alpha)
+
+    def __getattr__(self, name):
+        # size(), get_height() and the rest come from the real font
+        return getattr(self.font, name)
+
+_fonts = {}
+
+def get_font(size, name=None):
+    """Shared font for a file name (None for pygame's default) and size"""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = CachedFont(name, size)
+    return font
@@ -0,0 +1,187 @@
+import pygame
+from constants import WINDOW_WIDTH, UI_PANEL, UI_BORDER, UI_TEXT
+from .fonts import get_font
+from .widget import Widget
+
+class StatusBar(Widget):
+    """Wave, money and base health along the top of the screen"""
+
+    def __init__(self, simulation):
+        super().__init__((0, 0, WINDOW_WIDTH, 40))
+        self.simulation = simulation
+        self.font = get_font(36)
+
+    def get_state(self):
+        sim = self.simulation
+        return (sim.wave_number, sim.wave_active, int(sim.wave_timer / 60), sim.money, sim.base_health)
+
+    def render(self, surface):
+        # Draw top status bar background
+        pygame.draw.rect(surface, UI_PANEL, (0, 0, WINDOW_WIDTH, 40))
+        
+        # Draw wave info
+        wave_text = f"Wave {self.simulation.wave_number}"
+        if not self.simulation.wave_active:
+            next_wave = int(self.simulation.wave_timer / 60)
+            wave_text += f" (Next: {next_wave}s)"
+        text = self.font.render(wave_text, True, UI_TEXT)
+        surface.blit(text, (10, 10))
+        
+        # Draw money
+        money_text = self.font.render(f"${self.simulation.money}", True, UI_TEXT)
+        surface.blit(money_text, (WINDOW_WIDTH//2 - money_text.get_width()//2, 10))
+        
+        # Draw health
+        health_text = self.font.render(f"Health: {self.simulation.base_health}", True, UI_TEXT)
+        surface.blit(health_text, (WINDOW_WIDTH - health_text.get_width() - 10, 10))
+
+class StartButton(Widget):
+    def __init__(self, rect, simulation):
+        super().__init__(rect)
+        self.simulation = simulation
+        self.font = get_font(36)
+
+    def get_state(self):
+        return self.simulation.game_started
+
+    def render(self, surface):
+        # Greyed out once the game is running
+        rect = surface.get_rect()
+        color = (60, 120, 60) if not self.simulation.game_started else (100, 100, 100)
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (100, 255, 100), rect, 3)
+        
+        text = self.font.render("Start", True, UI_TEXT)
+        surface.blit(text, text.get_rect(center=rect.center))
+
+class SpeedButton(Widget):
+    def __init__(self, rect, fast_forward):
+        super().__init__(rect)
+        self.fast_forward = fast_forward
+        self.font = get_font(36)
+
+    def get_state(self):
+        return self.fast_forward.speed
+
+    def render(self, surface):
+        rect = surface.get_rect()
+        color = (60, 60, 120) if self.fast_forward.speed == 1 else (90, 60, 140)
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (150, 150, 255), rect, 3)
+        
+        text = self.font.render(self.fast_forward.speed_label(), True, UI_TEXT)
+        surface.blit(text, text.get_rect(center=rect.center))
+
+class SpeedLabel(Widget):
+    """Speed-up actually achieved, shown above the speed button while fast-forwarding"""
+
+    opaque = False  # Text straight on the map
+
+    def __init__(self, speed_button_rect, fast_forward):
+        super().__init__((speed_button_rect.x, speed_button_rect.y - 20,
+                          speed_button_rect.width + 60, 20))
+        self.fast_forward = fast_forward
+        self.font = get_font(24)
+
+    def get_state(self):
+        return f"Actual: {self.fast_forward.achieved_speed:.1f}x"
+
+    def render(self, surface):
+        surface.blit(self.font.render(self.get_state(), True, UI_TEXT), (0, 0))
+
+class UpgradePanel(Widget):
+    """Stats, targeting mode and upgrade buttons of the selected tower"""
+
+    opaque = False  # Long button labels run past the panel onto the map
+
+    stats_to_show = {
+        "damage": "Damage",
+        "range": "Range",
+        "fire_rate": "Fire Rate",
+        "splash_damage": "Splash Damage"
+    }
+
+    def __init__(self, simulation):
+        super().__init__((5, 50, 300, 220))
+        self.simulation = simulation
+        self.tower = None
+        self.upgrade_buttons = {}
+        self.visible = False
+        self.font = get_font(36)
+        self.stats_font = get_font(24)
+
+    def set_tower(self, tower, upgrade_buttons):
+        """Show a tower and lay out its upgrade buttons in screen coordinates"""
+        self.tower = tower
+        self.upgrade_buttons = upgrade_buttons
+        self.visible = tower is not None
+        self.rect.height = len(upgrade_buttons) * 50 + 220  # Extra space for stats
+        
+        y = 100 + 25 * (len([stat for stat in self.stats_to_show if tower and stat in tower.stats]) + 1)
+        y += 20  # Add spacing between stats and upgrade buttons
+        for button in upgrade_buttons.values():
+            button["rect"] = pygame.Rect(10, y, 180, 40)
+            y += 50
+
+    def get_state(self):
+        tower = self.tower
+        if tower is None:
+            return None
+        money = self.simulation.money
+        return (tower, tuple(tower.stats.get(stat) for stat in self.stats_to_show), tower.targeting,
+                tuple((upgrade_type, button["cost"], button["level"], money >= button["cost"])
+                      for upgrade_type, button in self.upgrade_buttons.items()))
+
+    def render(self, surface):
+        tower = self.tower
+        offset_x, offset_y = -self.rect.x, -self.rect.y
+        
+        # Draw panel background
+        panel_rect = pygame.Rect(0, 0, 200, self.rect.height)
+        pygame.draw.rect(surface, UI_PANEL, panel_rect)
+        pygame.draw.rect(surface, UI_BORDER, panel_rect, 2)
+        
+        # Draw tower info and current stats
+        title = self.font.render(f"{tower.type.title()}", True, UI_TEXT)
+        surface.blit(title, (15 + offset_x, 60 + offset_y))
+        
+        # Draw current stats with labels
+        y = 100
+        for stat, label in self.stats_to_show.items():
+            if stat in tower.stats:
+                value = tower.stats[stat]
+                if stat == "fire_rate":
+                    # Convert fire rate to shots per second
+                    text = f"{label}: {60/value:.1f}/s"
+                else:
+                    text = f"{label}: {value}"
+                stat_text = self.stats_font.render(text, True, UI_TEXT)
+                surface.blit(stat_text, (15 + offset_x, y + offset_y))
+                y += 25
+        
+        # Draw targeting mode (T cycles it)
+        target_text = self.stats_font.render(f"Target: {tower.targeting.title()} (T)",
+                                             True, UI_TEXT)
+        surface.blit(target_text, (15 + offset_x, y + offset_y))
+        
+        # Draw upgrade buttons
+        for upgrade_type, button in self.upgrade_buttons.items():
+            rect = button["rect"].move(offset_x, offset_y)
+            cost = button["cost"]
+            level = button["level"]
+            
+            # Draw button
+            color = (60, 120, 60) if self.simulation.money >= cost else (120, 60, 60)
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, UI_BORDER, rect, 2)
+            
+            # Draw text
+            text = f"{upgrade_type.replace('_', ' ').title()} (${cost})"
+            text_surface = self.font.render(text, True, UI_TEXT)
+            surface.blit(text_surface, (rect.x + 10, rect.y + 10))
+            
+            # Draw level indicators
+            for i in range(3):
+                indicator_rect = pygame.Rect(rect.right - 60 + i*15, rect.y + 5, 10, 10)
+                color = (0, 255, 0) if i < level else (100, 100, 100)
+                pygame.draw.rect(surface, color, indicator_rect)
@@ -1,25 +1,33 @@
 import pygame
 import math
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, UI_PANEL, UI_BORDER, UI_TEXT, UI_HIGHLIGHT, UI_BACKGROUND
+from .fonts import get_font
+from .widget import Widget, Overlay
 
-class Button:
+class Button(Widget):
+    opaque = False  # Rounded corners show what is behind
+    
     def __init__(self, x, y, width, height, text, color=(60, 63, 65), hover_color=(80, 83, 85)):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__((x, y, width, height))
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.is_hovered = False
-        self.font = pygame.font.Font(None, 36)
+        self.font = get_font(36)
         self.click_time = 0
         self.animation_duration = 10
         
+    def get_state(self):
+        return (self.text, self.is_hovered)
+        
+    def render(self, surface):
+        self._draw_button(surface, surface.get_rect())
+        
     def draw(self, screen):
         # Calculate button animation
         current_time = pygame.time.get_ticks()
         animation_progress = max(0, min(1, (current_time - self.click_time) / self.animation_duration))
         
-        # Draw button with animation
-        color = self.hover_color if self.is_hovered else self.color
         if animation_progress < 1:
             # Scale button slightly during click animation
             scale = 0.95 + 0.05 * animation_progress
@@ -27,10 +35,13 @@ class Button:
             height = int(self.rect.height * scale)
             x = self.rect.centerx - width//2
             y = self.rect.centery - height//2
-            rect = pygame.Rect(x, y, width, height)
+            self._draw_button(screen, pygame.Rect(x, y, width, height))
         else:
-            rect = self.rect
+            # Otherwise the cached rendering is reused
+            super().draw(screen)
             
+    def _draw_button(self, screen, rect):
+        color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(screen, color, rect, border_radius=8)
         pygame.draw.rect(screen, UI_BORDER, rect, 2, border_radius=8)
         
@@ -75,9 +86,10 @@ class MainMenu:
                           "Audio", (120, 120, 40), (140, 140, 60))
         }
         
-        self.title_font = pygame.font.Font(None, 72)
-        self.subtitle_font = pygame.font.Font(None, 36)
+        self.title_font = get_font(72)
+        self.subtitle_font = get_font(36)
         self.background_alpha = 128
+        self.overlay = Overlay(self.background_alpha)
         
         # Title animation
         self.title_bounce = 0
@@ -95,10 +107,7 @@ class MainMenu:
             demo_game.draw(screen)
             
             # Draw semi-transparent overlay
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(self.background_alpha)
-            screen.blit(overlay, (0, 0))
+            self.overlay.draw(screen)
         else:
             screen.fill(UI_BACKGROUND)
         
@@ -109,9 +118,7 @@ class MainMenu:
         # Create glow effect
         for i in range(3):
             size = 72 + i * 2
-            font = pygame.font.Font(None, size)
-            glow = font.render(title_text, True, (80, 80, 100))
-            glow.set_alpha(50 - i * 15)
+            glow = get_font(size).render(title_text, True, (80, 80, 100), alpha=50 - i * 15)
             glow_rect = glow.get_rect(center=(WINDOW_WIDTH//4, 80 + self.title_offset))
             glow_surfaces.append((glow, glow_rect))
             
@@ -146,6 +153,7 @@ class MainMenu:
 
 class PauseMenu:
     def __init__(self):
+        self.overlay = Overlay()
         width = 300
         height = 400
         x = (WINDOW_WIDTH - width) // 2
@@ -170,18 +178,14 @@ class PauseMenu:
         
     def draw(self, screen):
         # Draw semi-transparent background
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        screen.blit(overlay, (0, 0))
+        self.overlay.draw(screen)
         
         # Draw panel with border
         pygame.draw.rect(screen, UI_PANEL, self.panel_rect, border_radius=10)
         pygame.draw.rect(screen, UI_BORDER, self.panel_rect, 2, border_radius=10)
         
         # Draw title
-        font = pygame.font.Font(None, 48)
-        title = font.render("Paused", True, UI_TEXT)
+        title = get_font(48).render("Paused", True, UI_TEXT)
         screen.blit(title, (self.panel_rect.centerx - title.get_width()//2, 
                            self.panel_rect.y + 30))
         
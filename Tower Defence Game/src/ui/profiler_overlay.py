@@ -0,0 +1,51 @@
+import pygame
+from constants import WINDOW_WIDTH, UI_PANEL, UI_BORDER, UI_TEXT
+from src.game.profiler import PROFILER_PHASES
+from .fonts import get_font
+from .widget import Widget
+
+class ProfilerOverlay(Widget):
+    """Per-phase frame times and entity counts, toggled with F3"""
+
+    row_height = 16
+
+    def __init__(self, profiler, pacer):
+        rows = len(PROFILER_PHASES) + 9
+        super().__init__((WINDOW_WIDTH - 290, 45, 280, rows * self.row_height + 10))
+        self.profiler = profiler
+        self.pacer = pacer
+        self.visible = False
+        self.font = get_font(18)
+
+    def get_state(self):
+        # The profiler only re-summarizes every few frames
+        return self.profiler.summary_frame, self.profiler.is_exporting()
+
+    def render(self, surface):
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, UI_PANEL, rect)
+        pygame.draw.rect(surface, UI_BORDER, rect, 1)
+        
+        lines = [("phase", "avg", "p95", "p99")]
+        summary = self.profiler.summary
+        for phase in PROFILER_PHASES + ("total",):
+            times = summary.get(phase)
+            if times:
+                lines.append((phase, f"{times['avg']:.2f}", f"{times['p95']:.2f}", f"{times['p99']:.2f}"))
+        
+        # Whole frames, including the wait for the next one
+        frames = self.pacer.stats()
+        if frames["frames"]:
+            lines.append(("frame", f"{frames['avg']:.2f}", f"{frames['p95']:.2f}", f"{frames['p99']:.2f}"))
+            lines.append((f"{frames['fps']:.1f} fps", "", "", ""))
+        
+        for name, count in self.profiler.counts.items():
+            lines.append((name, str(count), "", ""))
+        if self.profiler.is_exporting():
+            lines.append(("recording (F4)", "", "", ""))
+        
+        columns = (8, 130, 180, 230)
+        for row, line in enumerate(lines):
+            for x, text in zip(columns, line):
+                if text:
+                    surface.blit(self.font.render(text, True, UI_TEXT), (x, 5 + row * self.row_height))
@@ -1,13 +1,19 @@
 import pygame
 from constants import WINDOW_WIDTH, WINDOW_HEIGHT, UI_PANEL, UI_BORDER, UI_TEXT
 from .menu import Button
+from .fonts import get_font
+from .widget import Widget, Overlay
 
-class SettingsMenu:
+class SettingsMenu(Widget):
+    opaque = False  # Rounded panel corners
+    
     def __init__(self):
         self.panel_width = 400
         self.panel_height = 500
         self.x = (WINDOW_WIDTH - self.panel_width) // 2
         self.y = (WINDOW_HEIGHT - self.panel_height) // 2
+        super().__init__((self.x, self.y, self.panel_width, self.panel_height))
+        self.overlay = Overlay()
         
         # Settings state
         self.settings = {
@@ -27,6 +33,7 @@ class SettingsMenu:
             self.y + self.panel_height - 70,
             200, 50, "Back"
         )
+        self.add(self.back_button)
         
     def create_controls(self):
         # Volume sliders
@@ -62,60 +69,64 @@ class SettingsMenu:
             }
         }
         
+    def get_state(self):
+        # Slider positions and toggle values
+        return (tuple(self.settings.values()),
+                tuple(toggle_info['value'] for toggle_info in self.toggles.values()))
+        
     def draw(self, screen):
-        # Draw semi-transparent background
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        screen.blit(overlay, (0, 0))
+        # Draw semi-transparent background, then the cached panel and back button
+        self.overlay.draw(screen)
+        super().draw(screen)
         
+    def render(self, surface):
         # Draw panel
-        panel_rect = pygame.Rect(self.x, self.y, self.panel_width, self.panel_height)
-        pygame.draw.rect(screen, UI_PANEL, panel_rect, border_radius=10)
-        pygame.draw.rect(screen, UI_BORDER, panel_rect, 2, border_radius=10)
+        panel_rect = surface.get_rect()
+        pygame.draw.rect(surface, UI_PANEL, panel_rect, border_radius=10)
+        pygame.draw.rect(surface, UI_BORDER, panel_rect, 2, border_radius=10)
         
         # Draw title
-        font = pygame.font.Font(None, 48)
-        title = font.render("Settings", True, UI_TEXT)
-        screen.blit(title, (self.x + (self.panel_width - title.get_width())//2, self.y + 30))
+        title = get_font(48).render("Settings", True, UI_TEXT)
+        surface.blit(title, ((self.panel_width - title.get_width())//2, 30))
         
         # Draw sliders
-        label_font = pygame.font.Font(None, 32)
+        label_font = get_font(32)
         for slider_info in self.sliders.values():
+            rect = slider_info['rect'].move(-self.x, -self.y)
+            
             # Draw label
             label = label_font.render(slider_info['label'], True, UI_TEXT)
-            screen.blit(label, (slider_info['rect'].x, slider_info['rect'].y - 25))
+            surface.blit(label, (rect.x, rect.y - 25))
             
             # Draw slider background
-            pygame.draw.rect(screen, (60, 60, 60), slider_info['rect'])
-            pygame.draw.rect(screen, UI_BORDER, slider_info['rect'], 2)
+            pygame.draw.rect(surface, (60, 60, 60), rect)
+            pygame.draw.rect(surface, UI_BORDER, rect, 2)
             
             # Draw slider handle
-            handle_x = slider_info['rect'].x + slider_info['rect'].width * self.settings[slider_info['label'].lower().replace(' ', '_')]
-            handle_rect = pygame.Rect(handle_x - 8, slider_info['rect'].y - 5, 16, 30)
-            pygame.draw.rect(screen, UI_TEXT, handle_rect, border_radius=8)
+            handle_x = rect.x + rect.width * self.settings[slider_info['label'].lower().replace(' ', '_')]
+            handle_rect = pygame.Rect(handle_x - 8, rect.y - 5, 16, 30)
+            pygame.draw.rect(surface, UI_TEXT, handle_rect, border_radius=8)
         
         # Draw toggles
         for toggle_info in self.toggles.values():
+            rect = toggle_info['rect'].move(-self.x, -self.y)
+            
             # Draw label
             label = label_font.render(toggle_info['label'], True, UI_TEXT)
-            screen.blit(label, (toggle_info['rect'].x + 40, toggle_info['rect'].y + 5))
+            surface.blit(label, (rect.x + 40, rect.y + 5))
             
             # Draw checkbox
-            pygame.draw.rect(screen, (60, 60, 60), toggle_info['rect'])
-            pygame.draw.rect(screen, UI_BORDER, toggle_info['rect'], 2)
+            pygame.draw.rect(surface, (60, 60, 60), rect)
+            pygame.draw.rect(surface, UI_BORDER, rect, 2)
             
             # Draw check if enabled
             if toggle_info['value']:
                 checkmark_points = [
-                    (toggle_info['rect'].x + 7, toggle_info['rect'].y + 15),
-                    (toggle_info['rect'].x + 12, toggle_info['rect'].y + 20),
-                    (toggle_info['rect'].x + 23, toggle_info['rect'].y + 10)
+                    (rect.x + 7, rect.y + 15),
+                    (rect.x + 12, rect.y + 20),
+                    (rect.x + 23, rect.y + 10)
                 ]
-                pygame.draw.lines(screen, UI_TEXT, False, checkmark_points, 3)
-        
-        # Draw back button
-        self.back_button.draw(screen)
+                pygame.draw.lines(surface, UI_TEXT, False, checkmark_points, 3)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
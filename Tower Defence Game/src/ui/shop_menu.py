@@ -1,13 +1,19 @@
 import pygame
 from constants import (WINDOW_WIDTH, WINDOW_HEIGHT, UI_PANEL, UI_BORDER, UI_TEXT,
                      TOWER_TYPES, SHOP_TOWERS)
+from .fonts import get_font
+from .widget import Widget, Overlay
 
-class ShopMenu:
+class ShopMenu(Widget):
     def __init__(self):
         self.panel_width = 600
         self.panel_height = 400
         self.x = (WINDOW_WIDTH - self.panel_width) // 2
         self.y = (WINDOW_HEIGHT - self.panel_height) // 2
+        super().__init__((self.x, self.y, self.panel_width, self.panel_height))
+        self.overlay = Overlay()
+        self.money = 0
+        self.available_towers = ()
         
         # Create tower display rectangles
         self.tower_rects = {}
@@ -21,8 +27,8 @@ class ShopMenu:
         )
         
         # Fonts
-        self.font_big = pygame.font.Font(None, 48)
-        self.font = pygame.font.Font(None, 24)
+        self.font_big = get_font(48)
+        self.font = get_font(24)
         
     def setup_tower_displays(self):
         tower_width = 150
@@ -39,47 +45,54 @@ class ShopMenu:
             }
             x += tower_width + spacing
             
+    def get_state(self):
+        return (self.money, self.available_towers)
+        
     def draw(self, screen, loadout_system, money):
-        # Draw semi-transparent background
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
-        screen.blit(overlay, (0, 0))
+        self.money = money
+        self.available_towers = tuple(loadout_system.get_available_towers())
+        
+        # Draw semi-transparent background, then the cached panel
+        self.overlay.draw(screen)
+        super().draw(screen)
+        
+    def render(self, surface):
+        money = self.money
         
         # Draw main panel
-        pygame.draw.rect(screen, UI_PANEL,
-                        (self.x, self.y, self.panel_width, self.panel_height))
-        pygame.draw.rect(screen, UI_BORDER,
-                        (self.x, self.y, self.panel_width, self.panel_height), 2)
+        pygame.draw.rect(surface, UI_PANEL,
+                        (0, 0, self.panel_width, self.panel_height))
+        pygame.draw.rect(surface, UI_BORDER,
+                        (0, 0, self.panel_width, self.panel_height), 2)
         
         # Draw title
         title = self.font_big.render("Tower Shop", True, UI_TEXT)
-        screen.blit(title, (self.x + (self.panel_width - title.get_width())//2, self.y + 20))
+        surface.blit(title, ((self.panel_width - title.get_width())//2, 20))
         
         # Draw money
         money_text = self.font_big.render(f"${money}", True, UI_TEXT)
-        screen.blit(money_text, (self.x + 20, self.y + 20))
+        surface.blit(money_text, (20, 20))
         
         # Draw towers
         for tower_type, data in self.tower_rects.items():
-            rect = data["rect"]
+            rect = data["rect"].move(-self.x, -self.y)
             info = data["info"]
             stats = TOWER_TYPES[tower_type]
             
             # Draw tower panel
-            pygame.draw.rect(screen, (60, 60, 60), rect)
-            pygame.draw.rect(screen, UI_BORDER, rect, 2)
+            pygame.draw.rect(surface, (60, 60, 60), rect)
+            pygame.draw.rect(surface, UI_BORDER, rect, 2)
             
             # Draw tower preview
             preview_size = 40
             preview_x = rect.centerx
             preview_y = rect.y + 50
-            pygame.draw.circle(screen, stats["color"],
+            pygame.draw.circle(surface, stats["color"],
                              (preview_x, preview_y), preview_size//2)
             
             # Draw tower info
             name = self.font.render(tower_type.title(), True, UI_TEXT)
-            screen.blit(name, (rect.x + 10, rect.y + 10))
+            surface.blit(name, (rect.x + 10, rect.y + 10))
             
             # Draw stats
             y = preview_y + 40
@@ -93,28 +106,29 @@ class ShopMenu:
                 
             for text in stat_texts:
                 stat = self.font.render(text, True, UI_TEXT)
-                screen.blit(stat, (rect.x + 10, y))
+                surface.blit(stat, (rect.x + 10, y))
                 y += 20
             
             # Draw cost/status
-            if tower_type in loadout_system.get_available_towers():
+            if tower_type in self.available_towers:
                 status = self.font.render("Owned", True, (0, 255, 0))
             else:
                 cost = info["unlock_cost"]
                 color = (255, 0, 0) if money < cost else (0, 255, 0)
                 status = self.font.render(f"Cost: ${cost}", True, color)
-            screen.blit(status, (rect.x + 10, rect.bottom - 30))
+            surface.blit(status, (rect.x + 10, rect.bottom - 30))
             
             # Draw description
             desc = self.font.render(info["description"], True, UI_TEXT)
-            screen.blit(desc, (rect.x + 10, rect.bottom - 50))
+            surface.blit(desc, (rect.x + 10, rect.bottom - 50))
         
         # Draw back button
-        pygame.draw.rect(screen, (80, 80, 80), self.back_button)
-        pygame.draw.rect(screen, UI_BORDER, self.back_button, 2)
+        back_button = self.back_button.move(-self.x, -self.y)
+        pygame.draw.rect(surface, (80, 80, 80), back_button)
+        pygame.draw.rect(surface, UI_BORDER, back_button, 2)
         back_text = self.font.render("Back", True, UI_TEXT)
-        text_rect = back_text.get_rect(center=self.back_button.center)
-        screen.blit(back_text, text_rect)
+        text_rect = back_text.get_rect(center=back_button.center)
+        surface.blit(back_text, text_rect)
         
     def handle_click(self, pos, loadout_system, money):
         """Handle mouse clicks in the shop menu"""
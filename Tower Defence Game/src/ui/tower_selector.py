@@ -1,17 +1,21 @@
 import pygame
 from constants import (WINDOW_WIDTH, WINDOW_HEIGHT, TOWER_TYPES, PANEL_HEIGHT, 
                      UI_PANEL, UI_BORDER, UI_TEXT, UI_BUTTON, UI_BUTTON_HOVER, INITIAL_TOWERS)
+from .fonts import get_font
+from .widget import Widget
 
-class TowerSelector:
+class TowerSelector(Widget):
     def __init__(self):
         self.panel_rect = pygame.Rect(0, WINDOW_HEIGHT - PANEL_HEIGHT, 
                                     WINDOW_WIDTH, PANEL_HEIGHT)
+        super().__init__(self.panel_rect)
+        self.money = 0
         self.selected_tower = None
         self.hover_tower = None
         self.unlocked_towers = INITIAL_TOWERS.copy()  # Start with 3 basic towers
         self.buttons = self._create_tower_buttons()
-        self.font = pygame.font.Font(None, 24)
-        self.stats_font = pygame.font.Font(None, 20)
+        self.font = get_font(24)
+        self.stats_font = get_font(20)
         self.is_collapsed = True
         self.toggle_button = pygame.Rect(10, WINDOW_HEIGHT - PANEL_HEIGHT + 10, 
                                        40, 40)
@@ -69,35 +73,48 @@ class TowerSelector:
                         
         return False
         
-    def draw(self, screen, money):
+    def get_state(self):
+        return (self.money, self.is_collapsed, self.hover_tower, self.selected_tower,
+                tuple(self.unlocked_towers))
+        
+    def draw(self, screen, money=None):
+        if money is not None:
+            self.money = money
+        super().draw(screen)
+        
+    def render(self, surface):
+        money = self.money
+        offset_x, offset_y = -self.rect.x, -self.rect.y
+        
         # Draw panel background
-        pygame.draw.rect(screen, UI_PANEL, self.panel_rect)
-        pygame.draw.rect(screen, UI_BORDER, self.panel_rect, 2)
+        pygame.draw.rect(surface, UI_PANEL, surface.get_rect())
+        pygame.draw.rect(surface, UI_BORDER, surface.get_rect(), 2)
         
         # Draw toggle button
-        pygame.draw.rect(screen, UI_BUTTON_HOVER if self.is_collapsed else UI_BUTTON, 
-                        self.toggle_button)
-        pygame.draw.rect(screen, UI_BORDER, self.toggle_button, 2)
+        toggle_button = self.toggle_button.move(offset_x, offset_y)
+        pygame.draw.rect(surface, UI_BUTTON_HOVER if self.is_collapsed else UI_BUTTON, 
+                        toggle_button)
+        pygame.draw.rect(surface, UI_BORDER, toggle_button, 2)
         
         # Draw arrow
         arrow_points = []
         if self.is_collapsed:
             # Right arrow
             arrow_points = [
-                (self.toggle_button.x + 15, self.toggle_button.y + 20),
-                (self.toggle_button.x + 30, self.toggle_button.y + 20),
-                (self.toggle_button.x + 25, self.toggle_button.y + 15),
-                (self.toggle_button.x + 25, self.toggle_button.y + 25)
+                (toggle_button.x + 15, toggle_button.y + 20),
+                (toggle_button.x + 30, toggle_button.y + 20),
+                (toggle_button.x + 25, toggle_button.y + 15),
+                (toggle_button.x + 25, toggle_button.y + 25)
             ]
         else:
             # Left arrow
             arrow_points = [
-                (self.toggle_button.x + 30, self.toggle_button.y + 20),
-                (self.toggle_button.x + 15, self.toggle_button.y + 20),
-                (self.toggle_button.x + 20, self.toggle_button.y + 15),
-                (self.toggle_button.x + 20, self.toggle_button.y + 25)
+                (toggle_button.x + 30, toggle_button.y + 20),
+                (toggle_button.x + 15, toggle_button.y + 20),
+                (toggle_button.x + 20, toggle_button.y + 15),
+                (toggle_button.x + 20, toggle_button.y + 25)
             ]
-        pygame.draw.polygon(screen, UI_TEXT, arrow_points)
+        pygame.draw.polygon(surface, UI_TEXT, arrow_points)
         
         # Update tower button positions based on collapse state
         target_x = -200 if self.is_collapsed else 0  # Move buttons off screen when collapsed
@@ -113,34 +130,36 @@ class TowerSelector:
             button["rect"].x = new_x
             
             if not self.is_collapsed:
+                rect = button["rect"].move(offset_x, offset_y)
+                
                 # Draw button background
                 color = stats["color"]
                 if tower_type == self.selected_tower:
                     # Selected state
-                    pygame.draw.rect(screen, (color[0]//2, color[1]//2, color[2]//2), 
-                                   button["rect"])
-                    pygame.draw.rect(screen, UI_BORDER, button["rect"], 3)
+                    pygame.draw.rect(surface, (color[0]//2, color[1]//2, color[2]//2), 
+                                   rect)
+                    pygame.draw.rect(surface, UI_BORDER, rect, 3)
                 elif tower_type == self.hover_tower:
                     # Hover state
-                    pygame.draw.rect(screen, (min(color[0]*1.2, 255), 
+                    pygame.draw.rect(surface, (min(color[0]*1.2, 255), 
                                             min(color[1]*1.2, 255), 
-                                            min(color[2]*1.2, 255)), button["rect"])
-                    pygame.draw.rect(screen, UI_BORDER, button["rect"], 2)
+                                            min(color[2]*1.2, 255)), rect)
+                    pygame.draw.rect(surface, UI_BORDER, rect, 2)
                 else:
                     # Normal state
-                    pygame.draw.rect(screen, color, button["rect"])
-                    pygame.draw.rect(screen, UI_BORDER, button["rect"], 1)
+                    pygame.draw.rect(surface, color, rect)
+                    pygame.draw.rect(surface, UI_BORDER, rect, 1)
                     
                 # Draw tower preview
-                center_x = button["rect"].centerx
-                center_y = button["rect"].centery
-                pygame.draw.circle(screen, (100, 100, 100), (center_x, center_y), 15)
+                center_x = rect.centerx
+                center_y = rect.centery
+                pygame.draw.circle(surface, (100, 100, 100), (center_x, center_y), 15)
                 
                 # Draw cost
                 cost_text = self.font.render(str(stats["cost"]), True, 
                                            UI_TEXT if money >= stats["cost"] else (255, 0, 0))
-                cost_rect = cost_text.get_rect(centerx=center_x, top=button["rect"].bottom + 5)
-                screen.blit(cost_text, cost_rect)
+                cost_rect = cost_text.get_rect(centerx=center_x, top=rect.bottom + 5)
+                surface.blit(cost_text, cost_rect)
             
         # Draw hover tooltip with detailed stats
         if self.hover_tower and self.hover_tower in self.buttons and not self.is_collapsed:
@@ -159,16 +178,16 @@ class TowerSelector:
             line_height = 20
             tooltip_width = 150
             tooltip_height = len(tooltip_text) * line_height + padding * 2
-            tooltip_x = self.buttons[self.hover_tower]["rect"].right + 10
-            tooltip_y = self.buttons[self.hover_tower]["rect"].top
+            tooltip_x = self.buttons[self.hover_tower]["rect"].right + 10 + offset_x
+            tooltip_y = self.buttons[self.hover_tower]["rect"].top + offset_y
             
-            pygame.draw.rect(screen, UI_PANEL, 
+            pygame.draw.rect(surface, UI_PANEL, 
                            (tooltip_x, tooltip_y, tooltip_width, tooltip_height))
-            pygame.draw.rect(screen, UI_BORDER, 
+            pygame.draw.rect(surface, UI_BORDER, 
                            (tooltip_x, tooltip_y, tooltip_width, tooltip_height), 1)
             
             # Draw tooltip text
             for i, line in enumerate(tooltip_text):
                 text = self.stats_font.render(line, True, UI_TEXT)
-                screen.blit(text, (tooltip_x + padding, 
+                surface.blit(text, (tooltip_x + padding, 
                                  tooltip_y + padding + i * line_height))
\ No newline at end of file
@@ -0,0 +1,77 @@
+import pygame
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+class Widget:
+    """Node of the retained-mode UI tree, rendered to its own cached surface.
+
+    Subclasses return everything they display from get_state() and draw it
+    in render(surface), relative to their rect's top-left corner. The cached
+    surface is only re-rendered when that state changes or after
+    invalidate(); every other frame draw() is a single blit. Children are
+    composited on top and keep their own caches.
+    """
+
+    opaque = True  # Whether every pixel of the rect is covered
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.children = []
+        self.visible = True
+        self.surface = None
+        self.state = None
+        self.renders = 0
+
+    def add(self, child):
+        self.children.append(child)
+        return child
+
+    def get_state(self):
+        return None
+
+    def render(self, surface):
+        pass
+
+    def invalidate(self):
+        self.surface = None
+
+    def refresh(self):
+        """Re-render if the displayed state changed, returning whether it did"""
+        state = (self.visible, self.rect.size, self.get_state())
+        if self.surface is not None and state == self.state:
+            return False
+        if self.surface is None or self.surface.get_size() != self.rect.size:
+            self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        else:
+            self.surface.fill((0, 0, 0, 0))
+        if self.visible:
+            self.render(self.surface)
+        self.state = state
+        self.renders += 1
+        return True
+
+    def draw(self, screen):
+        if not self.visible:
+            return
+        self.refresh()
+        screen.blit(self.surface, self.rect)
+        for child in self.children:
+            child.draw(screen)
+
+class Overlay(Widget):
+    """Translucent full-screen dimming layer behind menus"""
+
+    opaque = False
+
+    def __init__(self, alpha=128, color=(0, 0, 0)):
+        super().__init__((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.alpha = alpha
+        self.color = color
+
+    def refresh(self):
+        if self.surface is not None:
+            return False
+        self.surface = pygame.Surface(self.rect.size)
+        self.surface.fill(self.color)
+        self.surface.set_alpha(self.alpha)
+        self.renders += 1
+        return True